@@ -0,0 +1,305 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+from flask_caching.backends.rediscache import RedisCache
+
+from app import metrics
+
+logger = logging.getLogger(__name__)
+
+_CLEAR_ALL = '*'
+
+
+class L1Cache:
+    """
+    Süreç içi, bayt bütçeli, TTL'li LRU. Redis'ten gelen serileştirilmiş değerler tutulur;
+    her okumada yeniden açılır ki istekler aynı (değiştirilebilir) nesneyi paylaşmasın.
+    """
+
+    def __init__(self, max_bytes, ttl):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self.epoch = 0  # her geçersiz kılmada artar; okuma sırasında gelen silmeyi fark etmek için
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            raw, expires = item
+            if expires < time.monotonic():
+                self._remove(key)
+                return None
+            self._items.move_to_end(key)
+            return raw
+
+    def set(self, key, raw, epoch):
+        if len(raw) > self.max_bytes // 64:  # büyük sayfalar küçük sık okunanları silmesin
+            return
+        with self._lock:
+            if epoch != self.epoch:
+                return  # okuma sürerken geçersiz kılındı, eski değer yazılmasın
+            self._remove(key)
+            self._items[key] = (raw, time.monotonic() + self.ttl)
+            self.size += len(raw)
+            while self.size > self.max_bytes:
+                _, (evicted, _) = self._items.popitem(last=False)
+                self.size -= len(evicted)
+
+    def discard(self, keys):
+        with self._lock:
+            self.epoch += 1
+            for key in keys:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self.epoch += 1
+            self._items.clear()
+            self.size = 0
+
+    def _remove(self, key):
+        item = self._items.pop(key, None)
+        if item is not None:
+            self.size -= len(item[0])
+
+    def __len__(self):
+        return len(self._items)
+
+
+class TwoTierRedisCache(RedisCache):
+    """
+    Flask-Caching için iki katmanlı backend: önde worker başına L1 (kısa TTL'li LRU),
+    arkada Redis (L2). Yazma / silme işlemleri Redis'e giderken aynı turda bir pub/sub
+    kanalına anahtar adlarını yayınlar; her worker'daki dinleyici thread bu anahtarları
+    kendi L1'inden düşürür. Dinleyici bağlı değilken L1 devre dışıdır (yalnızca Redis).
+
+    Config: CACHE_TYPE = 'app.cache_backend.TwoTierRedisCache' (REDIS_URL varsa otomatik),
+    CACHE_L1_ENABLED, CACHE_L1_TTL, CACHE_L1_MB. Redis istemcisi paylaşılan havuzdan
+    (extensions.redis_pool) gelir; CACHE_L1_ENABLED=false ise düz Redis cache'tir.
+    """
+
+    def __init__(self, *args, l1_enabled=True, l1_ttl=5, l1_max_bytes=16 * 1024 * 1024, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.l1_enabled = l1_enabled
+        self.l1 = L1Cache(l1_max_bytes, l1_ttl)
+        self.channel = f'{self.key_prefix}l1-invalidate'
+        self.stats_counts = {'l1_hit': 0, 'l2_hit': 0, 'miss': 0}
+        self._live = False
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        from app.extensions import redis_pool
+        kwargs['host'] = redis_pool.client()
+        if config.get('CACHE_KEY_PREFIX'):
+            kwargs['key_prefix'] = config['CACHE_KEY_PREFIX']
+        kwargs['l1_enabled'] = config.get('CACHE_L1_ENABLED', True)
+        kwargs['l1_ttl'] = config.get('CACHE_L1_TTL', 5)
+        kwargs['l1_max_bytes'] = config.get('CACHE_L1_MB', 16) * 1024 * 1024
+        return cls(*args, **kwargs)
+
+    # ─── Geçersiz kılma dinleyicisi ───
+
+    def _ensure_listener(self):
+        if self._pid == os.getpid() or not self.l1_enabled:
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            # Fork sonrası ebeveynin L1'i ve dinleyicisi bu sürece ait değil
+            self._pid = os.getpid()
+            self._live = False
+            self.l1.clear()
+            threading.Thread(target=self._listen, name='cache-l1-invalidate', daemon=True).start()
+
+    def _listen(self):
+        backoff = 1
+        while True:
+            pubsub = self._write_client.pubsub()
+            try:
+                pubsub.subscribe(self.channel)
+                while True:
+                    # listen() havuzun socket_timeout'unda koparırdı; get_message boşta None döner
+                    message = pubsub.get_message(timeout=5.0)
+                    if message is None:
+                        continue
+                    if message['type'] == 'subscribe':
+                        # L1 abonelik onaylandıktan sonra açılır: arada kaçan mesaj olmasın
+                        self.l1.clear()
+                        self._live = True
+                        backoff = 1
+                        continue
+                    if message['type'] != 'message':
+                        continue
+                    data = message['data'].decode('utf-8') if isinstance(message['data'], bytes) else message['data']
+                    if data == _CLEAR_ALL:
+                        self.l1.clear()
+                    else:
+                        self.l1.discard(data.split('\n'))
+            except Exception as e:
+                logger.warning(f"[cache] L1 geçersiz kılma kanalı koptu, L1 kapalı: {e}")
+            finally:
+                self._live = False
+                self.l1.clear()
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+
+    def _invalidate(self, pipe, keys):
+        if not self.l1_enabled:
+            return
+        self.l1.discard(keys)
+        pipe.publish(self.channel, '\n'.join(keys))
+
+    # ─── Okuma ───
+
+    def _record(self, result):
+        self.stats_counts[result] += 1
+        if self.l1_enabled:
+            metrics.cache_result('redis_l1', result == 'l1_hit')
+        if result != 'l1_hit':
+            metrics.cache_result('redis_l2', result == 'l2_hit')
+
+    def get(self, key):
+        self._ensure_listener()
+        if self._live:
+            raw = self.l1.get(key)
+            if raw is not None:
+                self._record('l1_hit')
+                return self.serializer.loads(raw)
+        epoch = self.l1.epoch
+        raw = self._read_client.get(self.key_prefix + key)
+        if raw is None:
+            self._record('miss')
+            return None
+        self._record('l2_hit')
+        if self._live:
+            self.l1.set(key, raw, epoch)
+        return self.serializer.loads(raw)
+
+    def get_many(self, *keys):
+        self._ensure_listener()
+        raws = dict.fromkeys(keys)
+        if self._live:
+            for key in keys:
+                raws[key] = self.l1.get(key)
+                if raws[key] is not None:
+                    self._record('l1_hit')
+        missing = [key for key in keys if raws[key] is None]
+        if missing:
+            epoch = self.l1.epoch
+            for key, raw in zip(missing, self._read_client.mget([self.key_prefix + key for key in missing])):
+                self._record('miss' if raw is None else 'l2_hit')
+                if raw is not None:
+                    raws[key] = raw
+                    if self._live:
+                        self.l1.set(key, raw, epoch)
+        return [self.serializer.loads(raws[key]) for key in keys]
+
+    def has(self, key):
+        if self._live and self.l1.get(key) is not None:
+            return True
+        return super().has(key)
+
+    # ─── Yazma: Redis işlemi ve yayın tek turda ───
+
+    def set(self, key, value, timeout=None):
+        timeout = self._normalize_timeout(timeout)
+        dump = self.serializer.dumps(value)
+        pipe = self._write_client.pipeline(transaction=False)
+        if timeout == -1:
+            pipe.set(name=self.key_prefix + key, value=dump)
+        else:
+            pipe.setex(name=self.key_prefix + key, value=dump, time=timeout)
+        self._invalidate(pipe, [key])
+        return pipe.execute()[0]
+
+    def add(self, key, value, timeout=None):
+        timeout = self._normalize_timeout(timeout)
+        # SET NX EX: setnx + expire iki tur yerine tek komut
+        created = self._write_client.set(
+            name=self.key_prefix + key, value=self.serializer.dumps(value), nx=True,
+            ex=None if timeout == -1 else timeout,
+        )
+        if created and self.l1_enabled:
+            pipe = self._write_client.pipeline(transaction=False)
+            self._invalidate(pipe, [key])
+            pipe.execute()
+        return bool(created)
+
+    def set_many(self, mapping, timeout=None):
+        return self.set_many_timeouts([(key, value, timeout) for key, value in mapping.items()])
+
+    def set_many_timeouts(self, items):
+        """[(anahtar, değer, timeout)] — farklı TTL'li anahtarlar ve L1 duyurusu tek pipeline turunda."""
+        if not items:
+            return []
+        pipe = self._write_client.pipeline(transaction=False)
+        for key, value, timeout in items:
+            timeout = self._normalize_timeout(timeout)
+            dump = self.serializer.dumps(value)
+            if timeout == -1:
+                pipe.set(name=self.key_prefix + key, value=dump)
+            else:
+                pipe.setex(name=self.key_prefix + key, value=dump, time=timeout)
+        self._invalidate(pipe, [key for key, _, _ in items])
+        results = pipe.execute()
+        return [key for (key, _, _), ok in zip(items, results) if ok]
+
+    def delete(self, key):
+        pipe = self._write_client.pipeline(transaction=False)
+        pipe.delete(self.key_prefix + key)
+        self._invalidate(pipe, [key])
+        return bool(pipe.execute()[0])
+
+    def delete_many(self, *keys):
+        if not keys:
+            return []
+        pipe = self._write_client.pipeline(transaction=False)
+        pipe.delete(*[self.key_prefix + key for key in keys])
+        self._invalidate(pipe, list(keys))
+        pipe.execute()
+        return list(keys)
+
+    def inc(self, key, delta=1):
+        pipe = self._write_client.pipeline(transaction=False)
+        pipe.incr(name=self.key_prefix + key, amount=delta)
+        self._invalidate(pipe, [key])
+        return pipe.execute()[0]
+
+    def dec(self, key, delta=1):
+        return self.inc(key, -delta)
+
+    def clear(self):
+        status = super().clear()
+        if self.l1_enabled:
+            self.l1.clear()
+            self._write_client.publish(self.channel, _CLEAR_ALL)
+        return status
+
+    # ─── İzleme ───
+
+    def stats(self):
+        """Bu worker'ın katman isabet oranları (L1: tüm okumalar, L2: L1'i ıskalayanlar)."""
+        counts = dict(self.stats_counts)
+        total = sum(counts.values())
+        l2_lookups = counts['l2_hit'] + counts['miss']
+        return {
+            **counts,
+            'l1_hit_ratio': round(counts['l1_hit'] / total, 4) if total else None,
+            'l2_hit_ratio': round(counts['l2_hit'] / l2_lookups, 4) if l2_lookups else None,
+            'l1_items': len(self.l1),
+            'l1_bytes': self.l1.size,
+            'l1_live': self._live,
+        }
@@ -0,0 +1,155 @@
+import math
+import struct
+from datetime import date, datetime
+
+from cachelib.redis import RedisCache as CachelibRedisCache
+from cachelib.serializers import RedisSerializer
+
+try:
+    import orjson
+except ImportError:  # opsiyonel: kurulu değilse CACHE_SERIALIZER='orjson' de pickle'a düşer
+    orjson = None
+
+# Değerin ilk baytı biçimi belirler. '!' cachelib'in pickle biçimidir; eski anahtarlar
+# okunmaya devam eder. Tam sayılar cachelib'deki gibi düz yazılır (Redis INCR uyumu).
+_TAG_PICKLE = b'!'
+_TAG_JSON = b'j'
+_TAG_BYTES = b'b'
+_TAG_VAKIT = b'v'
+
+# Vakit kaydı: altı vakit gece yarısından dakika (uint16) + timezone adı (utf-8)
+VAKIT_FIELDS = ('imsak', 'gunes', 'ogle', 'ikindi', 'aksam', 'yatsi')
+_VAKIT_KEYS = frozenset(VAKIT_FIELDS + ('timezone',))
+_VAKIT_STRUCT = struct.Struct('>6H')
+
+_DATE = '$date'
+_DATETIME = '$datetime'
+_MAX_DEPTH = 32
+
+
+def _is_plain(value, depth=0):
+    """
+    JSON'a gidip AYNI tiplerle geri gelebilecek değer mi? tuple, set, aware datetime,
+    str dışı / '$' ile başlayan anahtarlar, NaN ve alt sınıflar pickle'a bırakılır.
+    """
+    t = type(value)
+    if t is str or t is int or t is bool or value is None:
+        return True
+    if t is float:
+        return math.isfinite(value)
+    if t is date:
+        return True
+    if t is datetime:
+        return value.tzinfo is None
+    if depth >= _MAX_DEPTH:
+        return False
+    if t is dict:
+        return all(
+            type(k) is str and not k.startswith('$') and _is_plain(v, depth + 1)
+            for k, v in value.items()
+        )
+    if t is list:
+        return all(_is_plain(item, depth + 1) for item in value)
+    return False
+
+
+# Günün 1440 dakikası için 'HH:MM' ↔ dakika tabloları: paketleme sözlük aramasıdır
+_HHMM = tuple(f'{m // 60:02d}:{m % 60:02d}' for m in range(1440))
+_MINUTE_OF = {hhmm: m for m, hhmm in enumerate(_HHMM)}
+
+
+def _pack_vakit(value):
+    """get_vakitler sonucu {'imsak': 'HH:MM', ..., 'timezone': ...} ise 13+ baytlık kayıt, değilse None."""
+    if value.keys() != _VAKIT_KEYS or type(value['timezone']) is not str:
+        return None
+    try:
+        # '--:--' (veri yok) ve beklenmedik biçimler KeyError / TypeError ile genel yola düşer
+        minutes = [_MINUTE_OF[value[field]] for field in VAKIT_FIELDS]
+    except (KeyError, TypeError):
+        return None
+    return _TAG_VAKIT + _VAKIT_STRUCT.pack(*minutes) + value['timezone'].encode('utf-8')
+
+
+def _unpack_vakit(value):
+    res = dict(zip(VAKIT_FIELDS, map(_HHMM.__getitem__, _VAKIT_STRUCT.unpack_from(value, 1))))
+    res['timezone'] = value[1 + _VAKIT_STRUCT.size:].decode('utf-8')
+    return res
+
+
+def _encode_date(value):
+    if type(value) is datetime:
+        return {_DATETIME: value.isoformat()}
+    if type(value) is date:
+        return {_DATE: value.isoformat()}
+    raise TypeError
+
+
+def _restore_dates(value):
+    if type(value) is dict:
+        if len(value) == 1:
+            if _DATE in value:
+                return date.fromisoformat(value[_DATE])
+            if _DATETIME in value:
+                return datetime.fromisoformat(value[_DATETIME])
+        return {k: _restore_dates(v) for k, v in value.items()}
+    if type(value) is list:
+        return [_restore_dates(item) for item in value]
+    return value
+
+
+class FastRedisSerializer(RedisSerializer):
+    """
+    Redis cache değerleri için serileştirici. Vakit kayıtları sabit ikili düzende
+    (142 → 28 bayt), bytes (OG görselleri) olduğu gibi yazılır; geri kalanı pickle.
+    json_values=True ile diğer sade dict / list değerler (günlük içerik, ramazan bilgisi,
+    dini günler) orjson ile, date / datetime açıkça işaretlenerek yazılır: başka dillerden
+    okunabilir, ama bu değerlerde pickle'dan hızlı değil (benchmarks/cache_serializer.py).
+    """
+
+    def __init__(self, json_values=False):
+        self.json_values = json_values and orjson is not None
+
+    def dumps(self, value, protocol=None):
+        t = type(value)
+        if t is int:
+            return str(value).encode('ascii')
+        if t is bytes:
+            return _TAG_BYTES + value
+        if t is dict and len(value) == 7:
+            packed = _pack_vakit(value)
+            if packed is not None:
+                return packed
+        if self.json_values and _is_plain(value):
+            try:
+                return _TAG_JSON + orjson.dumps(value, default=_encode_date, option=orjson.OPT_PASSTHROUGH_DATETIME)
+            except orjson.JSONEncodeError:  # 64 bit'e sığmayan tam sayı vb.
+                pass
+        return super().dumps(value) if protocol is None else super().dumps(value, protocol)
+
+    def loads(self, value):
+        if value is None:
+            return None
+        tag = value[:1]
+        if tag == _TAG_JSON:
+            data = orjson.loads(value[1:])
+            if b'"$date' in value:
+                data = _restore_dates(data)
+            return data
+        if tag == _TAG_VAKIT:
+            return _unpack_vakit(value)
+        if tag == _TAG_BYTES:
+            return value[1:]
+        return super().loads(value)
+
+
+def setup_cache_serializer(app):
+    """
+    Redis tabanlı cache backend'inin serileştiricisini CACHE_SERIALIZER'a göre ayarlar:
+    'compact' (varsayılan), 'orjson' ya da 'pickle' (cachelib varsayılanı).
+    """
+    mode = app.config.get('CACHE_SERIALIZER', 'compact')
+    if mode == 'pickle':
+        return
+    for backend in app.extensions.get('cache', {}).values():
+        if isinstance(backend, CachelibRedisCache):
+            backend.serializer = FastRedisSerializer(json_values=(mode == 'orjson'))
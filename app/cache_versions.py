@@ -0,0 +1,90 @@
+import time
+import hashlib
+
+from flask import request
+
+from app.extensions import cache
+
+# Cache isim alanları. Her birinin cache'te bir nesil (generation) sayacı vardır; anahtarlar
+# bu nesli içerir, sayaç ilerleyince eski anahtarlar okunmaz olur ve TTL ile kendiliğinden düşer.
+VAKIT = 'vakit'      # ezan_vakti verisi (vakitleri-ice-aktar.py)
+GUIDE = 'guide'      # bilgi köşesi rehberleri (admin paneli, icerikleri-ice-aktar.py)
+CONTENT = 'content'  # günlük içerikler (admin paneli, icerikleri-ice-aktar.py)
+PAGE = 'page'        # şablon / kod çıktısı: render edilmiş sayfalar, JSON listeleri, OG görselleri (deploy)
+
+# Nesiller süreç içinde kısa süre tutulur: her cache anahtarı için ayrıca Redis turu olmasın.
+# Başka worker'daki bump en geç bu kadar saniye sonra görülür.
+_MEMO_TTL = 1.0
+_memo = {}
+
+
+def _generation_key(namespace):
+    return f'cache_gen:{namespace}'
+
+
+def get_generations(*namespaces):
+    """
+    İsim alanlarının nesillerini (epoch saniye, artan) döndürür; eksikler tek cache turunda
+    okunur. Hiç başlatılmamış isim alanı şimdiki zamanla başlatılır.
+    """
+    now = time.monotonic()
+    result = {}
+    missing = []
+    for namespace in namespaces:
+        memo = _memo.get(namespace)
+        if memo and memo[1] > now:
+            result[namespace] = memo[0]
+        else:
+            missing.append(namespace)
+
+    if missing:
+        keys = [_generation_key(namespace) for namespace in missing]
+        values = cache.get_many(*keys)
+        for namespace, key, value in zip(missing, keys, values):
+            if value is None:
+                cache.add(key, int(time.time()), timeout=0)  # başka worker önce yazdıysa onunki kalır
+                value = cache.get(key) or int(time.time())
+            _memo[namespace] = (value, now + _MEMO_TTL)
+            result[namespace] = value
+    return [result[namespace] for namespace in namespaces]
+
+
+def bump(*namespaces):
+    """Veri değişince çağrılır; isim alanlarına bağlı tüm cache anahtarları ve ETag'ler değişir."""
+    for namespace in namespaces:
+        key = _generation_key(namespace)
+        # Aynı saniye içindeki iki değişiklik de farklı nesil üretsin
+        generation = max(int(time.time()), (cache.get(key) or 0) + 1)
+        cache.set(key, generation, timeout=0)
+        _memo.pop(namespace, None)
+
+
+def generation_tag(*namespaces):
+    return '.'.join(f'{namespace}{generation}' for namespace, generation
+                    in zip(namespaces, get_generations(*namespaces)))
+
+
+def versioned_key(key, *namespaces):
+    """Servis cache anahtarına isim alanı nesillerini ekler: vakitler_TR_... → vakitler_TR_...@vakit17..."""
+    return f'{key}@{generation_tag(*namespaces)}'
+
+
+def view_key(*namespaces, query_string=False):
+    """
+    @cache.cached(make_cache_key=...) için anahtar fonksiyonu. Sayfa her zaman PAGE
+    isim alanına da bağlıdır; query_string=True ise sıralı sorgu parametreleri anahtara girer.
+    """
+    namespaces = tuple(dict.fromkeys((PAGE,) + namespaces))
+
+    def make_cache_key(*args, **kwargs):
+        path = request.path
+        if query_string:
+            args_hash = hashlib.md5(str(sorted(request.args.items(multi=True))).encode('utf-8')).hexdigest()
+            path = f'{path}?{args_hash}'
+        return f'view/{generation_tag(*namespaces)}{path}'
+    return make_cache_key
+
+
+def cached_view(timeout, *namespaces, query_string=False):
+    """İsim alanı nesilli @cache.cached: @cached_view(3600, GUIDE)"""
+    return cache.cached(timeout=timeout, make_cache_key=view_key(*namespaces, query_string=query_string))
@@ -0,0 +1,183 @@
+import os
+import gzip
+import threading
+import mimetypes
+from collections import OrderedDict
+
+from flask import g, request, send_from_directory
+from werkzeug.security import safe_join
+
+from app import metrics
+
+try:
+    import brotli
+except ImportError:  # opsiyonel: kurulu değilse dinamik yanıtlar yalnızca gzip'lenir
+    brotli = None
+
+COMPRESSIBLE_TYPES = frozenset({
+    'text/html', 'text/css', 'text/plain', 'text/xml', 'text/javascript', 'text/csv',
+    'application/json', 'application/javascript', 'application/xml', 'application/rss+xml',
+    'application/manifest+json', 'image/svg+xml', 'font/ttf',
+})
+# scripts/build_assets.py'nin .br / .gz kardeşlerini ürettiği statik dosyalar
+STATIC_EXTENSIONS = ('.js', '.css', '.json', '.html', '.svg', '.txt', '.xml', '.ttf', '.map', '.webmanifest')
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+# Sıkıştırılmış gövdenin ETag'ine eklenen son ek ("abc" → "abc-gz"); istekte geri silinir
+_ETAG_SUFFIXES = {'br': 'br', 'gzip': 'gz'}
+
+
+def compress(data, encoding, gzip_level=6, br_level=5):
+    if encoding == 'br':
+        return brotli.compress(data, quality=br_level)
+    # mtime=0: aynı girdi her zaman aynı çıktıyı üretir
+    return gzip.compress(data, compresslevel=gzip_level, mtime=0)
+
+
+def negotiate(accept_encodings, brotli_available=True):
+    """Accept-Encoding'e göre 'br', 'gzip' ya da None."""
+    if brotli_available and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+class CompressedBodyCache:
+    """Sıkıştırılmış gövdeler için bayt bütçeli, thread-safe LRU (worker başına)."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            body = self._items.get(key)
+            if body is not None:
+                self._items.move_to_end(key)
+            return body
+
+    def set(self, key, body):
+        # Tek bir gövde bütçenin çeyreğini geçmesin; büyük yıllık yanıtlar diğerlerini silmesin
+        if len(body) > self.max_bytes // 4:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._items[key] = body
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.size -= len(evicted)
+
+
+def _precompressed_static(app):
+    """İstemci kabul ediyorsa statik dosyanın güncel .br / .gz kardeşini gönderir."""
+    filename = (request.view_args or {}).get('filename', '')
+    if not filename.endswith(STATIC_EXTENSIONS):
+        return None
+    # Önceden sıkıştırılmış .br dosyasını göndermek için brotli kütüphanesi gerekmez
+    candidates = [encoding for encoding in SUFFIXES if request.accept_encodings[encoding]]
+    source = safe_join(app.static_folder, filename)
+    for encoding in candidates:
+        sibling = safe_join(app.static_folder, filename + SUFFIXES[encoding])
+        try:
+            if os.stat(sibling).st_mtime < os.stat(source).st_mtime:
+                continue  # kaynak değişmiş, build_assets yeniden çalıştırılmamış
+        except (OSError, TypeError):
+            continue
+        response = send_from_directory(
+            app.static_folder, filename + SUFFIXES[encoding],
+            mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+            max_age=app.get_send_file_max_age(filename),
+        )
+        response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        return response
+    return None
+
+
+def setup_compression(app):
+    """
+    HTML / JSON / metin yanıtlarını Accept-Encoding'e göre brotli (kuruluysa) ya da gzip
+    ile sıkıştırır. ETag'i olan yanıtların sıkıştırılmış gövdesi (URL, ETag, kodlama)
+    anahtarıyla bellekte tutulur; aynı içerik her istekte yeniden sıkıştırılmaz.
+    Statik dosyalarda scripts/build_assets.py'nin ürettiği .br / .gz kardeşleri gönderilir.
+
+    Diğer after_request kancaları gövdeyi değiştirebildiği için (Minify vb.) bu fonksiyon
+    onlardan ÖNCE çağrılmalıdır; Flask after_request kancalarını ters sırayla çalıştırır.
+    """
+    if not app.config.get('COMPRESS_ENABLED', True):
+        return
+
+    min_size = app.config.get('COMPRESS_MIN_SIZE', 500)
+    gzip_level = app.config.get('COMPRESS_LEVEL', 6)
+    br_level = app.config.get('COMPRESS_BR_LEVEL', 5)
+    body_cache = CompressedBodyCache(app.config.get('COMPRESS_CACHE_MB', 32) * 1024 * 1024)
+    app.extensions['compression_cache'] = body_cache
+
+    @app.before_request
+    def _compression_before():
+        # İstemci sıkıştırılmış temsile ait ETag'i geri gönderir; view'lar ham ETag'le karşılaştırır.
+        # Yalnızca bu istekte de seçilecek kodlamanın son eki silinir: başka kodlamanın (ya da
+        # sıkıştırmasız istemcinin elindeki -gz) ETag'i eşleşmez ve güncel temsil 200 ile gider.
+        if_none_match = request.environ.get('HTTP_IF_NONE_MATCH')
+        if if_none_match and '-' in if_none_match:
+            suffix = _ETAG_SUFFIXES.get(negotiate(request.accept_encodings, brotli is not None))
+            stripped = if_none_match.replace(f'-{suffix}"', '"') if suffix else if_none_match
+            if stripped != if_none_match:
+                request.environ['HTTP_IF_NONE_MATCH'] = stripped
+                g._etag_suffix = suffix
+        if request.endpoint == 'static':
+            return _precompressed_static(app)
+
+    @app.after_request
+    def _compression_after(response):
+        if response.status_code == 304:
+            # 304'teki ETag ve Vary, istemcinin sakladığı temsilin 200'ündekiyle aynı kalsın
+            suffix = g.get('_etag_suffix')
+            etag, weak = response.get_etag()
+            if suffix and etag and not etag.endswith(f'-{suffix}'):
+                response.set_etag(f'{etag}-{suffix}', weak=weak)
+            if suffix or (request.endpoint != 'static' and response.mimetype in COMPRESSIBLE_TYPES):
+                response.vary.add('Accept-Encoding')
+            return response
+        if (
+            response.status_code < 200 or response.status_code >= 300 or response.status_code in (204, 206)
+            or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_TYPES
+            or request.method == 'HEAD'
+        ):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = negotiate(request.accept_encodings, brotli is not None)
+        if encoding is None:
+            return response
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+
+        etag, weak = response.get_etag()
+        cacheable = etag is not None and 'no-store' not in response.headers.get('Cache-Control', '')
+        # ETag yalnızca URL başına anlamlıdır; sorgu dizesi de anahtara girer
+        key = (request.full_path, etag, encoding)
+        body = body_cache.get(key) if cacheable else None
+        if cacheable:
+            metrics.cache_result('compressed_body', body is not None)
+        if body is None:
+            body = compress(data, encoding, gzip_level, br_level)
+            if cacheable:
+                body_cache.set(key, body)
+        if len(body) >= len(data):
+            return response
+
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        if etag is not None:
+            response.set_etag(f'{etag}-{_ETAG_SUFFIXES[encoding]}', weak=weak)
+        return response
@@ -0,0 +1,58 @@
+from datetime import date, datetime, timezone
+from functools import wraps
+
+from flask import make_response, request
+
+from app.cache_versions import PAGE, get_generations
+
+
+def _validators(namespaces, date_scoped):
+    # PAGE her zaman dahil: deploy sonrası (şablon değişmiş olabilir) yeniden doğrulanır
+    generations = get_generations(*dict.fromkeys((PAGE,) + namespaces))
+    last_modified = max(generations)
+    etag = '.'.join(str(generation) for generation in generations)
+    if date_scoped:
+        today = date.today()
+        etag += f'-{today:%Y%m%d}'
+        last_modified = max(last_modified, int(datetime(today.year, today.month, today.day).timestamp()))
+    return etag, datetime.fromtimestamp(last_modified, tz=timezone.utc)
+
+
+def _not_modified(etag, last_modified):
+    if request.if_none_match:
+        # If-None-Match varsa If-Modified-Since yok sayılır (RFC 9110)
+        return request.if_none_match.contains(etag)
+    if request.if_modified_since:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def conditional(*namespaces, max_age=0, date_scoped=True):
+    """
+    Route'a veri sürümünden türetilen ETag / Last-Modified ekler: PAGE ve verilen cache
+    isim alanlarının nesilleri (app/cache_versions.py) ve (date_scoped ise) bugünün tarihi.
+    Gövde hash'lenmez; doğrulayıcı view çalışmadan hesaplanır, eşleşirse 304 hemen döner.
+    @cached_view'in ÜSTÜNE yazılmalıdır ki 304'te cache'e de bakılmasın.
+
+        @conditional(VAKIT, max_age=300)
+
+    max_age=0 → 'public, no-cache' (her kullanımda yeniden doğrula, eşleşirse 304).
+    """
+    cache_control = f'public, max-age={max_age}' if max_age else 'public, no-cache'
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            etag, last_modified = _validators(namespaces, date_scoped)
+            if _not_modified(etag, last_modified):
+                response = make_response('', 304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            response.last_modified = last_modified
+            response.headers['Cache-Control'] = cache_control
+            return response
+        return decorated_function
+    return decorator
@@ -1,4 +1,5 @@
 import os
+import json
 from dotenv import load_dotenv
 
 # .env dosyasını yükle
@@ -28,7 +29,52 @@ class Config:
     API_LOG_JSON = os.environ.get('API_LOG_JSON', 'true').lower() in ('1', 'true', 'yes')
     APP_LOG_JSON = os.environ.get('APP_LOG_JSON', 'false').lower() in ('1', 'true', 'yes')
     LOG_RETENTION_DAYS = int(os.environ.get('LOG_RETENTION_DAYS', '7'))
+    # Asenkron loglama: kayıtlar kuyruğa bırakılır, dosyaya arka plan thread'i yazar
+    LOG_ASYNC = os.environ.get('LOG_ASYNC', 'true').lower() in ('1', 'true', 'yes')
+    LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', '10000'))  # dolunca yeni kayıtlar düşürülür
+    LOG_BATCH_SIZE = int(os.environ.get('LOG_BATCH_SIZE', '256'))
+    LOG_FLUSH_INTERVAL = float(os.environ.get('LOG_FLUSH_INTERVAL', '1.0'))
+    # all_requests.log kuralları: sırayla denenir, ilk eşleşen uygulanır (eşleşme yoksa log).
+    # Ortam değişkeniyle JSON liste olarak ezilebilir.
+    LOG_SAMPLING_RULES = json.loads(os.environ['LOG_SAMPLING_RULES']) if os.environ.get('LOG_SAMPLING_RULES') else [
+        # Hatalar ve yavaş istekler her zaman
+        {'status': ['5xx'], 'action': 'log'},
+        {'min_ms': 1000, 'action': 'log'},
+        # API istekleri api.log'a zaten yazılıyor
+        {'blueprint': ['api'], 'action': 'drop'},
+        # Sağlık kontrolleri
+        {'ua': ['kube-probe', 'health', 'uptime', 'docker'], 'action': 'drop'},
+        # Statik dosyalar ve PWA dosyaları: başarılı olanların %1'i
+        {'prefix': ['/static/', '/sw.js', '/manifest.json', '/favicon.ico', '/robots.txt'],
+         'status': ['2xx', '3xx'], 'action': 'sample', 'rate': 0.01},
+        # Crawler'ların çektiği paylaşım görselleri
+        {'prefix': ['/og-image', '/paylas/'], 'status': ['2xx', '3xx'], 'action': 'sample', 'rate': 0.1},
+    ]
     
+    # İstek istatistikleri (admin paneli): Redis cache varsa Redis'te, yoksa SQLite'ta toplanır
+    STATS_ENABLED = os.environ.get('STATS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    STATS_FLUSH_INTERVAL = int(os.environ.get('STATS_FLUSH_INTERVAL', '10'))
+    STATS_RETENTION_DAYS = int(os.environ.get('STATS_RETENTION_DAYS', '8'))
+    STATS_SQLITE_PATH = os.environ.get('STATS_SQLITE_PATH')  # boşsa instance/request_stats.sqlite3
+
+    # Prometheus /metrics: 'Authorization: Bearer <METRICS_TOKEN>' ister; METRICS_TOKEN
+    # tanımlı değilse endpoint 404 döner. gunicorn ve botlar aynı
+    # PROMETHEUS_MULTIPROC_DIR ile çalıştırılırsa tüm süreçler tek çıktıda toplanır.
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+    # İstek profiler'ı: admin çerezi, 'X-Profile: 1' + VIP API key ya da örnekleme oranıyla tetiklenir
+    PROFILER_ENABLED = os.environ.get('PROFILER_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+    PROFILER_SAMPLE_RATE = float(os.environ.get('PROFILER_SAMPLE_RATE', '0'))  # rastgele profillenen istek oranı
+    PROFILER_INTERVAL_MS = float(os.environ.get('PROFILER_INTERVAL_MS', '5'))
+    PROFILER_DIR = os.environ.get('PROFILER_DIR')  # boşsa instance/profiles
+    PROFILER_KEEP = int(os.environ.get('PROFILER_KEEP', '200'))  # saklanan son istek profili
+
+    # İstek başına SQL sayacı; debug modunda bütçe aşımı ve tekrarlanan ifade (N+1) uyarısı
+    SQL_QUERY_BUDGET = int(os.environ.get('SQL_QUERY_BUDGET', '20'))
+    SQL_REPEAT_THRESHOLD = int(os.environ.get('SQL_REPEAT_THRESHOLD', '5'))
+    SQL_SLOWEST_COUNT = int(os.environ.get('SQL_SLOWEST_COUNT', '3'))
+
     LOGGED_PAGES = {
         '/sehir',
         '/sehir/',
@@ -53,17 +99,75 @@ class Config:
     
     # Cache Settings
     CACHE_TYPE = os.environ.get('CACHE_TYPE', 'RedisCache' if os.environ.get('REDIS_URL') else 'SimpleCache')
-    CACHE_REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
     CACHE_DEFAULT_TIMEOUT = 3600
     CACHE_KEY_PREFIX = 'cv:'
-    # Redis için ekstra ayarlar (sadece Redis kullanıldığında geçerli)
-    if os.environ.get('REDIS_URL') or CACHE_TYPE == 'RedisCache':
-        CACHE_OPTIONS = {
-            'socket_connect_timeout': 5,
-            'socket_timeout': 5,
-            'retry_on_timeout': True,
+
+    # Paylaşılan Redis havuzu (app/extensions.py redis_pool): cache, limiter, istatistikler ve
+    # sürüm kontrolü aynı bağlantıları kullanır. Kısa timeout: Redis yavaşlarsa istekler
+    # beklemek yerine hata alır (limiter bellek yedeğine düşer, cache ıskalar).
+    REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+    CACHE_REDIS_URL = REDIS_URL
+    REDIS_POOL_OPTIONS = {
+        'max_connections': int(os.environ.get('REDIS_MAX_CONNECTIONS', '50')),
+        'timeout': float(os.environ.get('REDIS_POOL_TIMEOUT', '1')),  # havuz doluysa bekleme
+        'socket_connect_timeout': float(os.environ.get('REDIS_CONNECT_TIMEOUT', '0.5')),
+        'socket_timeout': float(os.environ.get('REDIS_SOCKET_TIMEOUT', '1')),
+        'health_check_interval': 30,
+    }
+    # Redis önünde worker başına L1 (app/cache_backend.py): sık okunan küçük anahtarlar
+    # CACHE_L1_TTL saniye süreç içinde tutulur, yazmalar pub/sub ile diğer worker'lara duyurulur
+    CACHE_L1_ENABLED = os.environ.get('CACHE_L1_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    CACHE_L1_TTL = int(os.environ.get('CACHE_L1_TTL', '5'))
+    CACHE_L1_MB = int(os.environ.get('CACHE_L1_MB', '16'))
+    if CACHE_TYPE == 'RedisCache':  # paylaşılan havuzu kullanan backend; L1 kapalıysa düz Redis
+        CACHE_TYPE = 'app.cache_backend.TwoTierRedisCache'
+    # Redis'teki değerler: 'compact' (vakit kayıtları ikili, diğerleri pickle), 'orjson'
+    # (compact + sade dict/list/date değerler JSON) ya da 'pickle' (app/cache_serializer.py)
+    CACHE_SERIALIZER = os.environ.get('CACHE_SERIALIZER', 'compact')
+
+    # Rate limit sayaçları: REDIS_URL varsa tüm worker'lar Redis'te ortak sayaç kullanır
+    # (memory:// ile her worker kendi sayacını tutar, limit fiilen worker sayısıyla çarpılır).
+    # Redis erişilemezse süreç içi bellek yedeğine düşülür, arka planda yeniden denenir.
+    RATELIMIT_STORAGE_URI = os.environ.get('RATELIMIT_STORAGE_URI') or os.environ.get('REDIS_URL') or 'memory://'
+    RATELIMIT_STRATEGY = os.environ.get('RATELIMIT_STRATEGY', 'moving-window')
+    RATELIMIT_KEY_PREFIX = 'cv-rl'
+    RATELIMIT_IN_MEMORY_FALLBACK_ENABLED = True
+    RATELIMIT_SWALLOW_ERRORS = True
+    if RATELIMIT_STORAGE_URI.startswith('redis'):
+        # REDIS_URL'den farklı bir Redis'se kendi havuzu; aynıysa paylaşılan havuz kullanılır
+        # Kısa timeout: Redis yavaşladığında istekler beklemek yerine yedeğe düşer
+        RATELIMIT_STORAGE_OPTIONS = {
+            'socket_connect_timeout': 0.5,
+            'socket_timeout': 0.5,
+            'health_check_interval': 30,
+            'max_connections': int(os.environ.get('RATELIMIT_REDIS_MAX_CONNECTIONS', '20')),
         }
 
+    # Yanıt sıkıştırma: brotli kuruluysa br, değilse gzip. ETag'li yanıtların sıkıştırılmış
+    # gövdeleri worker başına COMPRESS_CACHE_MB'lik LRU'da tutulur.
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', '500'))  # bayt
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', '6'))  # gzip
+    COMPRESS_BR_LEVEL = int(os.environ.get('COMPRESS_BR_LEVEL', '5'))  # dinamik yanıtlar için 11 çok yavaş
+    COMPRESS_CACHE_MB = int(os.environ.get('COMPRESS_CACHE_MB', '32'))
+
+    # Cache ısıtma: her timezone'un gece yarısından önce o bölgedeki şehirlerin yeni gün
+    # vakitleri toplu sorguyla cache'e yazılır (worker başına thread; scripts/cache_warmup.py)
+    CACHE_WARMUP_ENABLED = os.environ.get('CACHE_WARMUP_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+    CACHE_WARMUP_LEAD_MINUTES = int(os.environ.get('CACHE_WARMUP_LEAD_MINUTES', '10'))
+    CACHE_WARMUP_ON_START = os.environ.get('CACHE_WARMUP_ON_START', 'true').lower() in ('1', 'true', 'yes')
+    CACHE_WARMUP_OG_IMAGES = os.environ.get('CACHE_WARMUP_OG_IMAGES', 'false').lower() in ('1', 'true', 'yes')
+
+    # OG / story görsel render kuyruğu
+    OG_RENDER_WORKERS = int(os.environ.get('OG_RENDER_WORKERS', '2'))
+    OG_RENDER_QUEUE_SIZE = int(os.environ.get('OG_RENDER_QUEUE_SIZE', '32'))
+    OG_RENDER_TIMEOUT = float(os.environ.get('OG_RENDER_TIMEOUT', '10'))
+
+    # Sitemap (instance/sitemaps altında önceden üretilir)
+    SITEMAP_BASE_URL = os.environ.get('SITEMAP_BASE_URL', 'https://cagrivakti.com.tr')
+    SITEMAP_DIR = os.environ.get('SITEMAP_DIR')  # boşsa instance/sitemaps
+    SITEMAP_MAX_AGE = int(os.environ.get('SITEMAP_MAX_AGE', '21600'))
+
     # Canlı Yayın Secret key
     STREAM_SECRET = os.environ.get('STREAM_SECRET', 'okulcanli2025')
     STREAM_KEY = os.environ.get('STREAM_KEY', 'yayin')
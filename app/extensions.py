@@ -1,3 +1,9 @@
+import re
+import time
+import bisect
+import functools
+import ipaddress
+
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_caching import Cache
@@ -13,56 +19,143 @@ migrate = Migrate()
 cache = Cache()
 csrf = CSRFProtect()
 
+
+
+class RedisConnections:
+    """
+    Worker başına tek, paylaşılan Redis bağlantı havuzu (REDIS_URL, REDIS_POOL_OPTIONS).
+    Cache backend'i, rate limiter (aynı URL'deyse), istatistik deposu ve sürüm kontrolü
+    bu havuzdan istemci alır. Havuz oluşturulurken bağlantı açılmaz; fork sonrası
+    redis-py havuzu kendiliğinden sıfırlar.
+    """
+
+    def __init__(self):
+        self.url = None
+        self.pool = None
+
+    def init_app(self, app):
+        import redis
+        self.url = app.config.get('REDIS_URL')
+        options = dict(app.config.get('REDIS_POOL_OPTIONS', {}))
+        # Havuz dolunca hata yerine kısa süre boş bağlantı beklenir
+        self.pool = redis.BlockingConnectionPool.from_url(self.url, **options)
+        if app.config.get('RATELIMIT_STORAGE_URI') == self.url:
+            # Limiter da aynı havuzu kullansın (limits RedisStorage connection_pool kabul eder)
+            app.config['RATELIMIT_STORAGE_OPTIONS'] = {'connection_pool': self.pool}
+
+    def client(self):
+        import redis
+        return redis.Redis(connection_pool=self.pool)
+
+    def stats(self):
+        """/api/status için: PING gecikmesi ve havuzdaki bağlantı sayıları."""
+        if self.pool is None:
+            return {'enabled': False}
+        result = {'enabled': True, 'max_connections': self.pool.max_connections}
+        try:
+            created = [c for c in self.pool._connections]
+            idle = sum(1 for c in list(self.pool.pool.queue) if c is not None)
+            result.update(created=len(created), idle=idle, in_use=len(created) - idle)
+        except AttributeError:  # redis-py iç yapısı değişirse sayılar atlanır
+            pass
+        started = time.perf_counter()
+        try:
+            self.client().ping()
+            result.update(ok=True, ping_ms=round((time.perf_counter() - started) * 1000, 2))
+        except Exception as e:
+            result.update(ok=False, error=type(e).__name__)
+        return result
+
+
+redis_pool = RedisConnections()
+
+
+def cache_get_many(*keys):
+    """{anahtar: değer} (bulunmayanlar None); Redis'te tek MGET turu."""
+    return dict(zip(keys, cache.get_many(*keys)))
+
+
+def cache_set_many(items):
+    """
+    [(anahtar, değer, timeout)] — farklı TTL'li anahtarları Redis'te tek pipeline turunda
+    yazar; pipeline desteklemeyen backend'lerde (SimpleCache) tek tek set edilir.
+    """
+    set_many = getattr(cache.cache, 'set_many_timeouts', None)
+    if set_many is not None:
+        return set_many(items)
+    for key, value, timeout in items:
+        cache.set(key, value, timeout=timeout)
+
+
+# Depolama (Redis / memory://), strateji ve bellek yedeği config'ten gelir (RATELIMIT_*)
 limiter = Limiter(
     key_func=get_remote_address,
     default_limits=["1000 per day", "200 per hour"],
-    storage_uri="memory://",
     enabled=True
 )
 
+# Rate limit'ten muaf iç ağlar: sıralı (başlangıç, bitiş) tamsayı aralıkları, bisect ile aranır
+_EXEMPT_NETWORKS = [ipaddress.ip_network(net) for net in (
+    '127.0.0.0/8', '10.0.0.0/8', '172.16.0.0/12', '192.168.0.0/16',  # IPv4 loopback / RFC 1918
+    '::1/128', 'fc00::/7', 'fe80::/10',                               # IPv6 loopback / ULA / link-local
+)]
+_EXEMPT_RANGES = {
+    version: sorted((int(net.network_address), int(net.broadcast_address))
+                    for net in _EXEMPT_NETWORKS if net.version == version)
+    for version in (4, 6)
+}
+_EXEMPT_STARTS = {version: [start for start, _ in ranges] for version, ranges in _EXEMPT_RANGES.items()}
+
+# Kendi domainimiz ve yerel geliştirme; host'tan sonra port, yol ya da metin sonu gelmeli
+_ALLOWED_ORIGIN = re.compile(
+    r'(?:https?://(?:www\.)?cagrivakti\.com\.tr|http://localhost|http://127\.0\.0\.1)(?=[:/?#]|$)'
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def is_internal_ip(ip):
+    """Yerel / iç ağ IP'si mi? (IPv4-mapped IPv6 adresler IPv4 olarak değerlendirilir)"""
+    try:
+        addr = ipaddress.ip_address(ip)
+    except ValueError:
+        return False
+    if addr.version == 6 and addr.ipv4_mapped:
+        addr = addr.ipv4_mapped
+    value = int(addr)
+    index = bisect.bisect_right(_EXEMPT_STARTS[addr.version], value) - 1
+    return index >= 0 and value <= _EXEMPT_RANGES[addr.version][index][1]
+
+
+def is_vip_key(api_key):
+    """VIP_API_KEYS içinde mi? Anahtarlar ilk kullanımda frozenset'e çevrilir."""
+    if not api_key:
+        return False
+    keys = current_app.extensions.get('vip_api_keys')
+    if keys is None:
+        keys = current_app.extensions['vip_api_keys'] = frozenset(current_app.config.get('VIP_API_KEYS', []))
+    return api_key in keys
+
+
 @limiter.request_filter
 def vip_request_filter():
     """
-    SADECE sağlık kontrolü endpoint'leri ve iç ağ IP'leri rate limit'ten muaf tutar.
+    Sağlık kontrolü endpoint'lerini, iç ağ IP'lerini, VIP API anahtarlarını ve kendi
+    domainimizden gelen istekleri rate limit'ten muaf tutar. Her istekte çalıştığı için
+    tüm yapılar modül yüklenirken derlenir; IP kararları LRU'da tutulur.
     """
-    # SADECE sağlık kontrolü endpoint'lerini muaf tut (EN BAŞTA)
-    if request.path.endswith('/status') or '/status' in request.path:
+    if '/status' in request.path:
         return True
-    
-    # Yerel geliştirme ve iç ağ IP'lerini muaf tut
+
     ip = request.remote_addr
-    if (
-        ip in ['127.0.0.1', '::1'] or
-        ip.startswith('10.') or 
-        (ip.startswith('172.') and 16 <= int(ip.split('.')[1]) <= 31) or 
-        ip.startswith('192.168.')
-    ):
+    if ip and is_internal_ip(ip):
         return True
 
-    # VIP API Key muafiyeti
-    api_key = request.headers.get('X-API-Key')
-    if api_key and api_key in current_app.config.get('VIP_API_KEYS', []):
+    if is_vip_key(request.headers.get('X-API-Key')):
         return True
-    
-    # Kendi domainimizden gelen istekleri muaf tut (sitenin kendi API istekleri için)
-    referer = request.headers.get('Referer', '')
-    origin = request.headers.get('Origin', '')
-    
-    allowed_domains = [
-        'https://cagrivakti.com.tr',
-        'https://www.cagrivakti.com.tr',
-        'http://cagrivakti.com.tr',
-        'http://www.cagrivakti.com.tr',
-        'http://localhost',
-        'http://127.0.0.1'
-        ]
-    
-    def is_allowed_domain(url):
-        if not url:
-            return False
-        return any(url.startswith(domain) for domain in allowed_domains)
-    
-    if is_allowed_domain(referer) or is_allowed_domain(origin):
+
+    # Sitenin kendi API istekleri
+    referer = request.headers.get('Referer')
+    if referer and _ALLOWED_ORIGIN.match(referer):
         return True
-    
-    return False
+    origin = request.headers.get('Origin')
+    return bool(origin and _ALLOWED_ORIGIN.match(origin))
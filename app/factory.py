@@ -7,11 +7,17 @@ import uuid
 from dotenv import load_dotenv
 from datetime import datetime
 
-from app.extensions import db, migrate, cache, csrf, limiter, assets
+from app.extensions import db, migrate, cache, csrf, limiter, assets, redis_pool
 from app.config import Config
 from app.error_handlers import register_error_handlers
 from app.middleware import setup_middleware
-from app.logging_config import setup_logging, setup_api_logging, setup_security_logging, setup_all_requests_logging
+from app.logging_config import setup_logging, setup_api_logging, setup_security_logging, setup_all_requests_logging, setup_async_logging
+from app.metrics import setup_metrics
+from app.query_stats import setup_query_stats
+from app.timing import TimedJSONProvider, setup_timing
+from app.compression import setup_compression
+from app import cache_versions
+from app.cache_serializer import setup_cache_serializer
 
 def create_app(config_class=Config):
     # .env dosyasını yükle
@@ -24,6 +30,8 @@ def create_app(config_class=Config):
     app = Flask(__name__, instance_path=instance_path)
     app.config.from_object(config_class)
     
+    # JSON serileştirme süresi Server-Timing'e 'json' fazı olarak yazılır
+    app.json = TimedJSONProvider(app)
     # JSON sorting ayarı (Yeni Flask versiyonları için)
     app.json.sort_keys = False
 
@@ -85,10 +93,16 @@ def create_app(config_class=Config):
     # assets.register('js_main', js_bundle)
 
     app.jinja_env.add_extension('webassets.ext.jinja2.AssetsExtension')
-    app.jinja_env.assets_environment = assets                          
+    app.jinja_env.assets_environment = assets
+    # Diğer after_request kancalarından sonra çalışsın diye ilk kaydedilir
+    setup_compression(app)
     db.init_app(app)
+    setup_query_stats(app)
+    setup_timing(app)
     migrate.init_app(app, db)
+    redis_pool.init_app(app)  # cache ve limiter'dan önce: ikisi de bu havuzu kullanır
     cache.init_app(app)
+    setup_cache_serializer(app)
     csrf.init_app(app)
     limiter.init_app(app)
     Minify(app=app, html=False, js=False, cssless=True)
@@ -125,6 +139,11 @@ def create_app(config_class=Config):
     setup_api_logging(app)
     setup_security_logging(app)
     setup_all_requests_logging(app)
+    setup_async_logging(app)
+    setup_metrics(app)
+
+    from app.services.cache_warmup import cache_warmer
+    cache_warmer.init_app(app)
     
     @app.after_request
     def add_header(response):
@@ -196,31 +215,30 @@ def create_app(config_class=Config):
             now=datetime.now
         )
 
-    # ── Versiyon değişince Flask cache'ini otomatik temizle ──
+    # ── Versiyon değişince sayfa cache'ini (PAGE nesli) geçersiz kıl ──
     with app.app_context():
-        _clear_cache_on_version_change(app)
+        _bump_page_cache_on_version_change(app)
 
     return app
 
 
-def _clear_cache_on_version_change(app):
+def _bump_page_cache_on_version_change(app):
     """Redis'e kaydedilen son versiyonla mevcut versiyonu karşılaştırır.
-    Farklıysa Flask cache'ini temizler ve yeni versiyonu kaydeder."""
+    Farklıysa yalnızca PAGE neslini ilerletir ve yeni versiyonu kaydeder. cache.clear()
+    yapılmaz: vakit / içerik verisi deploy'la değişmez, deploy sonrası DB'ye yığılma olmaz."""
     try:
-        import redis as redis_lib
-        r = redis_lib.from_url(
-            os.environ.get('REDIS_URL', 'redis://localhost:6379/0'),
-            decode_responses=True
-        )
+        r = redis_pool.client()
         current_version = app.config.get('APP_VERSION', '')
-        stored_version = r.get('app:deployed_version')
+        stored_version = (r.get('app:deployed_version') or b'').decode('utf-8') or None
         if stored_version != current_version:
-            cache.clear()
-            r.set('app:deployed_version', current_version)
-            app.logger.info(
-                f'[version] {stored_version} → {current_version} — Flask cache temizlendi.'
-            )
+            # Birden çok worker aynı anda açılırsa yalnızca biri ilerletsin
+            previous = r.getset('app:deployed_version', current_version)
+            if (previous or b'').decode('utf-8') != current_version:
+                cache_versions.bump(cache_versions.PAGE)
+                app.logger.info(
+                    f'[version] {stored_version} → {current_version} — sayfa cache nesli ilerletildi.'
+                )
     except Exception as e:
-        app.logger.warning(f'[version] Cache temizleme kontrolü başarısız: {e}')
+        app.logger.warning(f'[version] Cache sürüm kontrolü başarısız: {e}')
 
 
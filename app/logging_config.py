@@ -1,18 +1,37 @@
 import logging
-from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
+from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler, QueueHandler, QueueListener
 import os
 import gzip
 import shutil
+import copy
+import queue
+import random
+import atexit
 import pytz
-from datetime import datetime
+from datetime import datetime, timezone
 import json
 import time
 import uuid
 from flask import request, g
 
+from app.services.request_stats import request_stats
+from app.timing import current_phases
+
+try:
+    import orjson
+except ImportError:  # orjson opsiyonel; yoksa stdlib json kullanılır
+    orjson = None
+
+ISTANBUL_TZ = pytz.timezone('Europe/Istanbul')
+
 # API için iç ağ IP'lerini tek bir kez loglamak için cache
 _api_internal_ip_cache = set()
 
+# Asenkron log kuyruğu (setup_async_logging) — süreç başına tek listener
+_log_queue_listener = None
+_log_queue_handlers = []
+_log_queue_stats = {'enqueued': 0, 'dropped': 0, 'dropped_by_logger': {}}
+
 def compress_rotator(source, dest):
     with open(source, 'rb') as f_in:
         with gzip.open(dest + '.gz', 'wb') as f_out:
@@ -20,21 +39,74 @@ def compress_rotator(source, dest):
     os.remove(source)
 
 
+class _BatchFlushMixin:
+    """
+    Asenkron modda her emit() sonrası yapılan flush'ı erteler; kuyruk listener'ı
+    batch sonunda flush_batch() çağırır. Senkron modda davranış değişmez.
+    """
+    deferred_flush = False
+
+    def flush(self):
+        if not self.deferred_flush:
+            super().flush()
+
+    def flush_batch(self):
+        super().flush()
+
+
+class BufferedTimedRotatingFileHandler(_BatchFlushMixin, TimedRotatingFileHandler):
+    pass
+
+
+class BufferedRotatingFileHandler(_BatchFlushMixin, RotatingFileHandler):
+    pass
+
+
+def json_dumps(obj):
+    """Log satırları için JSON: orjson varsa onu, yoksa stdlib json'u kullanır."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, default=str)
+
+
 class IstanbulFormatter(logging.Formatter):
+    """
+    Zamanı Europe/Istanbul saatiyle yazar. UTC ofseti saatte bir pytz'den alınıp sabit
+    tzinfo olarak tutulur; biçimlendirilmiş saniye metni de saniyede bir hesaplanır.
+    """
+    _offset_cache = (None, None)  # (epoch saati, tzinfo) — tüm formatter'larda ortak
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._second_cache = {}  # datefmt → (epoch saniyesi, metin)
+
+    @classmethod
+    def _tzinfo(cls, timestamp):
+        hour = int(timestamp // 3600)
+        cached_hour, tz = cls._offset_cache
+        if cached_hour != hour:
+            # Yaz saati geçişleri saat başında olur; saatlik ofset her zaman doğrudur
+            offset = datetime.fromtimestamp(hour * 3600, pytz.utc).astimezone(ISTANBUL_TZ).utcoffset()
+            tz = timezone(offset)
+            cls._offset_cache = (hour, tz)
+        return tz
+
     def converter(self, timestamp):
-        dt = datetime.fromtimestamp(timestamp, pytz.utc)
-        return dt.astimezone(pytz.timezone('Europe/Istanbul'))
+        return datetime.fromtimestamp(timestamp, self._tzinfo(timestamp))
 
     def formatTime(self, record, datefmt=None):
-        dt = self.converter(record.created)
+        second = int(record.created)
+        cached = self._second_cache.get(datefmt)
+        if cached is None or cached[0] != second:
+            dt = self.converter(second)
+            # datefmt yoksa isoformat: saniye öneki + '.mmm' + UTC ofseti
+            text = dt.strftime(datefmt) if datefmt else (dt.isoformat()[:19], dt.isoformat()[19:])
+            cached = (second, text)
+            self._second_cache[datefmt] = cached
         if datefmt:
-            s = dt.strftime(datefmt)
-        else:
-            try:
-                s = dt.isoformat(timespec='milliseconds')
-            except TypeError:
-                s = dt.isoformat()
-        return s
+            return cached[1]
+        prefix, suffix = cached[1]
+        return f'{prefix}.{int(record.msecs):03d}{suffix}'
 
 
 class RequestContextFilter(logging.Filter):
@@ -90,13 +162,37 @@ class JSONFormatter(IstanbulFormatter):
         }
         if record.exc_info:
             log_record['exception'] = self.formatException(record.exc_info)
-        return json.dumps(log_record, ensure_ascii=False)
+        elif record.exc_text:
+            # Kuyruktan gelen kayıtlarda traceback metne çevrilmiş olur
+            log_record['exception'] = record.exc_text
+        return json_dumps(log_record)
+
+
+class JSONPayloadFormatter(logging.Formatter):
+    """
+    after_request'te toplanan payload sözlüğünü (extra={'payload': ...}) JSON satırına
+    çevirir. 'ts' alanı kaydın oluşturulma zamanından (UTC) burada eklenir.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._utc_cache = (None, None)  # (epoch saniyesi, '%Y-%m-%dT%H:%M:%S')
+
+    def _utc_ts(self, created):
+        second = int(created)
+        if self._utc_cache[0] != second:
+            self._utc_cache = (second, time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(second)))
+        return f'{self._utc_cache[1]}.{int((created - second) * 1e6):06d}Z'
+
+    def format(self, record):
+        payload = getattr(record, 'payload', None)
+        if payload is None:
+            return record.getMessage()
+        return json_dumps({'ts': self._utc_ts(record.created), **payload})
 
 
 class APILogFormatter(IstanbulFormatter):
     def format(self, record):
-        dt = self.converter(record.created)
-        asctime = dt.strftime('%Y-%m-%d %H:%M:%S')
+        asctime = self.formatTime(record, '%Y-%m-%d %H:%M:%S')
         remote_addr = getattr(record, 'remote_addr', '-')
         method = getattr(record, 'method', '-')
         path = getattr(record, 'path', '-')
@@ -105,9 +201,13 @@ class APILogFormatter(IstanbulFormatter):
         request_id = getattr(record, 'request_id', '-')
         user_id = getattr(record, 'user_id', '-')
         
+        db = ''
+        if getattr(record, 'db_queries', None) is not None:
+            db = f' db={record.db_queries}q/{record.db_ms}ms'
+        
         path_padding = 52 - len(method)
         return (f'[{asctime}] {remote_addr:<15} - {method} {path:<{path_padding}} '
-                f'{status:3} {duration_ms:4}ms rid={request_id} uid={user_id}')
+                f'{status:3} {duration_ms:4}ms{db} rid={request_id} uid={user_id}')
 
 
 def setup_logging(app):
@@ -132,7 +232,7 @@ def setup_logging(app):
     ctx_filter = RequestContextFilter()
     
     retention_days = app.config.get('LOG_RETENTION_DAYS', 7)
-    file_handler = TimedRotatingFileHandler(
+    file_handler = BufferedTimedRotatingFileHandler(
         log_file, when='midnight', interval=1, backupCount=retention_days, encoding='utf-8'
     )
     file_handler.rotator = compress_rotator
@@ -143,7 +243,7 @@ def setup_logging(app):
     
     if app.config.get('APP_LOG_JSON'):
         json_file = log_file.replace('.log', '.jsonl')
-        json_file_handler = TimedRotatingFileHandler(
+        json_file_handler = BufferedTimedRotatingFileHandler(
             json_file, when='midnight', interval=1, backupCount=retention_days, encoding='utf-8'
         )
         json_file_handler.rotator = compress_rotator
@@ -152,7 +252,7 @@ def setup_logging(app):
         json_file_handler.addFilter(ctx_filter)
         app.logger.addHandler(json_file_handler)
     
-    error_handler = RotatingFileHandler(
+    error_handler = BufferedRotatingFileHandler(
         error_log_file, maxBytes=10*1024*1024, backupCount=10, encoding='utf-8'
     )
     error_handler.setFormatter(default_formatter)
@@ -182,7 +282,7 @@ def setup_api_logging(app):
     formatter = APILogFormatter(
         datefmt='%Y-%m-%d %H:%M:%S'
     )
-    handler = TimedRotatingFileHandler(
+    handler = BufferedTimedRotatingFileHandler(
         api_log_file, when='midnight', interval=1, backupCount=app.config.get('LOG_RETENTION_DAYS', 30), encoding='utf-8'
     )
     handler.rotator = compress_rotator
@@ -194,7 +294,7 @@ def setup_api_logging(app):
     api_logger.addHandler(handler)
     if app.config.get('API_LOG_JSON', True):
         json_file = api_log_file.replace('.log', '.jsonl')
-        json_handler = TimedRotatingFileHandler(
+        json_handler = BufferedTimedRotatingFileHandler(
             json_file, when='midnight', interval=1, backupCount=app.config.get('LOG_RETENTION_DAYS', 30), encoding='utf-8'
         )
         json_handler.rotator = compress_rotator
@@ -204,7 +304,7 @@ def setup_api_logging(app):
         json_logger.propagate = False
         json_logger.addHandler(json_handler)
         json_handler.addFilter(api_ctx_filter)
-        json_handler.setFormatter(logging.Formatter('%(message)s'))
+        json_handler.setFormatter(JSONPayloadFormatter())
 
     @app.before_request
     def _api_log_start():
@@ -264,10 +364,13 @@ def setup_api_logging(app):
                     'duration_ms': duration_ms,
                     'user_id': getattr(g, 'user_uid', '-')
                 }
+                query_stats = g.get('_query_stats')
+                if query_stats is not None:
+                    extra['db_queries'] = query_stats.count
+                    extra['db_ms'] = round(query_stats.total_ms, 1)
                 api_logger.info('', extra=extra)
                 if app.config.get('API_LOG_JSON', True):
                     payload = {
-                        'ts': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
                         'rid': getattr(g, 'request_id', '-'),
                         'uid': getattr(g, 'user_uid', '-'),
                         'ip': ip,
@@ -278,7 +381,12 @@ def setup_api_logging(app):
                         'ua': ua,
                         'referer': referer
                     }
-                    logging.getLogger('api_logger.json').info(json.dumps(payload, ensure_ascii=False))
+                    if query_stats is not None:
+                        payload['db'] = query_stats.as_dict()
+                    timings = current_phases()
+                    if timings:
+                        payload['timings'] = timings
+                    logging.getLogger('api_logger.json').info('', extra={'payload': payload})
         except Exception:
             pass
         return response
@@ -291,7 +399,7 @@ def setup_security_logging(app):
     level_name = app.config.get('LOG_LEVEL', 'INFO').upper()
     logger.setLevel(getattr(logging, level_name, logging.INFO))
     logger.propagate = False
-    handler = TimedRotatingFileHandler(
+    handler = BufferedTimedRotatingFileHandler(
         sec_log_file, when='midnight', interval=1, backupCount=app.config.get('LOG_RETENTION_DAYS', 30), encoding='utf-8'
     )
     handler.rotator = compress_rotator
@@ -322,7 +430,7 @@ def setup_all_requests_logging(app):
     formatter = APILogFormatter(
         datefmt='%Y-%m-%d %H:%M:%S'
     )
-    handler = TimedRotatingFileHandler(
+    handler = BufferedTimedRotatingFileHandler(
         all_requests_log_file, when='midnight', interval=1, backupCount=app.config.get('LOG_RETENTION_DAYS', 30), encoding='utf-8'
     )
     handler.rotator = compress_rotator
@@ -334,7 +442,7 @@ def setup_all_requests_logging(app):
     all_requests_logger.addHandler(handler)
     if app.config.get('API_LOG_JSON', True):
         json_file = all_requests_log_file.replace('.log', '.jsonl')
-        json_handler = TimedRotatingFileHandler(
+        json_handler = BufferedTimedRotatingFileHandler(
             json_file, when='midnight', interval=1, backupCount=app.config.get('LOG_RETENTION_DAYS', 30), encoding='utf-8'
         )
         json_handler.rotator = compress_rotator
@@ -344,7 +452,10 @@ def setup_all_requests_logging(app):
         json_logger.propagate = False
         json_logger.addHandler(json_handler)
         json_handler.addFilter(api_ctx_filter)
-        json_handler.setFormatter(logging.Formatter('%(message)s'))
+        json_handler.setFormatter(JSONPayloadFormatter())
+
+    sampling_rules = LogSamplingRules(app.config.get('LOG_SAMPLING_RULES'))
+    request_stats.init_app(app)
 
     @app.before_request
     def _all_requests_log_start():
@@ -356,14 +467,22 @@ def setup_all_requests_logging(app):
             # Admin log sayfası isteklerini kaydetme
             if request.path.startswith('/admin/logs'):
                 return response
-                
+
+            duration_ms = int((time.time() - getattr(g, '_all_requests_log_start', time.time())) * 1000)
+            # Sayaçlar örneklemeden önce: admin istatistikleri tüm trafiği görür
+            is_page = request.blueprint == 'views' and request.method == 'GET' and response.status_code < 300
+            request_stats.record(request.endpoint, response.status_code, duration_ms,
+                                 page=request.path if is_page else None)
+
+            ua = request.headers.get('User-Agent', '')[:200]
+            sample_rate = sampling_rules.decide(request.path, response.status_code, duration_ms, ua, request.blueprint)
+            if sample_rate is None:
+                return response
+
             if request.headers.get('X-Forwarded-For'):
                 ip = request.headers.get('X-Forwarded-For').split(',')[0]
             else:
                 ip = request.remote_addr
-            
-            duration_ms = int((time.time() - getattr(g, '_all_requests_log_start', time.time())) * 1000)
-            ua = request.headers.get('User-Agent', '')[:200]
             referer = request.headers.get('Referer', '')[:200]
             path = request.full_path
             status = response.status_code
@@ -378,7 +497,6 @@ def setup_all_requests_logging(app):
             all_requests_logger.info('', extra=extra)
             if app.config.get('API_LOG_JSON', True):
                 payload = {
-                    'ts': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
                     'rid': getattr(g, 'request_id', '-'),
                     'uid': getattr(g, 'user_uid', '-'),
                     'ip': ip,
@@ -389,11 +507,289 @@ def setup_all_requests_logging(app):
                     'ua': ua,
                     'referer': referer
                 }
-                logging.getLogger('all_requests_logger.json').info(json.dumps(payload, ensure_ascii=False))
+                timings = current_phases()
+                if timings:
+                    payload['timings'] = timings
+                if sample_rate < 1.0:
+                    # Örneklenen kayıtlar analizde 1/sample ile çarpılarak sayılmalı
+                    payload['sample'] = sample_rate
+                logging.getLogger('all_requests_logger.json').info('', extra={'payload': payload})
         except Exception:
             pass
         return response
 
 
+class LogSamplingRules:
+    """
+    all_requests.log için kural motoru. Kurallar sırayla denenir; ilk eşleşen kuralın
+    aksiyonu uygulanır: 'log', 'drop' ya da 'sample' (kayıt 'rate' olasılıkla yazılır).
+    Eşleşme alanları opsiyoneldir, verilenlerin hepsi sağlanmalıdır:
+      prefix    — path önekleri           status — '5xx' gibi sınıflar ya da '404' gibi kodlar
+      min_ms    — en az bu süren istekler ua     — User-Agent'ta geçen parçalar
+      blueprint — Flask blueprint adları
+    """
+
+    def __init__(self, rules):
+        self.rules = [self._compile(rule) for rule in rules or []]
+
+    @staticmethod
+    def _compile(rule):
+        action = rule.get('action', 'log')
+        if action not in ('log', 'drop', 'sample'):
+            raise ValueError(f"Geçersiz log kuralı aksiyonu: {action}")
+        classes, codes = set(), set()
+        for status in rule.get('status', []):
+            status = str(status).lower()
+            if status.endswith('xx'):
+                classes.add(int(status[0]))
+            else:
+                codes.add(int(status))
+        prefix = rule.get('prefix')
+        ua = rule.get('ua')
+        blueprint = rule.get('blueprint')
+        return {
+            'action': action,
+            'rate': float(rule.get('rate', 1.0)),
+            'prefix': tuple([prefix] if isinstance(prefix, str) else prefix) if prefix else None,
+            'classes': classes,
+            'codes': codes,
+            'min_ms': rule.get('min_ms'),
+            'ua': tuple(part.lower() for part in ([ua] if isinstance(ua, str) else ua)) if ua else None,
+            'blueprint': frozenset([blueprint] if isinstance(blueprint, str) else blueprint) if blueprint else None,
+        }
+
+    @staticmethod
+    def _matches(rule, path, status, duration_ms, user_agent, blueprint):
+        if rule['prefix'] and not path.startswith(rule['prefix']):
+            return False
+        if (rule['classes'] or rule['codes']) and \
+                status // 100 not in rule['classes'] and status not in rule['codes']:
+            return False
+        if rule['min_ms'] is not None and duration_ms < rule['min_ms']:
+            return False
+        if rule['blueprint'] and blueprint not in rule['blueprint']:
+            return False
+        if rule['ua']:
+            user_agent = user_agent.lower()
+            if not any(part in user_agent for part in rule['ua']):
+                return False
+        return True
+
+    def decide(self, path, status, duration_ms, user_agent='', blueprint=None):
+        """Kayıt yazılacaksa örnekleme oranını (1.0 = tamamı), yazılmayacaksa None döndürür."""
+        for rule in self.rules:
+            if not self._matches(rule, path, status, duration_ms, user_agent, blueprint):
+                continue
+            if rule['action'] == 'log':
+                return 1.0
+            if rule['action'] == 'drop':
+                return None
+            return rule['rate'] if random.random() < rule['rate'] else None
+        return 1.0
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Kaydı istek thread'inde yalnızca kuyruğa bırakır; dosya I/O ve biçimlendirme
+    listener thread'inde yapılır. Kuyruk doluysa kayıt beklemeden düşürülür ve sayılır.
+    """
+    _exc_formatter = logging.Formatter()
+
+    def __init__(self, log_queue, targets):
+        super().__init__(log_queue)
+        self.targets = targets
+
+    def prepare(self, record):
+        # Mesajı ve traceback'i burada dondur: args ve exc_info başka thread'e taşınmaz.
+        # Formatter'lar listener'da çalışır (JSON dahil).
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record):
+        try:
+            self.queue.put_nowait((self.targets, self.prepare(record)))
+            _log_queue_stats['enqueued'] += 1
+        except queue.Full:
+            _log_queue_stats['dropped'] += 1
+            by_logger = _log_queue_stats['dropped_by_logger']
+            by_logger[record.name] = by_logger.get(record.name, 0) + 1
+        except Exception:
+            self.handleError(record)
+
+
+class BatchingQueueListener(QueueListener):
+    """
+    Kuyruktaki kayıtları kaynak logger'ın hedef handler'larına yazar. Dosyalar her
+    kayıtta değil, batch_size kayıtta ya da flush_interval saniyede bir flush edilir.
+    """
+
+    def __init__(self, log_queue, batch_size=256, flush_interval=1.0):
+        super().__init__(log_queue, respect_handler_level=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._reported_drops = 0
+
+    def _dispatch(self, targets, record, dirty):
+        for handler in targets:
+            if record.levelno < handler.level:
+                continue
+            handler.handle(record)
+            if isinstance(handler, _BatchFlushMixin):
+                dirty.add(handler)
+
+    def _flush(self, dirty):
+        for handler in dirty:
+            try:
+                handler.flush_batch()
+            except Exception:
+                pass
+        dirty.clear()
+        dropped = _log_queue_stats['dropped']
+        if dropped != self._reported_drops:
+            logging.lastResort.handle(logging.makeLogRecord({
+                'name': __name__, 'levelno': logging.WARNING, 'levelname': 'WARNING',
+                'msg': f'Log kuyruğu dolu: {dropped - self._reported_drops} kayıt düşürüldü (toplam {dropped})',
+            }))
+            self._reported_drops = dropped
+
+    def _monitor(self):
+        q = self.queue
+        dirty = set()
+        written = 0
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = q.get(timeout=timeout)
+            except queue.Empty:
+                self._flush(dirty)
+                written, deadline = 0, None
+                continue
+            if item is self._sentinel:
+                self._flush(dirty)
+                break
+            targets, record = item
+            try:
+                self._dispatch(targets, record, dirty)
+            except Exception:
+                pass
+            written += 1
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+            if written >= self.batch_size or time.monotonic() >= deadline:
+                self._flush(dirty)
+                written, deadline = 0, None
+
+
+def _stop_async_logging():
+    global _log_queue_listener
+    if _log_queue_listener is not None:
+        try:
+            _log_queue_listener.stop()
+        except Exception:
+            pass
+        _log_queue_listener = None
+
+
+def _start_log_listener(log_queue, batch_size, flush_interval):
+    global _log_queue_listener
+    _log_queue_listener = BatchingQueueListener(log_queue, batch_size=batch_size, flush_interval=flush_interval)
+    _log_queue_listener.start()
+
+
+def _restart_after_fork():
+    # Fork edilen süreçte listener thread'i yoktur; yeni kuyruk ve thread ile devam et
+    global _log_queue_listener
+    old = _log_queue_listener
+    if old is None:
+        return
+    new_queue = queue.Queue(old.queue.maxsize)
+    for handler in _log_queue_handlers:
+        handler.queue = new_queue
+    _start_log_listener(new_queue, old.batch_size, old.flush_interval)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_after_fork)
+atexit.register(_stop_async_logging)
+
+
+def setup_async_logging(app):
+    """
+    Diğer setup_* fonksiyonlarının kurduğu handler'ları tek bir arka plan kuyruğuna
+    taşır. Flask `g`'sini okuyan filtreler istek thread'inde kalsın diye hedef
+    handler'lardan alınıp QueueHandler'a eklenir.
+    """
+    if not app.config.get('LOG_ASYNC', True):
+        return
+
+    _stop_async_logging()
+    log_queue = queue.Queue(app.config.get('LOG_QUEUE_SIZE', 10000))
+
+    loggers = [
+        app.logger,
+        logging.getLogger('werkzeug'),
+        logging.getLogger('api_logger'),
+        logging.getLogger('api_logger.json'),
+        logging.getLogger('security_logger'),
+        logging.getLogger('all_requests_logger'),
+        logging.getLogger('all_requests_logger.json'),
+    ]
+
+    # Önce tüm hedefleri ve filtreleri topla: error_handler gibi paylaşılan
+    # handler'ların filtreleri her iki logger'ın QueueHandler'ına da eklenmeli.
+    plan = []
+    for logger in loggers:
+        targets = []
+        for handler in logger.handlers:
+            targets.extend(handler.targets if isinstance(handler, DroppingQueueHandler) else [handler])
+        if not targets:
+            continue
+        filters = []
+        for handler in targets:
+            for f in handler.filters:
+                if f not in filters:
+                    filters.append(f)
+        plan.append((logger, targets, filters))
+
+    del _log_queue_handlers[:]
+    for logger, targets, filters in plan:
+        for handler in targets:
+            handler.filters = []
+            if isinstance(handler, _BatchFlushMixin):
+                handler.deferred_flush = True
+        queue_handler = DroppingQueueHandler(log_queue, targets)
+        queue_handler.setLevel(min(h.level for h in targets))
+        for f in filters:
+            queue_handler.addFilter(f)
+        logger.handlers = [queue_handler]
+        _log_queue_handlers.append(queue_handler)
+
+    _start_log_listener(
+        log_queue,
+        app.config.get('LOG_BATCH_SIZE', 256),
+        app.config.get('LOG_FLUSH_INTERVAL', 1.0),
+    )
+
+
+def get_log_queue_stats():
+    """Asenkron log kuyruğunun anlık durumu (kuyruk boyu ve düşürülen kayıt sayıları)."""
+    listener = _log_queue_listener
+    return {
+        'async': listener is not None,
+        'queued': listener.queue.qsize() if listener else 0,
+        'capacity': listener.queue.maxsize if listener else 0,
+        'enqueued': _log_queue_stats['enqueued'],
+        'dropped': _log_queue_stats['dropped'],
+        'dropped_by_logger': dict(_log_queue_stats['dropped_by_logger']),
+    }
+
+
 def log_web_visit(ip, path, uid):
     return f'{ip:<18} ziyaret: {path} uid={uid}'
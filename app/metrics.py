@@ -0,0 +1,143 @@
+import os
+import time
+import hmac
+from contextlib import contextmanager
+
+# PROMETHEUS_MULTIPROC_DIR .env'den geliyorsa prometheus_client import edilmeden önce yüklenmeli
+from app.config import Config  # noqa: F401  (load_dotenv)
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+    )
+except ImportError:  # prometheus_client kurulu değilse ölçümler sessizce kapalıdır
+    Counter = Histogram = None
+
+MULTIPROC_DIR = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+
+# Saniye cinsinden kovalar
+FAST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+SLOW_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class _NoopMetric:
+    """prometheus_client yokken aynı arayüzü sunan boş ölçüm."""
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def inc(self, amount=1):
+        pass
+
+    def observe(self, amount):
+        pass
+
+
+def _counter(name, doc, labels):
+    return Counter(name, doc, labels) if Counter else _NoopMetric()
+
+
+def _histogram(name, doc, labels, buckets):
+    return Histogram(name, doc, labels, buckets=buckets) if Histogram else _NoopMetric()
+
+
+# ─── Ölçümler ───
+# Yalnızca Counter/Histogram: multiprocess modunda worker'lar arasında toplanabilirler.
+
+HTTP_REQUEST_SECONDS = _histogram(
+    'cv_http_request_duration_seconds', 'Endpoint başına istek süresi', ['endpoint', 'method'], SLOW_BUCKETS
+)
+HTTP_REQUESTS = _counter('cv_http_requests_total', 'Endpoint ve durum sınıfı başına istek sayısı', ['endpoint', 'status'])
+
+CACHE_REQUESTS = _counter('cv_cache_requests_total', 'Uygulama cache isabet/ıska sayıları', ['cache', 'result'])
+
+DB_QUERY_SECONDS = _histogram('cv_db_query_duration_seconds', 'Veritabanı sorgu süresi', ['query'], FAST_BUCKETS)
+
+UPSTREAM_SECONDS = _histogram(
+    'cv_upstream_request_duration_seconds', 'Dış API çağrı süresi', ['upstream'], SLOW_BUCKETS
+)
+UPSTREAM_FAILURES = _counter('cv_upstream_failures_total', 'Başarısız dış API çağrıları', ['upstream', 'reason'])
+
+OG_RENDER_SECONDS = _histogram(
+    'cv_og_render_duration_seconds', 'OG/story görseli üretim + kodlama süresi', ['kind', 'format'], SLOW_BUCKETS
+)
+OG_PLACEHOLDERS = _counter('cv_og_placeholder_total', 'Render edilemeyip yer tutucu sunulan görseller', ['kind'])
+
+BOT_FANOUT_SECONDS = _histogram(
+    'cv_bot_fanout_duration_seconds', 'Bot bildirim turunun toplam süresi', ['bot', 'kind'], SLOW_BUCKETS
+)
+BOT_MESSAGES = _counter('cv_bot_messages_total', 'Bot bildirim mesajları', ['bot', 'result'])
+
+
+@contextmanager
+def timed(histogram, **labels):
+    """Bloğun süresini verilen histograma yazar (hata olsa bile)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - start)
+
+
+def cache_result(cache_name, hit):
+    CACHE_REQUESTS.labels(cache=cache_name, result='hit' if hit else 'miss').inc()
+
+
+def mark_process_dead(pid):
+    """gunicorn child_exit kancasından çağrılır; ölen worker'ın canlı dosyalarını temizler."""
+    if Counter and MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid)
+
+
+# ─── /metrics ───
+
+def _registry():
+    # Multiprocess modunda her scrape tüm süreçlerin (gunicorn worker'ları, botlar) dosyalarını birleştirir
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def _is_authorized(request, token):
+    # Token tanımlı değilse endpoint kapalıdır: ters vekil arkasında remote_addr her
+    # istekte vekilin yerel adresi olduğundan IP'ye göre izin verilemez
+    if not token:
+        return False
+    auth = request.headers.get('Authorization', '')
+    return hmac.compare_digest(auth, f'Bearer {token}')
+
+
+def setup_metrics(app):
+    """İstek süresi kancalarını ve /metrics endpoint'ini kaydeder."""
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+    if Counter is None:
+        app.logger.info('[metrics] prometheus_client kurulu değil, /metrics devre dışı.')
+        return
+
+    from flask import Response, abort, g, request
+    from app.extensions import limiter
+
+    @app.before_request
+    def _metrics_start():
+        g._metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _metrics_end(response):
+        start = getattr(g, '_metrics_start', None)
+        if start is not None and request.endpoint != 'metrics':
+            # Eşleşmeyen yollar tek etikette toplanır; etiket sayısı sınırlı kalır
+            endpoint = request.endpoint or '(eşleşmeyen)'
+            HTTP_REQUEST_SECONDS.labels(endpoint=endpoint, method=request.method).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(endpoint=endpoint, status=f'{response.status_code // 100}xx').inc()
+        return response
+
+    @limiter.exempt
+    def metrics():
+        if not _is_authorized(request, app.config.get('METRICS_TOKEN')):
+            abort(404)
+        return Response(generate_latest(_registry()), mimetype=CONTENT_TYPE_LATEST)
+
+    app.add_url_rule('/metrics', 'metrics', metrics)
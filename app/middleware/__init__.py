@@ -11,6 +11,11 @@ def setup_middleware(app):
     def set_request_context():
         g.request_id = uuid.uuid4().hex[:12]
 
+    # Kapalıyken hiçbir kanca kaydedilmez (sıfır ek yük)
+    if app.config.get('PROFILER_ENABLED'):
+        from app.middleware.profiler import setup_profiler
+        setup_profiler(app)
+
     @app.before_request
     def check_instagram_browser():
         user_agent = request.headers.get('User-Agent', '').lower()
@@ -0,0 +1,351 @@
+import os
+import re
+import sys
+import json
+import time
+import random
+import threading
+from collections import Counter
+from datetime import datetime
+
+import pytz
+
+from flask import request, current_app, g
+from itsdangerous import URLSafeTimedSerializer, BadSignature
+
+from app.extensions import is_vip_key
+
+PROFILE_COOKIE = 'cv_profile'
+PROFILE_HEADER = 'X-Profile'
+MAX_STACK_DEPTH = 128
+_SAFE_NAME = re.compile(r'[^A-Za-z0-9_.-]')
+_frame_labels = {}
+ISTANBUL_TZ = pytz.timezone('Europe/Istanbul')
+
+
+def _frame_label(code):
+    label = _frame_labels.get(code)
+    if label is None:
+        label = _frame_labels[code] = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return label
+
+
+def collapse_stack(frame):
+    """Frame zincirini flame graph'ın 'kök;...;yaprak' biçimine çevirir."""
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return ';'.join(labels)
+
+
+class StackSampler:
+    """
+    Profillenen istek thread'lerinin yığınını `interval` saniyede bir örnekler.
+    Hedef yokken thread bir Event üzerinde bekler; hiç uyanmaz.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self._targets = {}
+        self._lock = threading.Lock()
+        self._active = threading.Event()
+        self._pid = None
+
+    def _ensure_thread(self):
+        # Fork sonrası örnekleyici thread çocuk süreçte yoktur
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._targets = {}
+            threading.Thread(target=self._run, name='profiler-sampler', daemon=True).start()
+
+    def start(self, thread_id):
+        self._ensure_thread()
+        counts = Counter()
+        with self._lock:
+            self._targets[thread_id] = counts
+            self._active.set()
+        return counts
+
+    def stop(self, thread_id):
+        with self._lock:
+            counts = self._targets.pop(thread_id, None)
+            if not self._targets:
+                self._active.clear()
+        return counts
+
+    def _run(self):
+        while True:
+            self._active.wait()
+            time.sleep(self.interval)
+            with self._lock:
+                targets = list(self._targets.items())
+            if not targets:
+                continue
+            frames = sys._current_frames()
+            for thread_id, counts in targets:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    counts[collapse_stack(frame)] += 1
+
+
+class ProfileStore:
+    """
+    Profilleri PROFILER_DIR altında saklar:
+      requests/<id>.json           — tek isteğin meta verisi ve yığınları
+      endpoints/<endpoint>.<pid>.folded — süreç başına endpoint toplamı (flame graph girdisi)
+      endpoints/clears.json        — {endpoint ya da '*': temizlenme zamanı}
+    Süreç başına dosya kullanıldığı için worker'lar arasında kilit gerekmez; okurken birleşir.
+    Temizleme diğer worker'lara clears.json ile ulaşır: bellekteki toplam, başlangıcından
+    sonra temizlenmişse bir sonraki kayıtta sıfırlanır.
+    """
+
+    def __init__(self, directory, keep=200):
+        self.directory = directory
+        self.keep = keep
+        self._totals = {}  # {endpoint: (Counter, başlangıç zamanı)}
+        self._totals_pid = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    @classmethod
+    def from_app(cls, app):
+        directory = app.config.get('PROFILER_DIR') or os.path.join(app.instance_path, 'profiles')
+        return cls(directory, app.config.get('PROFILER_KEEP', 200))
+
+    def _path(self, *parts):
+        return os.path.join(self.directory, *parts)
+
+    @staticmethod
+    def _atomic_write(path, text):
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+    def _read_clears(self):
+        try:
+            with open(self._path('endpoints', 'clears.json'), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def to_folded(stacks):
+        return ''.join(f'{stack} {count}\n' for stack, count in sorted(stacks.items()))
+
+    # ─── Yazma ───
+
+    def save(self, meta, stacks):
+        endpoint = _SAFE_NAME.sub('_', meta['endpoint'])
+        os.makedirs(self._path('requests'), exist_ok=True)
+        os.makedirs(self._path('endpoints'), exist_ok=True)
+        self._atomic_write(self._path('requests', f"{meta['id']}.json"),
+                           json.dumps({**meta, 'stacks': stacks}, ensure_ascii=False))
+        clears = self._read_clears()
+        cleared_at = max(clears.get('*', 0), clears.get(endpoint, 0))
+        with self._lock:
+            if self._totals_pid != os.getpid():
+                # Fork sonrası ebeveynin toplamları ebeveynin dosyasında kalır
+                self._totals, self._totals_pid = {}, os.getpid()
+            total, since = self._totals.get(endpoint, (None, 0))
+            if total is None or cleared_at >= since:
+                # Yeni endpoint ya da bu toplam başka bir worker'da / panelden temizlendi
+                total, since = Counter(), time.time()
+                self._totals[endpoint] = (total, since)
+            total.update(stacks)
+            folded = self.to_folded(total)
+            self._writes += 1
+            prune = self._writes % 20 == 0
+        self._atomic_write(self._path('endpoints', f'{endpoint}.{os.getpid()}.folded'), folded)
+        if prune:
+            self._prune()
+
+    def _prune(self):
+        names = sorted(os.listdir(self._path('requests')))
+        for name in names[:-self.keep] if len(names) > self.keep else []:
+            try:
+                os.remove(self._path('requests', name))
+            except OSError:
+                pass
+
+    # ─── Okuma (admin paneli) ───
+
+    def recent(self, limit=50):
+        directory = self._path('requests')
+        if not os.path.isdir(directory):
+            return []
+        result = []
+        for name in sorted(os.listdir(directory), reverse=True)[:limit]:
+            try:
+                with open(os.path.join(directory, name), encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            data['samples'] = sum(data.pop('stacks').values())
+            data['time'] = datetime.fromtimestamp(data['ts'], ISTANBUL_TZ).strftime('%d.%m %H:%M:%S')
+            result.append(data)
+        return result
+
+    def get(self, profile_id):
+        if not re.fullmatch(r'[0-9]+-[0-9a-f]+', profile_id or ''):
+            return None
+        try:
+            with open(self._path('requests', f'{profile_id}.json'), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _endpoint_files(self):
+        directory = self._path('endpoints')
+        if not os.path.isdir(directory):
+            return {}
+        files = {}
+        for name in os.listdir(directory):
+            if name.endswith('.folded'):
+                endpoint = name[:-len('.folded')].rsplit('.', 1)[0]
+                files.setdefault(endpoint, []).append(os.path.join(directory, name))
+        return files
+
+    def endpoint_stacks(self, endpoint):
+        stacks = Counter()
+        for path in self._endpoint_files().get(endpoint, []):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    stack, _, count = line.rstrip('\n').rpartition(' ')
+                    if stack and count.isdigit():
+                        stacks[stack] += int(count)
+        return stacks
+
+    def endpoints(self):
+        """{endpoint: toplam örnek} — en çok örneklenen önce."""
+        totals = {endpoint: sum(self.endpoint_stacks(endpoint).values()) for endpoint in self._endpoint_files()}
+        return dict(sorted(totals.items(), key=lambda kv: kv[1], reverse=True))
+
+    @staticmethod
+    def top_frames(stacks, top=25):
+        """Yaprak (self) ve kapsayıcı (inclusive) örnek sayılarına göre en sıcak fonksiyonlar."""
+        self_counts, inclusive = Counter(), Counter()
+        for stack, count in stacks.items():
+            frames = stack.split(';')
+            self_counts[frames[-1]] += count
+            for frame in set(frames):
+                inclusive[frame] += count
+        total = sum(stacks.values()) or 1
+        return [
+            {'frame': frame, 'self': count, 'inclusive': inclusive[frame],
+             'self_pct': round(100.0 * count / total, 1), 'inclusive_pct': round(100.0 * inclusive[frame] / total, 1)}
+            for frame, count in self_counts.most_common(top)
+        ]
+
+    def clear(self, endpoint=None):
+        # Önce işaret: dosyalar silinirken kayıt yapan worker eski toplamı yeniden yazmasın
+        os.makedirs(self._path('endpoints'), exist_ok=True)
+        clears = {} if endpoint is None else self._read_clears()
+        clears[endpoint or '*'] = time.time()
+        self._atomic_write(self._path('endpoints', 'clears.json'), json.dumps(clears))
+        with self._lock:
+            if endpoint is None:
+                self._totals = {}
+            else:
+                self._totals.pop(endpoint, None)
+        for ep, paths in self._endpoint_files().items():
+            if endpoint is None or ep == endpoint:
+                for path in paths:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+
+# ─── Tetikleyici çerez ───
+
+def _cookie_serializer(app):
+    return URLSafeTimedSerializer(app.config['SECRET_KEY'], salt='cv-profile')
+
+
+def make_profile_cookie(app):
+    return _cookie_serializer(app).dumps('1')
+
+
+def has_profile_cookie(app, max_age=3600):
+    token = request.cookies.get(PROFILE_COOKIE)
+    if not token:
+        return False
+    try:
+        _cookie_serializer(app).loads(token, max_age=max_age)
+        return True
+    except BadSignature:
+        return False
+
+
+def _is_triggered(app, sample_rate):
+    if has_profile_cookie(app):
+        return True
+    if request.headers.get(PROFILE_HEADER) == '1':
+        if is_vip_key(request.headers.get('X-API-Key')):
+            return True
+    return sample_rate > 0 and random.random() < sample_rate
+
+
+def setup_profiler(app):
+    """
+    İstek bazlı örnekleyici profiler. Yalnızca PROFILER_ENABLED iken kaydedilir; kapalıyken
+    hiçbir kanca eklenmez. Etkinken şu istekler profillenir:
+      - admin panelinden alınan imzalı cv_profile çerezini taşıyanlar,
+      - 'X-Profile: 1' ve geçerli bir VIP X-API-Key gönderenler,
+      - PROFILER_SAMPLE_RATE olasılığıyla rastgele seçilenler.
+    """
+    sampler = StackSampler(app.config.get('PROFILER_INTERVAL_MS', 5) / 1000.0)
+    store = ProfileStore.from_app(app)
+    sample_rate = app.config.get('PROFILER_SAMPLE_RATE', 0.0)
+    app.extensions['profiler'] = store
+
+    @app.before_request
+    def _profile_start():
+        if request.endpoint == 'static' or not _is_triggered(app, sample_rate):
+            return
+        g._profile = (threading.get_ident(), time.perf_counter(), time.time())
+        sampler.start(g._profile[0])
+
+    def _finish(status):
+        thread_id, start, started_at = g.pop('_profile')
+        stacks = sampler.stop(thread_id)
+        if not stacks:
+            return None
+        rid = getattr(g, 'request_id', None) or os.urandom(6).hex()
+        meta = {
+            'id': f'{int(started_at * 1000)}-{rid}',
+            'ts': started_at,
+            'method': request.method,
+            'path': request.full_path.rstrip('?'),
+            'endpoint': request.endpoint or 'eslesmeyen',
+            'status': status,
+            'duration_ms': round((time.perf_counter() - start) * 1000, 1),
+            'interval_ms': sampler.interval * 1000,
+        }
+        try:
+            store.save(meta, dict(stacks))
+        except Exception as e:
+            current_app.logger.warning(f"[profiler] Profil kaydedilemedi: {e}")
+            return None
+        return meta['id']
+
+    @app.after_request
+    def _profile_end(response):
+        if '_profile' in g:
+            profile_id = _finish(response.status_code)
+            if profile_id:
+                response.headers['X-Profile-Id'] = profile_id
+        return response
+
+    @app.teardown_request
+    def _profile_teardown(exc):
+        # after_request'e ulaşmayan (hata veren) istekler
+        if '_profile' in g:
+            _finish(500)
@@ -0,0 +1,118 @@
+import re
+import time
+from collections import Counter
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.timing import add_server_timing
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r'\(\s*(?:\?|%s|:\w+|%\(\w+\)s)(?:\s*,\s*(?:\?|%s|:\w+|%\(\w+\)s))+\s*\)')
+_SPACES = re.compile(r'\s+')
+
+
+def statement_shape(statement):
+    """Aynı sorgunun farklı parametreli tekrarlarını eşleştirmek için SQL'i normalleştirir."""
+    shape = _LITERALS.sub('?', statement)
+    shape = _IN_LISTS.sub('(?…)', shape)
+    return _SPACES.sub(' ', shape).strip()
+
+
+class QueryStats:
+    """Tek bir isteğin sorgu sayısı, toplam DB süresi ve en yavaş ifadeleri."""
+    __slots__ = ('count', 'total_ms', 'slowest', 'shapes', 'keep')
+
+    def __init__(self, keep=3):
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest = []  # [(ms, ifade)] yavaştan hızlıya
+        self.shapes = Counter()
+        self.keep = keep
+
+    def add(self, statement, elapsed_ms):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.shapes[statement_shape(statement)] += 1
+        if len(self.slowest) < self.keep or elapsed_ms > self.slowest[-1][0]:
+            self.slowest.append((elapsed_ms, statement[:300]))
+            self.slowest.sort(key=lambda item: item[0], reverse=True)
+            del self.slowest[self.keep:]
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'ms': round(self.total_ms, 1),
+            'slowest': [{'ms': round(ms, 1), 'sql': sql} for ms, sql in self.slowest],
+        }
+
+
+def current_query_stats():
+    """İstek içindeyse bu isteğin QueryStats nesnesi, değilse None."""
+    if not has_request_context():
+        return None
+    return g.get('_query_stats')
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('_query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('_query_start')
+    if not starts:
+        return
+    elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+    stats = current_query_stats()
+    if stats is not None:
+        stats.add(statement, elapsed_ms)
+
+
+def _handle_error(exception_context):
+    # Hata veren ifadede after_cursor_execute çalışmaz; başlangıç zamanını düşür
+    conn = exception_context.connection
+    if conn is not None and conn.info.get('_query_start'):
+        conn.info['_query_start'].pop()
+
+
+def setup_query_stats(app):
+    """
+    SQLAlchemy cursor olaylarıyla her isteğin sorgu sayısını, toplam DB süresini ve en
+    yavaş ifadelerini g._query_stats'a toplar; Server-Timing 'db' girdisi olarak yazar.
+    Debug modunda sorgu bütçesi aşılırsa ya da aynı ifade biçimi SQL_REPEAT_THRESHOLD
+    kez tekrarlanırsa (N+1) uyarı loglar.
+    """
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(Engine, 'handle_error', _handle_error)
+
+    keep = app.config.get('SQL_SLOWEST_COUNT', 3)
+    budget = app.config.get('SQL_QUERY_BUDGET', 20)
+    repeat_threshold = app.config.get('SQL_REPEAT_THRESHOLD', 5)
+
+    @app.before_request
+    def _query_stats_start():
+        g._query_stats = QueryStats(keep)
+
+    @app.after_request
+    def _query_stats_end(response):
+        stats = g.get('_query_stats')
+        if stats is None or not stats.count:
+            return response
+        add_server_timing(response, 'db', stats.total_ms, f'{stats.count} sorgu')
+
+        if app.debug:
+            if stats.count > budget:
+                app.logger.warning(
+                    f"[sql] Sorgu bütçesi aşıldı: {request.method} {request.path} "
+                    f"{stats.count} sorgu (bütçe {budget}), {stats.total_ms:.1f}ms"
+                )
+            for shape, count in stats.shapes.most_common():
+                if count < repeat_threshold:
+                    break
+                app.logger.warning(
+                    f"[sql] Olası N+1: {request.method} {request.path} aynı ifade {count} kez: {shape[:300]}"
+                )
+        return response
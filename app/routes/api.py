@@ -2,7 +2,10 @@ from flask import Blueprint, jsonify, request, current_app, abort, render_templa
 import logging
 
 from app.services import UserService, PrayerService, get_daily_content, get_country_for_city, get_timezone_for_city, CITY_DISPLAY_NAME_MAPPING, COUNTRY_NAME_MAPPING
-from app.extensions import cache, limiter, db, csrf
+from app.extensions import cache, limiter, db, csrf, is_vip_key, redis_pool
+from app.logging_config import get_log_queue_stats
+from app.conditional import conditional
+from app.cache_versions import cached_view, VAKIT, CONTENT
 from datetime import datetime, date, timedelta
 from functools import wraps
 import re
@@ -103,9 +106,7 @@ def restrict_to_main_domain(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
         # 1. VIP API Anahtarı Kontrolü
-        api_key = request.headers.get('X-API-Key') or request.args.get('key')
-        vip_keys = current_app.config.get('VIP_API_KEYS', [])
-        if api_key and api_key in vip_keys:
+        if is_vip_key(request.headers.get('X-API-Key') or request.args.get('key')):
             return f(*args, **kwargs)
 
         # 2. Geliştirme Ortamı Kontrolü
@@ -134,7 +135,8 @@ def restrict_to_main_domain(f):
 
 @api_bp.route('/sehirler')
 #@restrict_to_main_domain
-@cache.cached(timeout=86400, query_string=True)
+@conditional(max_age=86400, date_scoped=False)
+@cached_view(86400, query_string=True)
 def sehirleri_getir():
     country_code = request.args.get('country', 'TR')
     if not is_latin_only(country_code):
@@ -143,19 +145,21 @@ def sehirleri_getir():
 
 @api_bp.route('/sehirler/uluslararasi')
 #@restrict_to_main_domain
-@cache.cached(timeout=86400)
+@conditional(max_age=86400, date_scoped=False)
+@cached_view(86400)
 def uluslararasi_sehirleri_getir():
     return jsonify(UserService.get_sehirler('INT'))
 
 @api_bp.route('/sehirler/tumu')
 #@restrict_to_main_domain
-@cache.cached(timeout=86400)
+@conditional(max_age=86400, date_scoped=False)
+@cached_view(86400)
 def tum_sehirleri_getir():
     return jsonify(UserService.get_sehirler('ALL'))
 
 @api_bp.route('/sehirler/ara')
 @restrict_to_main_domain
-@cache.cached(timeout=3600, query_string=True)
+@cached_view(3600, query_string=True)
 def sehirleri_ara():
     arama = request.args.get('q', '').strip().lower()
     if not arama or not is_latin_only(arama):
@@ -171,7 +175,7 @@ def sehirleri_ara():
 
 @api_bp.route('/sehir/suanki_zaman')
 @restrict_to_main_domain
-@cache.cached(timeout=60, query_string=True)
+@cached_view(60, query_string=True)
 def sehir_suanki_zaman():
     sehir = request.args.get('sehir')
     if not sehir:
@@ -194,7 +198,8 @@ def sehir_suanki_zaman():
 
 @api_bp.route('/ulkeler')
 @restrict_to_main_domain
-@cache.cached(timeout=86400)
+@conditional(max_age=86400, date_scoped=False)
+@cached_view(86400)
 def ulkeleri_getir():
     tum_sehirler = UserService.get_sehirler('ALL')
     ulke_kodlari = set()
@@ -210,7 +215,8 @@ def ulkeleri_getir():
 
 @api_bp.route('/ulke/detay')
 @restrict_to_main_domain
-@cache.cached(timeout=86400, query_string=True)
+@conditional(max_age=86400, date_scoped=False)
+@cached_view(86400, query_string=True)
 def ulke_detay():
     ulke_kodu = request.args.get('kod')
     if not ulke_kodu or not is_latin_only(ulke_kodu):
@@ -225,7 +231,7 @@ def ulke_detay():
 
 @api_bp.route('/sehir/detay')
 @restrict_to_main_domain
-@cache.cached(timeout=86400, query_string=True)
+@cached_view(86400, query_string=True)
 def sehir_detay():
     sehir = request.args.get('sehir')
     if not sehir:
@@ -277,13 +283,15 @@ def sonraki_vakti_getir():
 
 @api_bp.route('/daily_content')
 @restrict_to_main_domain
-@cache.cached(timeout=86400)
+@conditional(CONTENT, max_age=600)
+@cached_view(86400, CONTENT)
 def daily_content():
     return jsonify(get_daily_content())
 
 # Public API v1
 @api_bp.route('/cagri_vakitleri')
 @restrict_to_main_domain
+@conditional(VAKIT, max_age=300)
 def public_api_vakitler():
     sehir = request.args.get('sehir')
     country_code = request.args.get('ulke', 'TR').upper()
@@ -474,8 +482,17 @@ def health_check():
     except Exception:
         if overall == "ok":
             overall = "warning"
-    
-    return jsonify({"status": overall}), http_status
+
+    result = {"status": overall}
+    # İki katmanlı cache'te bu worker'ın L1 / L2 isabet oranları
+    if hasattr(cache.cache, 'stats'):
+        result["cache"] = cache.cache.stats()
+        # Paylaşılan havuz yalnızca Redis cache'te anlamlı: PING gecikmesi, bağlantı sayıları
+        result["redis"] = redis_pool.stats()
+        if not result["redis"].get("ok") and overall == "ok":
+            overall = result["status"] = "warning"
+    result["log_queue"] = get_log_queue_stats()
+    return jsonify(result), http_status
 
 @api_bp.route('/error/<int:code>')
 def error_page(code):
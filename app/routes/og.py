@@ -9,12 +9,23 @@ Query parametreleri:
   theme    — Renk teması                (city|ramadan|home|default|live|ataturk|blog|project)
   prompt   — Sol üstteki terminal komutu (max 60 karakter)
   domain   — Sağ alttaki domain metni  (max 50 karakter)
+  format   — Çıktı formatı              (png|webp|jpeg|avif; yoksa Accept başlığına göre)
 """
 
 import io
+import hashlib
+import threading
+from datetime import datetime
 from functools import lru_cache
-from flask import Blueprint, request, send_file
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+from flask import Blueprint, request, send_file, current_app
+from PIL import Image, ImageDraw, ImageFont, ImageFilter, features
+
+from app import metrics
+from app.extensions import cache
+from app.cache_versions import versioned_key, PAGE
+from app.timing import phase
+from app.services import CITY_DISPLAY_NAME_MAPPING
+from app.services.render_queue import RenderQueue
 
 og_bp = Blueprint('og', __name__)
 
@@ -232,18 +243,30 @@ def _hex_to_rgb(h: str) -> tuple[int, int, int]:
     h = h.lstrip('#')
     return (int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16))
 
+@lru_cache(maxsize=64)
 def _load_font(path: str, size: int) -> ImageFont.FreeTypeFont:
-    """Font yükle, bulamazsa varsayılanı kullan"""
+    """Font yükle, bulamazsa varsayılanı kullan.
+    (path, size) başına süreç içinde tek bir font nesnesi tutulur."""
     try:
         return ImageFont.truetype(path, size)
     except Exception:
         return ImageFont.load_default()
 
-def _fit_title_font(draw: ImageDraw.ImageDraw, text: str, max_width: int) -> tuple[ImageFont.FreeTypeFont, int]:
+# Ölçüm için kullanılan 1x1'lik yardımcı tuval (textbbox görsele bağlı değil)
+_MEASURE_DRAW = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+
+@lru_cache(maxsize=4096)
+def _text_bbox(text: str, font: ImageFont.FreeTypeFont) -> tuple[int, int, int, int]:
+    """textbbox sonucunu önbellekler; font nesneleri _load_font'tan geldiği
+    için (text, font) anahtarı domain, prompt ve etiket gibi tekrar eden
+    metinlerde kararlıdır."""
+    return _MEASURE_DRAW.textbbox((0, 0), text, font=font)
+
+def _fit_title_font(text: str, max_width: int) -> tuple[ImageFont.FreeTypeFont, int]:
     """Başlığı taşırmadan sığacak en büyük font boyutunu bul"""
     for size in TITLE_SIZES:
         font = _load_font(FONT_BOLD, size)
-        bbox = draw.textbbox((0, 0), text, font=font)
+        bbox = _text_bbox(text, font)
         if bbox[2] < max_width:
             return font, size
     font = _load_font(FONT_BOLD, TITLE_SIZES[-1])
@@ -270,7 +293,7 @@ def _draw_bracket(draw, x1, y1, x2, y2, color):
 def _draw_subtitle_multiline(draw, text, x, y, font, color, max_width, line_spacing=12):
     """Alt başlığı çok satırlı çizer (manuel '|' veya otomatik wrap)."""
     if '|' in text:
-        line_h = draw.textbbox((0, 0), 'A', font=font)[3] + line_spacing
+        line_h = _text_bbox('A', font)[3] + line_spacing
         for i, line in enumerate(text.split('|')):
             draw.text((x, y + i * line_h), line.strip(), font=font, fill=color)
         return
@@ -279,12 +302,12 @@ def _draw_subtitle_multiline(draw, text, x, y, font, color, max_width, line_spac
     line, cy = '', y
     for word in words:
         test = (line + ' ' + word).strip()
-        if draw.textbbox((0, 0), test, font=font)[2] <= max_width:
+        if _text_bbox(test, font)[2] <= max_width:
             line = test
         else:
             if line:
                 draw.text((x, cy), line, font=font, fill=color)
-                cy += draw.textbbox((0, 0), line, font=font)[3] + line_spacing
+                cy += _text_bbox(line, font)[3] + line_spacing
             line = word
     if line:
         draw.text((x, cy), line, font=font, fill=color)
@@ -307,7 +330,7 @@ def make_og(title, subtitle, theme, prompt, domain):
 
     # 3. Ana başlık (dikey merkez üstü)
     max_title_w = W - PAD * 2
-    f_title, title_size = _fit_title_font(d, title, max_title_w)
+    f_title, title_size = _fit_title_font(title, max_title_w)
     title_y = H // 2 - title_size - 16
     d.text((PAD, title_y), title, font=f_title, fill=_hex_to_rgb(t['text']))
 
@@ -317,7 +340,7 @@ def make_og(title, subtitle, theme, prompt, domain):
 
     # 5. Domain + bracket (sağ alt, merkezlenmiş)
     f_domain = _load_font(FONT_REG, DOM_FONT_SZ)
-    db = d.textbbox((0, 0), domain, font=f_domain)
+    db = _text_bbox(domain, f_domain)
     dw, dh = db[2] - db[0], db[3] - db[1]
 
     bx_w, bx_h = dw + DOM_PAD_X * 2, dh + DOM_PAD_Y * 2
@@ -333,100 +356,254 @@ def make_og(title, subtitle, theme, prompt, domain):
 # ÖZEL STORY ÜRETİCİ (Vakit Paylaş)
 # ─────────────────────────────────────────────────────────────────────────────
 
-def make_story_vakit(sehir, vakitler, tarih_str=""):
+STORY_VAKIT_KEYS = (
+    ('imsak', 'İMSAK'), ('gunes', 'GÜNEŞ'), ('ogle', 'ÖĞLE'),
+    ('ikindi', 'İKİNDİ'), ('aksam', 'AKŞAM'), ('yatsi', 'YATSI'),
+)
+STORY_CARD_Y  = 540    # ilk kartın üst kenarı
+STORY_CARD_H  = 165
+STORY_CARD_W  = 900
+STORY_CARD_GAP = 30
+
+
+def _story_card_box(i):
+    """i. vakit kartının (x1, y1, x2, y2) koordinatları."""
+    cx1 = (STORY_W - STORY_CARD_W) // 2
+    cy1 = STORY_CARD_Y + i * (STORY_CARD_H + STORY_CARD_GAP)
+    return cx1, cy1, cx1 + STORY_CARD_W, cy1 + STORY_CARD_H
+
+
+@lru_cache(maxsize=1)
+def _story_base():
     """
-    vakitler: {'imsak': '05:30', 'gunes': '07:00', ...}
+    Story görselinin isteğe göre değişmeyen katmanı: gradyan, bulanık ışık
+    patlamaları, cam kartlar ve sabit yazılar. Süreç başına bir kez çizilir,
+    her istek sadece kopyasının üzerine şehir/tarih/saat yazar.
     """
     # 1. Base Image - Derin Gradyan
-    # Slate 950 -> Slate 900 -> Indigo 950 geçişi gibi bir derinlik
-    img = Image.new('RGBA', (STORY_W, STORY_H), (2, 6, 23, 255)) 
-    d = ImageDraw.Draw(img)
-
-    # Çok katmanlı Gradyan (Daha "Premium" görünüm)
-    for i in range(STORY_H):
-        # Üstten alta koyulaşan ve hafif renk değiştiren geçiş
-        r = int(15 + (10 - 15) * (i / STORY_H))
-        g = int(23 + (15 - 23) * (i / STORY_H))
-        b = int(42 + (30 - 42) * (i / STORY_H))
-        d.line([(0, i), (STORY_W, i)], fill=(r, g, b, 255))
+    # Üstten alta koyulaşan ve hafif renk değiştiren geçiş; satır satır
+    # çizmek yerine 1 piksel genişliğinde bir sütun üretip yatayda uzatıyoruz.
+    column = Image.new('RGBA', (1, STORY_H))
+    column.putdata([
+        (int(15 + (10 - 15) * (i / STORY_H)),
+         int(23 + (15 - 23) * (i / STORY_H)),
+         int(42 + (30 - 42) * (i / STORY_H)),
+         255)
+        for i in range(STORY_H)
+    ])
+    img = column.resize((STORY_W, STORY_H), Image.NEAREST)
 
     # Dekoratif Işık Patlamaları (Mesh Gradient hissi)
     overlay = Image.new('RGBA', (STORY_W, STORY_H), (0,0,0,0))
     od = ImageDraw.Draw(overlay)
     # Sağ üstte turkuaz parlama
-    od.ellipse([STORY_W-600, -200, STORY_W+300, 700], fill=(20, 184, 166, 60)) 
+    od.ellipse([STORY_W-600, -200, STORY_W+300, 700], fill=(20, 184, 166, 60))
     # Sol ortada altın parlama
     od.ellipse([-300, STORY_H//2-400, 400, STORY_H//2+400], fill=(245, 158, 11, 40))
     # Alt tarafta morumsu derinlik
     od.ellipse([200, STORY_H-500, STORY_W+400, STORY_H+300], fill=(99, 102, 241, 50))
-    
+
     # Bulanıklaştırma ve ana resme ekleme
     overlay = overlay.filter(ImageFilter.GaussianBlur(radius=80))
     img.alpha_composite(overlay)
-    
-    # Çizim için tekrar draw objesi (RGBA destekli)
-    d = ImageDraw.Draw(img)
 
-    # 2. Fonts
+    # 2. Vakit Kartları (Gerçek Glassmorphism) — kartlar çakışmadığı için
+    # altısı tek katmana çizilip tek seferde birleştirilir.
+    card_layer = Image.new('RGBA', (STORY_W, STORY_H), (0,0,0,0))
+    cd = ImageDraw.Draw(card_layer)
+    for i in range(len(STORY_VAKIT_KEYS)):
+        box = _story_card_box(i)
+        # Cam efekti - Biraz daha koyu ve belirgin kenarlık
+        cd.rounded_rectangle(box, radius=45, fill=(255, 255, 255, 20))
+        cd.rounded_rectangle(box, radius=45, outline=(255, 255, 255, 60), width=2)
+    img.alpha_composite(card_layer)
+
+    # 3. Sabit yazılar
+    d = ImageDraw.Draw(img)
     f_title  = _load_font(FONT_BOLD, 65)
-    f_city   = _load_font(FONT_BOLD, 135)
-    f_date   = _load_font(FONT_REG, 45)
     f_label  = _load_font(FONT_BOLD, 48)
-    f_time   = _load_font(FONT_BOLD, 85)
     f_footer = _load_font(FONT_REG, 38)
 
-    # 3. Header & Tarih
     d.text((STORY_W//2, 180), "NAMAZ VAKİTLERİ", font=f_title, fill=(255, 255, 255, 200), anchor="mm")
+    for i, (_, label) in enumerate(STORY_VAKIT_KEYS):
+        cx1, cy1, _, _ = _story_card_box(i)
+        d.text((cx1 + 80, cy1 + STORY_CARD_H//2), label, font=f_label, fill=(226, 232, 240, 255), anchor="lm")
+
+    # Footer - En alta kaydırıldı
+    d.text((STORY_W//2, STORY_H - 120), "cagrivakti.com.tr", font=f_footer, fill=(148, 163, 184, 180), anchor="mm")
+
+    # Alt Dekoratif Çizgi
+    line_w = 180
+    d.rounded_rectangle([STORY_W//2 - line_w, STORY_H - 70, STORY_W//2 + line_w, STORY_H - 62], radius=4, fill=(250, 204, 21, 200))
+
+    # Dinamik yazılar alfa kanalını kullanmadığı için taban RGB tutulur;
+    # böylece her istekte tam boy RGBA → RGB dönüşümü yapılmaz.
+    return img.convert('RGB')
+
+
+def make_story_vakit(sehir, vakitler, tarih_str=""):
+    """
+    vakitler: {'imsak': '05:30', 'gunes': '07:00', ...}
+    """
+    img = _story_base().copy()
+    d = ImageDraw.Draw(img)
+
+    f_city = _load_font(FONT_BOLD, 135)
+    f_date = _load_font(FONT_REG, 45)
+    f_time = _load_font(FONT_BOLD, 85)
+
+    # Şehir & Tarih
     d.text((STORY_W//2, 310), sehir.upper(), font=f_city, fill=(250, 204, 21, 255), anchor="mm")
-    
+
     if tarih_str:
         # Tarih için şık bir kapsül - Daha koyu ve belirgin
-        tw = d.textbbox((0, 0), tarih_str, font=f_date)[2]
+        tw = _text_bbox(tarih_str, f_date)[2]
         tx1, ty1 = STORY_W//2 - tw//2 - 40, 400
         tx2, ty2 = STORY_W//2 + tw//2 + 40, 475
         d.rounded_rectangle([tx1, ty1, tx2, ty2], radius=38, fill=(0, 0, 0, 60), outline=(255, 255, 255, 40), width=2)
         d.text((STORY_W//2, 438), tarih_str, font=f_date, fill=(255, 255, 255, 220), anchor="mm")
 
-    # 4. Vakit Kartları (Gerçek Glassmorphism)
-    vakit_keys = [
-        ('imsak', 'İMSAK', '\uf0510'), ('gunes', 'GÜNEŞ', '\uf0599'), ('ogle', 'ÖĞLE', '\uf0599'),
-        ('ikindi', 'İKİNDİ', '\uf0599'), ('aksam', 'AKŞAM', '\uf0510'), ('yatsi', 'YATSI', '\uf0510')
-    ]
-    
-    start_y = 540
-    card_h = 165
-    card_w = 900
-    gap = 30
-    
-    for i, (key, label, icon_hex) in enumerate(vakit_keys):
-        cy = start_y + i * (card_h + gap)
-        cx1, cy1 = (STORY_W - card_w)//2, cy
-        cx2, cy2 = cx1 + card_w, cy1 + card_h
-        
-        # Kart Katmanı
-        card_layer = Image.new('RGBA', (STORY_W, STORY_H), (0,0,0,0))
-        cd = ImageDraw.Draw(card_layer)
-        
-        # Cam efekti - Biraz daha koyu ve belirgin kenarlık
-        cd.rounded_rectangle([cx1, cy1, cx2, cy2], radius=45, fill=(255, 255, 255, 20))
-        cd.rounded_rectangle([cx1, cy1, cx2, cy2], radius=45, outline=(255, 255, 255, 60), width=2)
-        
-        img.alpha_composite(card_layer)
-        
-        # Yazıları ekle
+    # Vakit saatleri
+    for i, (key, _) in enumerate(STORY_VAKIT_KEYS):
+        _, cy1, cx2, _ = _story_card_box(i)
         time_val = vakitler.get(key, '--:--')
-        d.text((cx1 + 80, cy1 + card_h//2), label, font=f_label, fill=(226, 232, 240, 255), anchor="lm")
-        d.text((cx2 - 80, cy1 + card_h//2), time_val, font=f_time, fill=(255, 255, 255, 255), anchor="rm")
+        d.text((cx2 - 80, cy1 + STORY_CARD_H//2), time_val, font=f_time, fill=(255, 255, 255, 255), anchor="rm")
 
-    # 5. Footer - En alta kaydırıldı
-    footer_text = "cagrivakti.com.tr"
-    d.text((STORY_W//2, STORY_H - 120), footer_text, font=f_footer, fill=(148, 163, 184, 180), anchor="mm")
-    
-    # Alt Dekoratif Çizgi
-    line_w = 180
-    d.rounded_rectangle([STORY_W//2 - line_w, STORY_H - 70, STORY_W//2 + line_w, STORY_H - 62], radius=4, fill=(250, 204, 21, 200))
+    return img
 
-    return img.convert('RGB') # Finalde JPEG/PNG için RGB'ye çevir
+# ─────────────────────────────────────────────────────────────────────────────
+# RENDER KUYRUĞU VE CACHE
+# ─────────────────────────────────────────────────────────────────────────────
+OG_CACHE_TIMEOUT    = 86400   # paylaşılan cache'te OG görselinin ömrü (sn)
+STORY_CACHE_TIMEOUT = 3600    # story görselinin ömrü (sn)
+PLACEHOLDER_MAX_AGE = 60      # kuyruk doluyken sunulan yer tutucunun max-age'i
+
+_render_queue = None
+_render_queue_lock = threading.Lock()
+
+def _get_render_queue():
+    global _render_queue
+    if _render_queue is None:
+        # İlk istek patlamasında tek kuyruk: tekilleştirme ve max_pending süreç geneli olsun
+        with _render_queue_lock:
+            if _render_queue is None:
+                _render_queue = RenderQueue(
+                    max_workers=current_app.config.get('OG_RENDER_WORKERS', 2),
+                    max_pending=current_app.config.get('OG_RENDER_QUEUE_SIZE', 32),
+                    name='og-render'
+                )
+    return _render_queue
+
+def _og_cache_key(kind, *parts):
+    # Görsel metinden türer; çizim kodu / font değişirse deploy PAGE neslini ilerletir
+    digest = hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()
+    return versioned_key(f'{kind}_image_{digest}', PAGE)
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ÇIKTI FORMATLARI
+# ─────────────────────────────────────────────────────────────────────────────
+# format → (mimetype, PIL save argümanları)
+# PNG'de optimize=True, 1080×1920 story'de ~5 kat yavaş ama yalnızca ~%15 küçük.
+IMAGE_ENCODERS = {
+    'png':  ('image/png',  {'format': 'PNG',  'compress_level': 6}),
+    'jpeg': ('image/jpeg', {'format': 'JPEG', 'quality': 85, 'subsampling': 0,
+                            'optimize': True, 'progressive': True}),
+}
+if features.check('webp'):
+    IMAGE_ENCODERS['webp'] = ('image/webp', {'format': 'WEBP', 'quality': 82, 'method': 4})
+if features.check('avif'):
+    IMAGE_ENCODERS['avif'] = ('image/avif', {'format': 'AVIF', 'quality': 60, 'speed': 8})
+
+# Accept başlığıyla seçilebilen formatlar (tercih sırasıyla). AVIF ve JPEG
+# yalnızca format= ile istenir: AVIF'in encode maliyeti yüksek, JPEG ise
+# yalnızca fotoğraf benzeri story görseli için anlamlı.
+NEGOTIATED_FORMATS = tuple(f for f in ('webp',) if f in IMAGE_ENCODERS)
+DEFAULT_FORMAT = 'png'
+
+def _negotiate_format():
+    """format= parametresine, yoksa Accept başlığına göre çıktı formatını seçer."""
+    fmt = request.args.get('format', '').lower()
+    if fmt == 'jpg':
+        fmt = 'jpeg'
+    if fmt in IMAGE_ENCODERS:
+        return fmt
+    # */* veya image/* jokerleri sayılmaz: crawler'lar PNG almaya devam eder
+    accepted = {mimetype for mimetype, quality in request.accept_mimetypes if quality > 0}
+    for fmt in NEGOTIATED_FORMATS:
+        if IMAGE_ENCODERS[fmt][0] in accepted:
+            return fmt
+    return DEFAULT_FORMAT
+
+def _encode(img, fmt):
+    buf = io.BytesIO()
+    img.save(buf, **IMAGE_ENCODERS[fmt][1])
+    return buf.getvalue()
+
+def _cached_og(fmt, title, subtitle, theme, prompt, domain):
+    """OG görselini istenen formatta döndürür; paylaşılan cache'te yoksa üretir."""
+    key = _og_cache_key('og', fmt, title, subtitle, theme, prompt, domain)
+    data = cache.get(key)
+    if data is None:
+        with metrics.timed(metrics.OG_RENDER_SECONDS, kind='og', format=fmt):
+            data = _encode(make_og(title, subtitle, theme, prompt, domain), fmt)
+        cache.set(key, data, timeout=OG_CACHE_TIMEOUT)
+    return data
+
+def _story_key_parts(sehir, vakitler, tarih):
+    return (sehir, tarih, ','.join(f'{k}:{v}' for k, v in sorted(vakitler.items())))
+
+def _cached_story(fmt, sehir, vakitler, tarih):
+    """Story görselini istenen formatta döndürür; paylaşılan cache'te yoksa üretir."""
+    key = _og_cache_key('story', fmt, *_story_key_parts(sehir, vakitler, tarih))
+    data = cache.get(key)
+    if data is None:
+        with metrics.timed(metrics.OG_RENDER_SECONDS, kind='story', format=fmt):
+            data = _encode(make_story_vakit(sehir, vakitler, tarih), fmt)
+        cache.set(key, data, timeout=STORY_CACHE_TIMEOUT)
+    return data
+
+@lru_cache(maxsize=8)
+def _placeholder_og(fmt):
+    return _encode(make_og('Çağrı Vakti', 'Türkiye Namaz Vakitleri', 'default', 'cagrivakti.com.tr', 'cagrivakti.com.tr'), fmt)
+
+@lru_cache(maxsize=8)
+def _placeholder_story(fmt):
+    return _encode(make_story_vakit('Çağrı Vakti', {}, ''), fmt)
+
+def _run_in_app_context(app, fn, *args):
+    with app.app_context():
+        return fn(*args)
+
+@phase('og')
+def _render_off_thread(key, fn, *args):
+    """
+    Cache'te olmayan görseli render kuyruğuna verir ve sonucu bekler.
+    Kuyruk doluysa, süre aşılırsa ya da render hata verirse None döner.
+    """
+    app = current_app._get_current_object()
+    future = _get_render_queue().submit(key, _run_in_app_context, app, fn, *args)
+    if future is None:
+        app.logger.warning(f'[og] Render kuyruğu dolu, yer tutucu sunuluyor: {key}')
+        return None
+    try:
+        return future.result(timeout=app.config.get('OG_RENDER_TIMEOUT', 10))
+    except Exception as e:
+        app.logger.warning(f'[og] Render tamamlanamadı ({key}): {e!r}')
+        return None
+
+def _image_response(data, fmt):
+    resp = send_file(io.BytesIO(data), mimetype=IMAGE_ENCODERS[fmt][0])
+    resp.headers['Vary'] = 'Accept'
+    return resp
+
+def _placeholder_response(data, fmt):
+    resp = _image_response(data, fmt)
+    resp.headers['Cache-Control'] = f'public, max-age={PLACEHOLDER_MAX_AGE}'
+    return resp
+
+# ─────────────────────────────────────────────────────────────────────────────
+# FLASK ROUTE
+# ─────────────────────────────────────────────────────────────────────────────
 
 @og_bp.route('/paylas/vakit')
 def paylas_vakit():
@@ -442,38 +619,33 @@ def paylas_vakit():
                 k, v = item.split(':', 1)
                 vakit_dict[k] = v
     
-    img = make_story_vakit(sehir, vakit_dict, tarih)
-    buf = io.BytesIO()
-    img.save(buf, 'PNG', optimize=True)
-    resp = send_file(io.BytesIO(buf.getvalue()), mimetype='image/png')
+    fmt = _negotiate_format()
+    key = _og_cache_key('story', fmt, *_story_key_parts(sehir, vakit_dict, tarih))
+    data = cache.get(key)
+    metrics.cache_result('story_image', data is not None)
+    if data is None:
+        data = _render_off_thread(key, _cached_story, fmt, sehir, vakit_dict, tarih)
+    if data is None:
+        metrics.OG_PLACEHOLDERS.labels(kind='story').inc()
+        return _placeholder_response(_placeholder_story(fmt), fmt)
+
+    resp = _image_response(data, fmt)
     resp.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate, proxy-revalidate, max-age=0'
     resp.headers['Pragma'] = 'no-cache'
     resp.headers['Expires'] = '0'
     return resp
 
-# ─────────────────────────────────────────────────────────────────────────────
-# FLASK ROUTE
-# ─────────────────────────────────────────────────────────────────────────────
-
-# ─────────────────────────────────────────────────────────────────────────────
-# FLASK ROUTE
-# ─────────────────────────────────────────────────────────────────────────────
-
-@lru_cache(maxsize=300)
-def _cached_og(title, subtitle, theme, prompt, domain):
-    img = make_og(title, subtitle, theme, prompt, domain)
-    buf = io.BytesIO()
-    img.save(buf, 'PNG', optimize=True)
-    return buf.getvalue()
-
-@og_bp.route('/og-image')
-def og_image():
-    title    = request.args.get('title',    'Çağrı Vakti')[:80]
-    subtitle = request.args.get('subtitle', 'Türkiye Namaz Vakitleri')[:120]
-    theme    = request.args.get('theme',    'default')
-    icon     = request.args.get('icon',     '')[:20]
-    prompt   = request.args.get('prompt',   'cagrivakti.com.tr')[:60]
-    domain   = request.args.get('domain',   'cagrivakti.com.tr')[:50]
+def _og_args(args):
+    """
+    /og-image query parametrelerini (veya aynı anahtarlara sahip bir dict'i)
+    make_og argümanlarına çevirir: (title, subtitle, theme, prompt, domain)
+    """
+    title    = args.get('title',    'Çağrı Vakti')[:80]
+    subtitle = args.get('subtitle', 'Türkiye Namaz Vakitleri')[:120]
+    theme    = args.get('theme',    'default')
+    icon     = args.get('icon',     '')[:20]
+    prompt   = args.get('prompt',   'cagrivakti.com.tr')[:60]
+    domain   = args.get('domain',   'cagrivakti.com.tr')[:50]
 
     # Sadece ikon parametresini Unicode kaçış dizilerinden arındır
     try:
@@ -488,8 +660,61 @@ def og_image():
 
     # İkon varsa prompt'un başına ekle
     full_prompt = f"{icon} {prompt}".strip() if icon else prompt
+    return title, subtitle, theme, full_prompt, domain
 
-    data = _cached_og(title, subtitle, theme, full_prompt, domain)
-    resp = send_file(io.BytesIO(data), mimetype='image/png')
+@og_bp.route('/og-image')
+def og_image():
+    fmt = _negotiate_format()
+    og_args = _og_args(request.args)
+    key = _og_cache_key('og', fmt, *og_args)
+    data = cache.get(key)
+    metrics.cache_result('og_image', data is not None)
+    if data is None:
+        data = _render_off_thread(key, _cached_og, fmt, *og_args)
+    if data is None:
+        metrics.OG_PLACEHOLDERS.labels(kind='og').inc()
+        return _placeholder_response(_placeholder_og(fmt), fmt)
+
+    resp = _image_response(data, fmt)
     resp.headers['Cache-Control'] = 'public, max-age=3600'
     return resp
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ŞEHİR SAYFASI OG GÖRSELLERİ
+# ─────────────────────────────────────────────────────────────────────────────
+
+def city_og_params(sehir, vakitler, yil=None):
+    """sehir_sayfasi'nın og:image URL parametreleri."""
+    sehir_adi = CITY_DISPLAY_NAME_MAPPING.get(sehir, sehir.replace('-', ' ').title())
+    # Subtitle: ilk satır İmsak·Güneş·Öğle, ikinci satır İkindi·Akşam·Yatsı
+    subtitle = (
+        f"İmsak {vakitler['imsak']} · Güneş {vakitler['gunes']} · Öğle {vakitler['ogle']}|"
+        f"İkindi {vakitler['ikindi']} · Akşam {vakitler['aksam']} · Yatsı {vakitler['yatsi']}"
+    )
+    return dict(
+        title    = f"{sehir_adi} {yil or datetime.now().year} Namaz Vakitleri",
+        subtitle = subtitle,
+        theme    = 'city-page',
+        icon     = r"\udb80\udd46",
+        prompt   = f"{sehir_adi}",
+        domain   = 'cagrivakti.com.tr',
+    )
+
+def warm_city_og_images(cities=None, tarih_dt=None):
+    """
+    Şehir sayfalarının og:image görsellerini üretip paylaşılan cache'e yazar.
+    tarih_dt verilirse o günün vakitleriyle (gece yarısı öncesi ısıtma) üretilir.
+    Uygulama bağlamı içinde çağrılmalıdır; üretilen görsel sayısını döndürür.
+    """
+    import pytz
+    from app.services import UserService, PrayerService, get_country_for_city, get_timezone_for_city
+    count = 0
+    for sehir in cities or UserService.get_sehirler('ALL'):
+        country_code = get_country_for_city(sehir) or 'TR'
+        vakitler = PrayerService.get_vakitler(sehir, country_code, tarih_dt)
+        # Başlıktaki yıl vakitlerin gününden: 31 Aralık gecesi ısıtılan anahtar yeni yılın URL'siyle eşleşsin
+        gun = tarih_dt or datetime.now(pytz.timezone(get_timezone_for_city(sehir, country_code)))
+        # og:image'ı crawler'lar çeker; onlar Accept'te webp göndermez
+        _cached_og(DEFAULT_FORMAT, *_og_args(city_og_params(sehir, vakitler, gun.year)))
+        count += 1
+    return count
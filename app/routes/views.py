@@ -1,9 +1,13 @@
-from flask import Blueprint, render_template, request, redirect, url_for, session, make_response, send_from_directory, current_app, abort, flash, jsonify
+from flask import Blueprint, render_template, request, redirect, url_for, session, make_response, send_from_directory, send_file, current_app, abort, flash, jsonify
 from functools import wraps
 from app.services import UserService, PrayerService, RamadanService, get_timezone_for_city, get_daily_content, get_guides, get_guide_by_slug, get_country_for_city, CITY_DISPLAY_NAME_MAPPING, normalize_city_name
 from app.models import ContactMessage, DailyContent, Guide
 from app.extensions import cache, db, limiter, csrf
+from app.conditional import conditional
+from app import cache_versions
+from app.cache_versions import cached_view, GUIDE, CONTENT
 from datetime import datetime, timedelta
+import pytz
 import os
 import sys
 import json
@@ -13,6 +17,11 @@ from threading import Thread
 import re
 import hashlib
 from app.services.bot_manager import BotManager
+from app.services.sitemap_service import SitemapService
+from app.services.log_reader import LogReader
+from app.services.request_stats import request_stats
+from app.middleware.profiler import ProfileStore, PROFILE_COOKIE, make_profile_cookie, has_profile_cookie
+from app.routes.og import city_og_params
 
 views_bp = Blueprint('views', __name__)
 
@@ -94,19 +103,12 @@ def sehir_sayfasi(sehir):
 
     # Gösterim adı (örn. "istanbul" → "İstanbul")
     sehir_adi = CITY_DISPLAY_NAME_MAPPING.get(canonical_sehir, canonical_sehir.replace('-', ' ').title())
-    # Subtitle: ilk satır İmsak·Güneş·Öğle, ikinci satır İkindi·Akşam·Yatsı
-    og_subtitle  = (
-        f"İmsak {vakitler['imsak']} · Güneş {vakitler['gunes']} · Öğle {vakitler['ogle']}|"
-        f"İkindi {vakitler['ikindi']} · Akşam {vakitler['aksam']} · Yatsı {vakitler['yatsi']}"
-    )
+    # og:image parametreleri ısıtma komutuyla (scripts/og_warmup.py) ortaktır; yıl, vakitlerin
+    # günüyle aynı (şehrin timezone'undaki bugün) olmalı ki ısıtılan anahtar URL'yle eşleşsin
+    sehir_yili = datetime.now(pytz.timezone(get_timezone_for_city(canonical_sehir, country_code))).year
     og_image_url = url_for(
         'og.og_image',
-        title     = f"{sehir_adi} {suanki_yil} Namaz Vakitleri",
-        subtitle  = og_subtitle,
-        theme     = 'city-page',
-        icon      = r"\udb80\udd46",
-        prompt    = f"{sehir_adi}",
-        domain    = 'cagrivakti.com.tr',
+        **city_og_params(canonical_sehir, vakitler, sehir_yili),
         _external = True,
     )
 
@@ -127,7 +129,7 @@ def sehir_sayfasi(sehir):
 
 
 @views_bp.route('/sehir')
-@cache.cached(timeout=3600)
+@cached_view(3600)
 def sehir_secimi():
     all_cities = UserService.get_sehirler('ALL')
 
@@ -160,7 +162,7 @@ def sehir_secimi():
 # ======================================================
 
 @views_bp.route('/ramazan')
-@cache.cached(timeout=3600)
+@cached_view(3600)
 def ramazan_nedir():
     og_image_url = url_for(
         'og.og_image',
@@ -179,7 +181,7 @@ def ramazan_nedir():
 
 
 @views_bp.route('/orucu-bozan-durumlar')
-@cache.cached(timeout=3600)
+@cached_view(3600)
 def orucu_bozan_durumlar():
     og_image_url = url_for(
         'og.og_image',
@@ -198,7 +200,7 @@ def orucu_bozan_durumlar():
 
 
 @views_bp.route('/imsakiye')
-@cache.cached(timeout=3600)
+@cached_view(3600)
 def imsakiye_secimi():
     og_image_url = url_for(
         'og.og_image',
@@ -265,7 +267,8 @@ def imsakiye_detay(sehir):
 # ======================================================
 
 @views_bp.route('/bilgi-kosesi')
-@cache.cached(timeout=3600)
+@conditional(GUIDE, date_scoped=False)
+@cached_view(3600, GUIDE)
 def bilgi_kosesi_liste():
     guides      = get_guides()
     title       = "Bilgi Köşesi — Çağrı Vakti"
@@ -292,7 +295,8 @@ def bilgi_kosesi_liste():
 
 
 @views_bp.route('/bilgi-kosesi/<slug>')
-@cache.cached(timeout=3600)
+@conditional(GUIDE, date_scoped=False)
+@cached_view(3600, GUIDE)
 def bilgi_kosesi_detay(slug):
     if not is_latin_only(slug):
         abort(400, description="Gecersiz karakter iceren slug.")
@@ -328,7 +332,7 @@ def bilgi_kosesi_detay(slug):
 # ======================================================
 
 @views_bp.route('/sitene-ekle')
-@cache.cached(timeout=86400)
+@cached_view(86400)
 def sitene_ekle():
     all_cities  = sorted(UserService.get_sehirler('ALL'))
     title       = "Sitenize Ekleyin — Çağrı Vakti"
@@ -400,7 +404,7 @@ def embed_widget(sehir):
 # ======================================================
 
 @views_bp.route('/kible-pusulasi')
-@cache.cached(timeout=86400)
+@cached_view(86400)
 def kible_pusulasi():
     title       = "Kıble Pusulası — Çağrı Vakti"
     description = "Pusula ve harita yardımıyla online kıble yönünü bulun. Telefonunuzun sensörlerini kullanarak en doğru kıble açısını hesaplayın."
@@ -423,7 +427,7 @@ def kible_pusulasi():
 
 
 @views_bp.route('/neden-biz')
-@cache.cached(timeout=86400)
+@cached_view(86400)
 def neden_biz():
 
     title       = "Neden Çağrı Vakti? — Çağrı Vakti"
@@ -447,7 +451,7 @@ def neden_biz():
 
 
 @views_bp.route('/ilkelerimiz')
-@cache.cached(timeout=86400)
+@cached_view(86400)
 def ilkelerimiz():
 
     title       = "İlkelerimiz — Çağrı Vakti"
@@ -471,7 +475,7 @@ def ilkelerimiz():
 
 
 @views_bp.route('/indir')
-@cache.cached(timeout=86400)
+@cached_view(86400)
 def indir():
     og_image_url = url_for(
         'og.og_image',
@@ -498,7 +502,7 @@ def indir():
 
 
 @views_bp.route('/Mustafa-Kemal-Ataturk')
-@cache.cached(timeout=86400)
+@cached_view(86400)
 def ataturk():
     title       = "Mustafa Kemal Atatürk — Çağrı Vakti"
     description = "Mustafa Kemal Atatürk ve islama kattığı şeyler hakkında bilgi edinin."
@@ -589,6 +593,8 @@ def admin_guide_edit(guide_id=None):
 
         try:
             db.session.commit()
+            SitemapService.invalidate()
+            cache_versions.bump(GUIDE)
             flash('Rehber başarıyla kaydedildi.', 'success')
             return redirect(url_for('views.admin_guides'))
         except Exception as e:
@@ -632,6 +638,7 @@ def admin_content_edit(content_id=None):
 
         try:
             db.session.commit()
+            cache_versions.bump(CONTENT)
             flash('İçerik başarıyla kaydedildi.', 'success')
             return redirect(url_for('views.admin_contents'))
         except Exception as e:
@@ -664,6 +671,8 @@ def admin_guide_delete(guide_id):
     try:
         db.session.delete(guide)
         db.session.commit()
+        SitemapService.invalidate()
+        cache_versions.bump(GUIDE)
         flash('Rehber başarıyla silindi.', 'success')
     except Exception as e:
         db.session.rollback()
@@ -678,6 +687,7 @@ def admin_content_delete(content_id):
     try:
         db.session.delete(content)
         db.session.commit()
+        cache_versions.bump(CONTENT)
         flash('İçerik başarıyla silindi.', 'success')
     except Exception as e:
         db.session.rollback()
@@ -702,52 +712,144 @@ def admin_message_delete(message_id):
 @views_bp.route('/admin/logs')
 @admin_required
 def admin_logs():
-    log_file              = current_app.config.get('APP_LOG_FILE')
-    bot_log_file          = current_app.config.get('TELEGRAM_LOG_FILE')
-    security_log_file     = current_app.config.get('SECURITY_LOG_FILE')
-    all_requests_log_file = current_app.config.get('ALL_REQUESTS_LOG_FILE')
-
-    app_logs = bot_logs = security_logs = all_requests_logs = ""
-    stats    = {'hourly': {}, 'pages': {}}
-
-    if os.path.exists(log_file):
+    try:
+        stats = request_stats.summary()
+    except Exception as e:
+        current_app.logger.error(f"İstatistik okuma hatası: {e}")
+        stats = {'hourly': {}, 'pages': {}}
+    logs    = {}
+    readers = _admin_log_readers()
+    # Sayfada (ve her AJAX yenilemesinde) yalnızca gösterilen dört log okunur
+    for key in ('app', 'bot', 'security', 'all_requests'):
+        reader = readers[key]
         try:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            app_logs      = "".join(lines[-200:])
+            logs[key] = reader.tail_text(200)
         except Exception as e:
-            current_app.logger.error(f"Log okuma hatası: {e}")
-
-    for attr, path in [('app_logs', log_file), ('bot_logs', bot_log_file), ('security_logs', security_log_file), ('all_requests_logs', all_requests_log_file)]:
-        if path and os.path.exists(path):
-            try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    locals()[attr]  # noqa — just referencing; assignment below
-                    val = "".join(f.readlines()[-200:])
-                if attr == 'app_logs':         app_logs           = val
-                elif attr == 'bot_logs':         bot_logs           = val
-                elif attr == 'security_logs':    security_logs      = val
-                elif attr == 'all_requests_logs': all_requests_logs = val
-            except Exception as e:
-                current_app.logger.error(f"{attr} okuma hatası: {e}")
+            current_app.logger.error(f"{key} log okuma hatası: {e}")
+            logs[key] = ""
 
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         return jsonify({
-            'app_logs':           app_logs           or 'Log verisi bulunamadı.',
-            'bot_logs':           bot_logs           or 'Bot log verisi bulunamadı.',
-            'security_logs':      security_logs      or 'Güvenlik log verisi bulunamadı.',
-            'all_requests_logs':  all_requests_logs  or 'Tüm istekler log verisi bulunamadı.',
+            'app_logs':           logs['app']          or 'Log verisi bulunamadı.',
+            'bot_logs':           logs['bot']          or 'Bot log verisi bulunamadı.',
+            'security_logs':      logs['security']     or 'Güvenlik log verisi bulunamadı.',
+            'all_requests_logs':  logs['all_requests'] or 'Tüm istekler log verisi bulunamadı.',
             'stats':              stats,
         })
 
     return render_template('admin/logs.html',
-                           app_logs=app_logs,
-                           bot_logs=bot_logs,
-                           security_logs=security_logs,
-                           all_requests_logs=all_requests_logs,
+                           app_logs=logs['app'],
+                           bot_logs=logs['bot'],
+                           security_logs=logs['security'],
+                           all_requests_logs=logs['all_requests'],
                            stats=stats)
 
 
+def _admin_log_readers():
+    config = current_app.config
+    return {
+        'app':          LogReader(config.get('APP_LOG_FILE')),
+        'bot':          LogReader(config.get('TELEGRAM_LOG_FILE')),
+        'security':     LogReader(config.get('SECURITY_LOG_FILE')),
+        'all_requests': LogReader(config.get('ALL_REQUESTS_LOG_FILE')),
+        'api':          LogReader(config.get('API_LOG_FILE')),
+        'error':        LogReader(config.get('ERROR_LOG_FILE')),
+    }
+
+
+@views_bp.route('/admin/logs/tail')
+@admin_required
+def admin_logs_tail():
+    """
+    Tek bir log dosyasından sayfalı okuma.
+    Parametreler: log, archive (.gz dahil), q (grep), limit, before (önceki yanıttaki next_before)
+    """
+    reader = _admin_log_readers().get(request.args.get('log', 'app'))
+    if reader is None or not reader.path:
+        abort(404)
+
+    limit   = max(1, min(request.args.get('limit', 200, type=int), 1000))
+    before  = request.args.get('before', type=int)
+    if before is not None and before < 0:
+        abort(400)
+    query   = request.args.get('q', '').strip()[:200] or None
+    archive = request.args.get('archive') or None
+    try:
+        lines, next_before = reader.tail(limit=limit, before=before, query=query, archive=archive)
+    except ValueError:
+        abort(404)
+
+    return jsonify({
+        'lines':       lines,
+        'next_before': next_before,
+        'archives':    reader.archives(),
+    })
+
+
+@views_bp.route('/admin/profiler')
+@admin_required
+def admin_profiler():
+    store    = ProfileStore.from_app(current_app)
+    endpoint = request.args.get('ep')
+    endpoints = store.endpoints()
+    if endpoint not in endpoints:
+        endpoint = next(iter(endpoints), None)
+    top_frames = store.top_frames(store.endpoint_stacks(endpoint)) if endpoint else []
+    return render_template('admin/profiler.html',
+                           enabled=current_app.config.get('PROFILER_ENABLED'),
+                           sample_rate=current_app.config.get('PROFILER_SAMPLE_RATE', 0.0),
+                           cookie_active=has_profile_cookie(current_app),
+                           endpoints=endpoints,
+                           endpoint=endpoint,
+                           top_frames=top_frames,
+                           recent=store.recent())
+
+
+@views_bp.route('/admin/profiler/cerez', methods=['POST'])
+@admin_required
+def admin_profiler_cookie():
+    """Bu tarayıcıdan yapılan istekleri 1 saat boyunca profiller (ya da durdurur)."""
+    response = redirect(url_for('views.admin_profiler'))
+    if request.form.get('action') == 'on':
+        response.set_cookie(PROFILE_COOKIE, make_profile_cookie(current_app), max_age=3600,
+                            httponly=True, samesite='Lax', secure=not current_app.debug)
+    else:
+        response.delete_cookie(PROFILE_COOKIE)
+    return response
+
+
+@views_bp.route('/admin/profiler/indir')
+@admin_required
+def admin_profiler_download():
+    """Flame graph girdisi (collapsed stacks): speedscope, flamegraph.pl vb. ile açılır."""
+    store = ProfileStore.from_app(current_app)
+    profile_id = request.args.get('id')
+    if profile_id:
+        profile = store.get(profile_id)
+        if profile is None:
+            abort(404)
+        stacks, name = profile['stacks'], profile_id
+    else:
+        name = request.args.get('ep', '')
+        stacks = store.endpoint_stacks(name)
+        if not stacks:
+            abort(404)
+    response = make_response(store.to_folded(stacks))
+    response.headers['Content-Type'] = 'text/plain; charset=utf-8'
+    response.headers['Content-Disposition'] = f'attachment; filename="{re.sub(r"[^A-Za-z0-9_.-]", "_", name)}.folded"'
+    return response
+
+
+@views_bp.route('/admin/profiler/temizle', methods=['POST'])
+@admin_required
+def admin_profiler_clear():
+    # Kancaların kullandığı store; profiler kapalıysa yalnızca dosyalar
+    store = current_app.extensions.get('profiler') or ProfileStore.from_app(current_app)
+    store.clear(request.form.get('endpoint') or None)
+    flash('Profil toplamları temizlendi.', 'success')
+    return redirect(url_for('views.admin_profiler'))
+
+
 import subprocess
 
 def get_systemd_service_status(service_name):
@@ -846,7 +948,7 @@ def admin_restart_bot(bot_name):
 # ======================================================
 
 @views_bp.route('/asal-sayi')
-@cache.cached(timeout=86400)
+@cached_view(86400)
 def prime_number():
     title       = "20000 Basamaklı Asal Sayı — Çağrı Vakti"
     description = "Asal sayı, 1 ve kendi kendisiyle sadece 2 tane bölen sayıdır."
@@ -963,7 +1065,7 @@ def serve_game_files(filename):
 # ======================================================
 
 @views_bp.route('/offline')
-@cache.cached(timeout=86400)
+@cached_view(86400)
 def offline():
     return render_template('utils/offline.html')
 
@@ -971,47 +1073,45 @@ def offline():
 # ==== UTILS (sitemap, robots, favicon, sw, manifest) ====
 # ======================================================
 
+def _send_sitemap(name):
+    """Önceden üretilmiş sitemap dosyasını ETag ile akış halinde sunar."""
+    gzipped = 'gzip' in request.accept_encodings
+    for _ in range(2):
+        try:
+            path = SitemapService.get_file(name)
+        except Exception as e:
+            current_app.logger.error(f"Sitemap build error: {e}")
+            abort(503)
+
+        # invalidate() dosyaları get_file'dan sonra silmiş olabilir: .gz yoksa düz .xml,
+        # o da yoksa döngünün ikinci turunda get_file yeniden üretir
+        for candidate, encoded in ([(path + '.gz', True)] if gzipped else []) + [(path, False)]:
+            try:
+                response = send_file(candidate, mimetype='application/xml',
+                                     conditional=True, etag=True, max_age=3600)
+            except FileNotFoundError:
+                continue
+            if encoded:
+                response.headers['Content-Encoding'] = 'gzip'
+            response.headers['Vary'] = 'Accept-Encoding'
+            return response
+    abort(503)
+
+
 @views_bp.route('/sitemap.xml')
-@cache.cached(timeout=86400)
 def serve_sitemap():
-    pages = []
-
-    static_urls = [
-        'views.index', 'views.sehir_secimi', 'views.imsakiye_secimi',
-        'views.ramazan_nedir', 'views.orucu_bozan_durumlar',
-        'views.neden_biz', 'views.indir', 'views.konum_bul',
-        'views.iletisim', 'views.ilkelerimiz',
-        'views.bilgi_kosesi_liste', 'views.prime_number',
-        'views.under_the_red_sky',
-    ]
-    for rule in static_urls:
-        pages.append({
-            'loc':     url_for(rule, _external=True),
-            'lastmod': datetime.now().strftime('%Y-%m-%d'),
-            'priority': '1.0' if rule == 'views.index' else '0.8',
-        })
+    return _send_sitemap('sitemap')
 
-    sehirler = UserService.get_sehirler('ALL')
-    for s in sehirler:
-        country = get_country_for_city(s)
-        pages.append({'loc': url_for('views.sehir_sayfasi', sehir=s, _external=True),
-                      'lastmod': datetime.now().strftime('%Y-%m-%d'), 'priority': '0.9'})
-        if country == 'TR':
-            pages.append({'loc': url_for('views.imsakiye_detay', sehir=s, _external=True),
-                          'lastmod': datetime.now().strftime('%Y-%m-%d'), 'priority': '0.7'})
-
-    for guide in get_guides():
-        pages.append({'loc': url_for('views.bilgi_kosesi_detay', slug=guide['slug'], _external=True),
-                      'lastmod': datetime.now().strftime('%Y-%m-%d'), 'priority': '0.6'})
-
-    sitemap_xml = render_template('utils/sitemap_template.xml', pages=pages)
-    response    = make_response(sitemap_xml)
-    response.headers['Content-Type'] = 'application/xml'
-    return response
+
+@views_bp.route('/sitemap-<section>.xml')
+def serve_sitemap_section(section):
+    if section not in SitemapService.SECTIONS:
+        abort(404)
+    return _send_sitemap(f'sitemap-{section}')
 
 
 @views_bp.route('/robots.txt')
-@cache.cached(timeout=86400)
+@cached_view(86400)
 def serve_robots():
     content  = "User-agent: *\n"
     content += "Allow: /\n"
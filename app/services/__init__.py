@@ -4,8 +4,11 @@ import time
 import requests
 from datetime import datetime, timedelta
 import pytz
-from app.extensions import db, cache
+from app.extensions import db, cache, cache_set_many
 from app.models import EzanVakti, DailyContent, Guide
+from app import metrics
+from app.cache_versions import versioned_key, VAKIT, CONTENT
+from app.timing import phase
 from flask import request, session
 from .ramadan_service import RamadanService
 from .dini_gunler_service import DiniGunlerService
@@ -758,85 +761,87 @@ def get_timezone_for_city(sehir, country_code='TR'):
     # Doğrudan erişim (O(1))
     return _CITY_TIMEZONE_MAPPING_CACHE.get((sehir.lower(), country_code.lower()), DEFAULT_TZ)
 
+# Şehir → ülke kodu eşlemesi (listede olmayan şehirler TR kabul edilir)
+CITY_COUNTRY_MAPPING = {
+    # Türkiye
+    'Istanbul': 'TR', 'Ankara': 'TR', 'Izmir': 'TR',
+    # North America & Caribbean
+    'Washington': 'US', 'New-York': 'US', 'Los-Angeles': 'US',
+    'Ottawa': 'CA', 'Toronto': 'CA', 'Mexico-City': 'MX', 'Havana': 'CU',
+    'Guatemala-City': 'GT', 'Tegucigalpa': 'HN',
+    'Managua': 'NI', 'San-Jose': 'CR', 'Panama-City': 'PA',
+    'Kingston': 'JM', 'Santo-Domingo': 'DO', 'Port-au-Prince': 'HT',
+    'Nassau': 'BS', 'Belmopan': 'BZ', 'Saint-Johns': 'AG',
+    'Bridgetown': 'BB', 'Roseau': 'DM', 'Saint-Georges': 'GD',
+    'Basseterre': 'KN', 'Castries': 'LC', 'Kingstown': 'VC',
+    'Port-of-Spain': 'TT', 'Oranjestad': 'AW', 'Willemstad': 'CW',
+    # South America
+    'Brasilia': 'BR', 'Sao-Paulo': 'BR', 'Rio-de-Janeiro': 'BR',
+    'Buenos-Aires': 'AR', 'Santiago': 'CL', 'Bogota': 'CO',
+    'Lima': 'PE', 'Caracas': 'VE', 'Quito': 'EC',
+    'Asuncion': 'PY', 'Montevideo': 'UY', 'La-Paz': 'BO',
+    'Georgetown': 'GY', 'Paramaribo': 'SR', 'Cayenne': 'GF',
+    # Europe (Western & Central)
+    'London': 'GB', 'Paris': 'FR', 'Berlin': 'DE', 'Rome': 'IT',
+    'Madrid': 'ES', 'Amsterdam': 'NL', 'Brussels': 'BE', 'Vienna': 'AT',
+    'Bern': 'CH', 'Lisbon': 'PT', 'Athens': 'GR', 'Dublin': 'IE',
+    'Luxembourg': 'LU', 'Monaco': 'MC', 'Andorra-la-Vella': 'AD',
+    'Valletta': 'MT', 'San-Marino': 'SM', 'Vaduz': 'LI', 'Vatican': 'VA',
+    # Northern Europe
+    'Stockholm': 'SE', 'Oslo': 'NO', 'Copenhagen': 'DK', 'Helsinki': 'FI',
+    'Reykjavik': 'IS',
+    # Eastern Europe & Balkans
+    'Moscow': 'RU', 'St.-Petersburg': 'RU', 'Kazan': 'RU',
+    'Kiev': 'UA', 'Warsaw': 'PL', 'Prague': 'CZ', 'Budapest': 'HU',
+    'Bucharest': 'RO', 'Sofia': 'BG', 'Belgrade': 'RS', 'Sarajevo': 'BA',
+    'Skopje': 'MK', 'Tirana': 'AL', 'Pristina': 'XK', 'Zagreb': 'HR',
+    'Ljubljana': 'SI', 'Bratislava': 'SK', 'Chisinau': 'MD', 'Minsk': 'BY',
+    'Tallinn': 'EE', 'Riga': 'LV', 'Vilnius': 'LT', 'Podgorica': 'ME',
+    # Middle East & Caucasus
+    'Mecca': 'SA', 'Medina': 'SA', 'Riyadh': 'SA', 'Baku': 'AZ',
+    'Nakhchivan': 'AZ', 'Tbilisi': 'GE', 'Yerevan': 'AM', 'Baghdad': 'IQ',
+    'Tehran': 'IR', 'Damascus': 'SY', 'Beirut': 'LB', 'Amman': 'JO',
+    'Jerusalem': 'IL', 'Dubai': 'AE', 'Kuwait': 'KW', 'Doha': 'QA',
+    'Muscat': 'OM', 'Manama': 'BH', 'Sanaa': 'YE', 'Nicosia': 'CY',
+    # Central & South Asia
+    'Nur-Sultan': 'KZ', 'Almaty': 'KZ', 'Tashkent': 'UZ', 'Ashgabat': 'TM',
+    'Bishkek': 'KG', 'Dushanbe': 'TJ', 'Kabul': 'AF', 'Islamabad': 'PK',
+    'New-Delhi': 'IN', 'Dhaka': 'BD', 'Colombo': 'LK', 'Kathmandu': 'NP',
+    'Thimphu': 'BT', 'Male': 'MV',
+    # East Asia
+    'Tokyo': 'JP', 'Seoul': 'KR', 'Beijing': 'CN', 'Hong-Kong': 'HK',
+    'Ulaanbaatar': 'MN', 'Taipei': 'TW', 'Pyongyang': 'KP',
+    # Southeast Asia
+    'Jakarta': 'ID', 'Singapore': 'SG', 'Kuala-Lumpur': 'MY', 'Bangkok': 'TH',
+    'Manila': 'PH', 'Hanoi': 'VN', 'Phnom-Penh': 'KH', 'Vientiane': 'LA',
+    'Naypyidaw': 'MM', 'Bandar-Seri-Begawan': 'BN', 'Dili': 'TL',
+    # Oceania
+    'Sydney': 'AU', 'Melbourne': 'AU', 'Perth': 'AU', 'Auckland': 'NZ',
+    'Port-Moresby': 'PG', 'Suva': 'FJ', 'Honiara': 'SB', 'Port-Vila': 'VU',
+    'Apia': 'WS', 'Nukualofa': 'TO', 'Palikir': 'FM', 'Ngerulmud': 'PW',
+    # North & West Africa
+    'Cairo': 'EG', 'Tripoli': 'LY', 'Tunis': 'TN', 'Algiers': 'DZ',
+    'Rabat': 'MA', 'Casablanca': 'MA', 'Khartoum': 'SD', 'Abuja': 'NG',
+    'Lagos': 'NG', 'Dakar': 'SN', 'Accra': 'GH', 'Bamako': 'ML',
+    'Niamey': 'NE', 'Ouagadougou': 'BF', 'Conakry': 'GN', 'Freetown': 'SL',
+    'Monrovia': 'LR', 'Abidjan': 'CI', 'Lome': 'TG', 'Porto-Novo': 'BJ',
+    'Banjul': 'GM', 'Bissau': 'GW', 'Praia': 'CV', 'Nouakchott': 'MR',
+    # Central & East Africa
+    'Kinshasa': 'CD', 'Brazzaville': 'CG', 'Libreville': 'GA', 'Yaounde': 'CM',
+    'N-Djamena': 'TD', 'Bangui': 'CF', 'Malabo': 'GQ', 'Sao-Tome': 'ST',
+    'Nairobi': 'KE', 'Addis-Ababa': 'ET', 'Mogadishu': 'SO', 'Djibouti': 'DJ',
+    'Asmara': 'ER', 'Kampala': 'UG', 'Dodoma': 'TZ', 'Kigali': 'RW',
+    'Bujumbura': 'BI', 'Juba': 'SS',
+    # Southern Africa & Islands
+    'Pretoria': 'ZA', 'Cape-Town': 'ZA', 'Windhoek': 'NA', 'Gaborone': 'BW',
+    'Harare': 'ZW', 'Lusaka': 'ZM', 'Maputo': 'MZ', 'Lilongwe': 'MW',
+    'Mbabane': 'SZ', 'Maseru': 'LS', 'Luanda': 'AO', 'Antananarivo': 'MG',
+    'Port-Louis': 'MU', 'Victoria': 'SC', 'Moroni': 'KM', 'Saint-Denis': 'RE'
+}
+
 def get_country_for_city(sehir):
     """Şehrin bağlı olduğu ülke kodunu döndürür."""
-    mapping = {
-        # Türkiye
-        'Istanbul': 'TR', 'Ankara': 'TR', 'Izmir': 'TR',
-        # North America & Caribbean
-        'Washington': 'US', 'New-York': 'US', 'Los-Angeles': 'US',
-        'Ottawa': 'CA', 'Toronto': 'CA', 'Mexico-City': 'MX', 'Havana': 'CU',
-        'Guatemala-City': 'GT', 'Tegucigalpa': 'HN',
-        'Managua': 'NI', 'San-Jose': 'CR', 'Panama-City': 'PA',
-        'Kingston': 'JM', 'Santo-Domingo': 'DO', 'Port-au-Prince': 'HT',
-        'Nassau': 'BS', 'Belmopan': 'BZ', 'Saint-Johns': 'AG',
-        'Bridgetown': 'BB', 'Roseau': 'DM', 'Saint-Georges': 'GD',
-        'Basseterre': 'KN', 'Castries': 'LC', 'Kingstown': 'VC',
-        'Port-of-Spain': 'TT', 'Oranjestad': 'AW', 'Willemstad': 'CW',
-        # South America
-        'Brasilia': 'BR', 'Sao-Paulo': 'BR', 'Rio-de-Janeiro': 'BR',
-        'Buenos-Aires': 'AR', 'Santiago': 'CL', 'Bogota': 'CO',
-        'Lima': 'PE', 'Caracas': 'VE', 'Quito': 'EC',
-        'Asuncion': 'PY', 'Montevideo': 'UY', 'La-Paz': 'BO',
-        'Georgetown': 'GY', 'Paramaribo': 'SR', 'Cayenne': 'GF',
-        # Europe (Western & Central)
-        'London': 'GB', 'Paris': 'FR', 'Berlin': 'DE', 'Rome': 'IT',
-        'Madrid': 'ES', 'Amsterdam': 'NL', 'Brussels': 'BE', 'Vienna': 'AT',
-        'Bern': 'CH', 'Lisbon': 'PT', 'Athens': 'GR', 'Dublin': 'IE',
-        'Luxembourg': 'LU', 'Monaco': 'MC', 'Andorra-la-Vella': 'AD',
-        'Valletta': 'MT', 'San-Marino': 'SM', 'Vaduz': 'LI', 'Vatican': 'VA',
-        # Northern Europe
-        'Stockholm': 'SE', 'Oslo': 'NO', 'Copenhagen': 'DK', 'Helsinki': 'FI',
-        'Reykjavik': 'IS',
-        # Eastern Europe & Balkans
-        'Moscow': 'RU', 'St.-Petersburg': 'RU', 'Kazan': 'RU',
-        'Kiev': 'UA', 'Warsaw': 'PL', 'Prague': 'CZ', 'Budapest': 'HU',
-        'Bucharest': 'RO', 'Sofia': 'BG', 'Belgrade': 'RS', 'Sarajevo': 'BA',
-        'Skopje': 'MK', 'Tirana': 'AL', 'Pristina': 'XK', 'Zagreb': 'HR',
-        'Ljubljana': 'SI', 'Bratislava': 'SK', 'Chisinau': 'MD', 'Minsk': 'BY',
-        'Tallinn': 'EE', 'Riga': 'LV', 'Vilnius': 'LT', 'Podgorica': 'ME',
-        # Middle East & Caucasus
-        'Mecca': 'SA', 'Medina': 'SA', 'Riyadh': 'SA', 'Baku': 'AZ',
-        'Nakhchivan': 'AZ', 'Tbilisi': 'GE', 'Yerevan': 'AM', 'Baghdad': 'IQ',
-        'Tehran': 'IR', 'Damascus': 'SY', 'Beirut': 'LB', 'Amman': 'JO',
-        'Jerusalem': 'IL', 'Dubai': 'AE', 'Kuwait': 'KW', 'Doha': 'QA',
-        'Muscat': 'OM', 'Manama': 'BH', 'Sanaa': 'YE', 'Nicosia': 'CY',
-        # Central & South Asia
-        'Nur-Sultan': 'KZ', 'Almaty': 'KZ', 'Tashkent': 'UZ', 'Ashgabat': 'TM',
-        'Bishkek': 'KG', 'Dushanbe': 'TJ', 'Kabul': 'AF', 'Islamabad': 'PK',
-        'New-Delhi': 'IN', 'Dhaka': 'BD', 'Colombo': 'LK', 'Kathmandu': 'NP',
-        'Thimphu': 'BT', 'Male': 'MV',
-        # East Asia
-        'Tokyo': 'JP', 'Seoul': 'KR', 'Beijing': 'CN', 'Hong-Kong': 'HK',
-        'Ulaanbaatar': 'MN', 'Taipei': 'TW', 'Pyongyang': 'KP',
-        # Southeast Asia
-        'Jakarta': 'ID', 'Singapore': 'SG', 'Kuala-Lumpur': 'MY', 'Bangkok': 'TH',
-        'Manila': 'PH', 'Hanoi': 'VN', 'Phnom-Penh': 'KH', 'Vientiane': 'LA',
-        'Naypyidaw': 'MM', 'Bandar-Seri-Begawan': 'BN', 'Dili': 'TL',
-        # Oceania
-        'Sydney': 'AU', 'Melbourne': 'AU', 'Perth': 'AU', 'Auckland': 'NZ',
-        'Port-Moresby': 'PG', 'Suva': 'FJ', 'Honiara': 'SB', 'Port-Vila': 'VU',
-        'Apia': 'WS', 'Nukualofa': 'TO', 'Palikir': 'FM', 'Ngerulmud': 'PW',
-        # North & West Africa
-        'Cairo': 'EG', 'Tripoli': 'LY', 'Tunis': 'TN', 'Algiers': 'DZ',
-        'Rabat': 'MA', 'Casablanca': 'MA', 'Khartoum': 'SD', 'Abuja': 'NG',
-        'Lagos': 'NG', 'Dakar': 'SN', 'Accra': 'GH', 'Bamako': 'ML',
-        'Niamey': 'NE', 'Ouagadougou': 'BF', 'Conakry': 'GN', 'Freetown': 'SL',
-        'Monrovia': 'LR', 'Abidjan': 'CI', 'Lome': 'TG', 'Porto-Novo': 'BJ',
-        'Banjul': 'GM', 'Bissau': 'GW', 'Praia': 'CV', 'Nouakchott': 'MR',
-        # Central & East Africa
-        'Kinshasa': 'CD', 'Brazzaville': 'CG', 'Libreville': 'GA', 'Yaounde': 'CM',
-        'N-Djamena': 'TD', 'Bangui': 'CF', 'Malabo': 'GQ', 'Sao-Tome': 'ST',
-        'Nairobi': 'KE', 'Addis-Ababa': 'ET', 'Mogadishu': 'SO', 'Djibouti': 'DJ',
-        'Asmara': 'ER', 'Kampala': 'UG', 'Dodoma': 'TZ', 'Kigali': 'RW',
-        'Bujumbura': 'BI', 'Juba': 'SS',
-        # Southern Africa & Islands
-        'Pretoria': 'ZA', 'Cape-Town': 'ZA', 'Windhoek': 'NA', 'Gaborone': 'BW',
-        'Harare': 'ZW', 'Lusaka': 'ZM', 'Maputo': 'MZ', 'Lilongwe': 'MW',
-        'Mbabane': 'SZ', 'Maseru': 'LS', 'Luanda': 'AO', 'Antananarivo': 'MG',
-        'Port-Louis': 'MU', 'Victoria': 'SC', 'Moroni': 'KM', 'Saint-Denis': 'RE'
-    }
-    return mapping.get(sehir, 'TR')
+    return CITY_COUNTRY_MAPPING.get(sehir, 'TR')
 
 def get_current_date(timezone_str=DEFAULT_TZ):
     """Verilen timezone'a göre yerel saati döndürür."""
@@ -968,22 +973,26 @@ class PrayerService:
             
         tarih_str = tarih_dt.strftime("%Y-%m-%d")
         
-        # 1. Flask-Caching Kontrolü
-        cache_key = f"vakitler_{country_code}_{sehir}_{tarih_str}_{timezone_str}"
-        cached_data = cache.get(cache_key)
+        # 1. Flask-Caching Kontrolü (vakitleri-ice-aktar.py VAKIT neslini ilerletince anahtar değişir)
+        cache_key = versioned_key(f"vakitler_{country_code}_{sehir}_{tarih_str}_{timezone_str}", VAKIT)
+        with phase('vakit-cache'):
+            cached_data = cache.get(cache_key)
         if cached_data:
             from flask import current_app
             current_app.logger.debug(f"Cache Hit: {cache_key}")
+            metrics.cache_result('vakitler', True)
             return cached_data
         
         from flask import current_app
         current_app.logger.debug(f"Cache Miss: {cache_key}")
+        metrics.cache_result('vakitler', False)
         
         # 2. DB Kontrolü
         try:
-            vakit = db_session.query(EzanVakti).filter_by(
-                sehir=sehir, country_code=country_code, tarih=tarih_dt.date()
-            ).first()
+            with metrics.timed(metrics.DB_QUERY_SECONDS, query='vakitler'), phase('vakit-db'):
+                vakit = db_session.query(EzanVakti).filter_by(
+                    sehir=sehir, country_code=country_code, tarih=tarih_dt.date()
+                ).first()
             if vakit:
                 res = {
                     "imsak": vakit.imsak, "gunes": vakit.gunes, "ogle": vakit.ogle,
@@ -999,7 +1008,8 @@ class PrayerService:
         
         # 3. API Fallback
         if country_code == 'TR':
-            diyanet_vakit = PrayerService._get_from_diyanet(sehir, tarih_dt)
+            with phase('vakit-api'):
+                diyanet_vakit = PrayerService._get_from_diyanet(sehir, tarih_dt)
             if diyanet_vakit:
                 PrayerService._save_to_db(sehir, country_code, timezone_str, tarih_dt.date(), diyanet_vakit, db_session)
                 res = {**diyanet_vakit, "timezone": timezone_str}
@@ -1009,7 +1019,8 @@ class PrayerService:
                 return res
         else:
             # Uluslararası şehirler için Aladhan API
-            aladhan_vakit = PrayerService._get_from_aladhan(sehir, country_code, tarih_dt)
+            with phase('vakit-api'):
+                aladhan_vakit = PrayerService._get_from_aladhan(sehir, country_code, tarih_dt)
             if aladhan_vakit:
                 PrayerService._save_to_db(sehir, country_code, timezone_str, tarih_dt.date(), aladhan_vakit, db_session)
                 res = {**aladhan_vakit, "timezone": timezone_str}
@@ -1083,6 +1094,52 @@ class PrayerService:
                 
         return None
 
+    @staticmethod
+    def get_vakitler_batch(cities, dates, timezone_str, db_session=None):
+        """
+        Aynı timezone'daki şehirlerin verilen günlerdeki vakitlerini tek sorguyla (parça parça)
+        okuyup get_vakitler'in cache anahtarlarına tek pipeline'da yazar. cities: [(sehir, ülke kodu)].
+        Her gün kendi gece yarısına kadar cache'te kalır. Yazılan anahtar sayısını döndürür.
+        """
+        if db_session is None:
+            db_session = db.session
+
+        tz = pytz.timezone(timezone_str)
+        now = datetime.now(tz)
+        ttls = {}
+        for day in dates:
+            expires = tz.localize(datetime(day.year, day.month, day.day)) + timedelta(days=1)
+            ttls[day] = max(int((expires - now).total_seconds()), 3600)
+
+        wanted = {(sehir, country_code) for sehir, country_code in cities}
+        names = sorted({sehir for sehir, _ in wanted})
+        items = []
+        for i in range(0, len(names), 500):  # SQLite değişken sınırı
+            try:
+                with metrics.timed(metrics.DB_QUERY_SECONDS, query='vakitler_batch'):
+                    rows = db_session.query(EzanVakti).filter(
+                        EzanVakti.sehir.in_(names[i:i + 500]),
+                        EzanVakti.tarih.in_(list(dates))
+                    ).all()
+            except Exception as e:
+                from flask import current_app
+                current_app.logger.error(f"DB batch query error ({timezone_str}): {e}")
+                continue
+
+            for v in rows:
+                if (v.sehir, v.country_code) not in wanted:
+                    continue
+                key = versioned_key(
+                    f"vakitler_{v.country_code}_{v.sehir}_{v.tarih.strftime('%Y-%m-%d')}_{timezone_str}", VAKIT
+                )
+                items.append((key, {
+                    "imsak": v.imsak, "gunes": v.gunes, "ogle": v.ogle,
+                    "ikindi": v.ikindi, "aksam": v.aksam, "yatsi": v.yatsi,
+                    "timezone": v.timezone
+                }, ttls[v.tarih]))
+        cache_set_many(items)
+        return len(items)
+
     @staticmethod
     def get_vakitler_range(sehir, country_code, start_date, end_date, db_session=None):
         """
@@ -1160,7 +1217,8 @@ class PrayerService:
             # Debug için log eklenebilir
             # print(f"Aladhan API Request: {url} params: {params}")
             
-            response = requests.get(url, params=params, timeout=10)
+            with metrics.timed(metrics.UPSTREAM_SECONDS, upstream='aladhan'):
+                response = requests.get(url, params=params, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 timings = data.get("data", {}).get("timings", {})
@@ -1173,10 +1231,13 @@ class PrayerService:
                         "aksam": timings.get("Maghrib"),
                         "yatsi": timings.get("Isha")
                     }
+                metrics.UPSTREAM_FAILURES.labels(upstream='aladhan', reason='empty').inc()
             else:
+                metrics.UPSTREAM_FAILURES.labels(upstream='aladhan', reason=f'http_{response.status_code // 100}xx').inc()
                 from flask import current_app
                 current_app.logger.error(f"Aladhan API Error for {sehir}: {response.status_code} - {response.text}")
         except Exception as e:
+            metrics.UPSTREAM_FAILURES.labels(upstream='aladhan', reason=type(e).__name__).inc()
             from flask import current_app
             current_app.logger.error(f"Aladhan API exception for {sehir}: {e}")
         return None
@@ -1187,7 +1248,7 @@ class PrayerService:
         return None
 
 
-@cache.cached(timeout=86400, key_prefix='daily_content')
+@cache.cached(timeout=86400, key_prefix=lambda: versioned_key('daily_content', CONTENT))
 def get_daily_content():
     """Günün içeriğini döndürür (Rastgele ve Tekrarsız)."""
     try:
@@ -0,0 +1,142 @@
+import os
+import time
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import pytz
+
+from app.extensions import cache
+from app.services import UserService, PrayerService, RamadanService, DiniGunlerService, get_country_for_city, get_timezone_for_city
+
+logger = logging.getLogger(__name__)
+
+ISTANBUL_TZ = 'Europe/Istanbul'  # ramadan_info_* / dini_gunler_* anahtarları İstanbul tarihiyle tutulur
+
+
+def cities_by_timezone(cities=None):
+    """{timezone: [(sehir, ülke kodu), ...]} — get_vakitler'in anahtarı şehrin timezone'una bağlıdır."""
+    groups = defaultdict(list)
+    for sehir in cities or UserService.get_sehirler('ALL'):
+        country_code = get_country_for_city(sehir)
+        groups[get_timezone_for_city(sehir, country_code)].append((sehir, country_code))
+    return dict(groups)
+
+
+def warm_timezone(timezone_str, cities, start_date, og_images=False):
+    """
+    Bir timezone'daki şehirler için start_date ve ertesi günün vakitlerini toplu DB yoluyla,
+    İstanbul ise ramazan / dini gün bilgisini, istenirse şehir OG görsellerini cache'e yazar.
+    Uygulama bağlamı içinde çağrılmalıdır; yazılan vakit anahtarı sayısını döndürür.
+    """
+    written = PrayerService.get_vakitler_batch(cities, [start_date, start_date + timedelta(days=1)], timezone_str)
+    if timezone_str == ISTANBUL_TZ:
+        RamadanService.get_ramadan_info(start_date)
+        DiniGunlerService.get_dini_gunler(start_date)
+    if og_images:
+        from app.routes.og import warm_city_og_images
+        warm_city_og_images([sehir for sehir, _ in cities], datetime(start_date.year, start_date.month, start_date.day))
+    return written
+
+
+def next_runs(timezones, lead_seconds, now=None):
+    """Her timezone için bir sonraki (gece yarısı - lead) anı: [(epoch, timezone, başlayacak gün)]."""
+    now = now or time.time()
+    runs = []
+    for timezone_str in timezones:
+        tz = pytz.timezone(timezone_str)
+        # Hedef her zaman yerel saate göre yarın: gece yarısı lead süresi içindeyse
+        # run_at geçmiştir (gecikme <= 0) ve ısıtma hemen yapılır; tekrarı _run'daki done engeller
+        upcoming = (datetime.fromtimestamp(now, tz) + timedelta(days=1)).date()
+        midnight = tz.localize(datetime(upcoming.year, upcoming.month, upcoming.day))
+        runs.append((midnight.timestamp() - lead_seconds, timezone_str, upcoming))
+    return sorted(runs)
+
+
+class CacheWarmer:
+    """
+    Her timezone'un gece yarısından CACHE_WARMUP_LEAD_MINUTES önce o timezone'daki şehirlerin
+    yeni günün ve ertesi günün cache anahtarlarını dolduran arka plan thread'i (worker başına).
+    Redis cache'te aynı (timezone, gün) için yalnızca bir worker ısıtır.
+    """
+
+    def __init__(self):
+        self._app = None
+        self._lead = 600
+        self._og_images = False
+        self._on_start = True
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        if not app.config.get('CACHE_WARMUP_ENABLED', False):
+            return
+        self._app = app
+        self._lead = app.config.get('CACHE_WARMUP_LEAD_MINUTES', 10) * 60
+        self._og_images = app.config.get('CACHE_WARMUP_OG_IMAGES', False)
+        self._on_start = app.config.get('CACHE_WARMUP_ON_START', True)
+
+        # Thread fork sonrası, worker'ın ilk isteğinde başlar (gunicorn --preload uyumu)
+        @app.before_request
+        def _start_cache_warmer():
+            if self._pid != os.getpid():
+                self._start()
+
+    def _start(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, name='cache-warmup', daemon=True).start()
+
+    def _claim(self, timezone_str, day):
+        # Başka worker (ya da önceki deploy) bu günü ısıttıysa atla
+        return cache.add(f'warmup_lock:{timezone_str}:{day.isoformat()}', os.getpid(), timeout=6 * 3600)
+
+    def warm(self, timezone_str, cities, day):
+        if not self._claim(timezone_str, day):
+            return 0
+        started = time.perf_counter()
+        with self._app.app_context():
+            written = warm_timezone(timezone_str, cities, day, self._og_images)
+        logger.info(f"[warmup] {timezone_str} {day}: {len(cities)} şehir, {written} anahtar, "
+                    f"{time.perf_counter() - started:.1f} sn")
+        return written
+
+    def _run(self):
+        try:
+            with self._app.app_context():
+                groups = cities_by_timezone()
+        except Exception as e:
+            logger.warning(f"[warmup] Şehir listesi alınamadı, ısıtma kapalı: {e}")
+            return
+
+        if self._on_start:
+            for timezone_str, cities in groups.items():
+                self._safe_warm(timezone_str, cities, datetime.now(pytz.timezone(timezone_str)).date())
+
+        done = set()
+        while True:
+            # Aynı gece yarısını paylaşan timezone'lar (Europe/Berlin, Europe/Paris...) art arda ısıtılır
+            pending = [run for run in next_runs(groups, self._lead) if run[1:] not in done]
+            if not pending:  # hepsi ısıtıldı, gece yarıları henüz geçmedi
+                time.sleep(60)
+                continue
+            run_at, timezone_str, day = pending[0]
+            delay = run_at - time.time()
+            if delay > 0:
+                time.sleep(min(delay, 3600))  # saat değişikliği / uzun uyku sonrası yeniden hesapla
+                continue
+            self._safe_warm(timezone_str, groups[timezone_str], day)
+            done = {item for item in done if item[1] >= day - timedelta(days=1)}
+            done.add((timezone_str, day))
+
+    def _safe_warm(self, timezone_str, cities, day):
+        try:
+            self.warm(timezone_str, cities, day)
+        except Exception as e:
+            logger.warning(f"[warmup] {timezone_str} {day} ısıtılamadı: {e}")
+
+
+cache_warmer = CacheWarmer()
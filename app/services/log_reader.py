@@ -0,0 +1,129 @@
+import os
+import gzip
+from collections import deque
+
+BLOCK_SIZE = 64 * 1024
+
+
+class LogReader:
+    """
+    Log dosyalarını belleğe almadan okur.
+
+    - Düz dosyalar sondan başa doğru blok blok (seek) okunur. Sayfalama bir bayt
+      ofseti (`before`) ile yapılır; bir sonraki sayfa tam o ofsetten devam eder.
+    - compress_rotator'ın ürettiği .gz arşivlerinde geri seek yapılamaz. Bu arşivler
+      baştan akış halinde okunur, sondan `before` eşleşen satır atlanır. Bellekte en
+      fazla `before + limit` satır tutulur.
+    - `query` verilirse büyük/küçük harf duyarsız alt metin (grep) filtresi uygulanır.
+    """
+
+    def __init__(self, path, encoding='utf-8'):
+        self.path = path
+        self.encoding = encoding
+
+    # ─── Dosyalar ───
+
+    def archives(self):
+        """Döndürülmüş arşivler (app.log.2026-05-01.gz, error.log.1 ...), en yeni önce."""
+        directory, base = os.path.split(self.path)
+        if not os.path.isdir(directory):
+            return []
+        names = [n for n in os.listdir(directory) if n.startswith(base + '.')]
+        return sorted(names, key=lambda n: os.path.getmtime(os.path.join(directory, n)), reverse=True)
+
+    def resolve(self, archive=None):
+        """Okunacak dosyanın yolu; arşiv adı yalnızca archives() listesinden kabul edilir."""
+        if not archive:
+            return self.path
+        if archive not in self.archives():
+            raise ValueError(f"Bilinmeyen arşiv: {archive}")
+        return os.path.join(os.path.dirname(self.path), archive)
+
+    # ─── Okuma ───
+
+    def _decode(self, raw):
+        return raw.decode(self.encoding, errors='replace').rstrip('\r')
+
+    @staticmethod
+    def _reverse_lines(f, end):
+        """`end` ofsetinden geriye doğru (satır, satır başı ofseti) çiftleri üretir."""
+        pos = end
+        tail = b''
+        while pos > 0:
+            size = min(BLOCK_SIZE, pos)
+            pos -= size
+            f.seek(pos)
+            chunk = f.read(size) + tail
+            parts = chunk.split(b'\n')
+            # İlk parça bir önceki bloktan devam ediyor olabilir
+            tail = parts[0]
+            offset = pos + len(chunk)
+            for line in reversed(parts[1:]):
+                offset -= len(line) + 1
+                yield line, offset + 1
+        if tail:
+            yield tail, 0
+
+    @staticmethod
+    def _fold(text):
+        # 'İ'.casefold() == 'i̇' (birleşik nokta); 'istanbul' araması 'İstanbul'u da bulsun
+        return text.casefold().replace('\u0307', '')
+
+    def _matches(self, line, needle):
+        return needle is None or needle in self._fold(line)
+
+    def _tail_plain(self, path, limit, before, needle):
+        with open(path, 'rb') as f:
+            end = os.fstat(f.fileno()).st_size if before is None else int(before)
+            lines = []
+            next_before = None
+            for raw, start in self._reverse_lines(f, end):
+                if not raw.strip():
+                    continue
+                line = self._decode(raw)
+                if not self._matches(line, needle):
+                    continue
+                if len(lines) == limit:
+                    # Bir satır daha var: sonraki sayfa buradan başlar
+                    next_before = start + len(raw) + 1
+                    break
+                lines.append(line)
+        lines.reverse()
+        return lines, next_before
+
+    def _tail_gzip(self, path, limit, before, needle):
+        skip = int(before or 0)
+        window = deque(maxlen=skip + limit + 1)
+        with gzip.open(path, 'rb') as f:
+            for raw in f:
+                if not raw.strip():
+                    continue
+                line = self._decode(raw.rstrip(b'\n'))
+                if self._matches(line, needle):
+                    window.append(line)
+        matched = list(window)
+        if skip:
+            matched = matched[:-skip]
+        lines = matched[-limit:]
+        has_more = len(matched) > limit
+        return lines, (skip + limit if has_more else None)
+
+    def tail(self, limit=200, before=None, query=None, archive=None):
+        """
+        Sondan `limit` satırı (eskiden yeniye sıralı) ve bir sonraki (daha eski)
+        sayfanın `before` değerini döndürür; daha eski satır yoksa None.
+        """
+        if limit < 1 or (before is not None and int(before) < 0):
+            raise ValueError('limit >= 1 ve before >= 0 olmalı')
+        path = self.resolve(archive)
+        if not os.path.exists(path):
+            return [], None
+        needle = self._fold(query) if query else None
+        if path.endswith('.gz'):
+            return self._tail_gzip(path, limit, before, needle)
+        return self._tail_plain(path, limit, before, needle)
+
+    def tail_text(self, limit=200):
+        """Son `limit` satırı tek metin olarak döndürür (admin log sayfası için)."""
+        lines, _ = self.tail(limit)
+        return "\n".join(lines)
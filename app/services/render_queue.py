@@ -0,0 +1,75 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class RenderQueue:
+    """
+    Görsel üretimini (OG / story) istek thread'inden alan sınırlı iş havuzu.
+
+    - Aynı anahtarla gelen eşzamanlı istekler tek bir render'ı paylaşır.
+    - Bekleyen + çalışan iş sayısı max_pending'e ulaştıysa submit() None
+      döner; çağıran taraf yer tutucu görsel sunar.
+    - PIL, çizim ve sıkıştırma sırasında GIL'i büyük ölçüde bıraktığı için
+      thread havuzu yeterlidir.
+    """
+
+    def __init__(self, max_workers=2, max_pending=32, name='render'):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.name = name
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._executor = None
+        self._pid = None
+        self.stats = {
+            'submitted': 0,
+            'deduplicated': 0,
+            'rejected': 0,
+            'completed': 0,
+            'failed': 0,
+        }
+
+    def _get_executor(self):
+        # Gunicorn fork sonrası ebeveynden gelen havuz kullanılamaz; süreç
+        # başına havuzu tembel oluştur.
+        if self._executor is None or self._pid != os.getpid():
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=self.name
+            )
+            self._inflight = {}
+            self._pid = os.getpid()
+        return self._executor
+
+    def submit(self, key, fn, *args):
+        """İşi kuyruğa ekler ve Future döndürür; kuyruk doluysa None."""
+        with self._lock:
+            executor = self._get_executor()
+            future = self._inflight.get(key)
+            if future is not None:
+                self.stats['deduplicated'] += 1
+                return future
+            if len(self._inflight) >= self.max_pending:
+                self.stats['rejected'] += 1
+                return None
+            future = executor.submit(fn, *args)
+            self._inflight[key] = future
+            self.stats['submitted'] += 1
+        # Callback kilit dışında eklenir: iş çoktan bittiyse hemen bu
+        # thread'de çalışır ve kilidi tekrar almaya çalışır.
+        future.add_done_callback(lambda f, key=key: self._done(key, f))
+        return future
+
+    def _done(self, key, future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            if future.cancelled() or future.exception() is not None:
+                self.stats['failed'] += 1
+            else:
+                self.stats['completed'] += 1
+
+    def pending(self):
+        with self._lock:
+            return len(self._inflight)
@@ -0,0 +1,267 @@
+import os
+import math
+import time
+import atexit
+import sqlite3
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime
+
+import pytz
+
+from app.extensions import redis_pool
+
+logger = logging.getLogger(__name__)
+
+# Gecikme histogramı: log-doğrusal kovalar, göreli hata ≤ %5, 0–120 sn için ~240 kova
+_LATENCY_LOG_BASE = math.log(1.05)
+MAX_PAGES_PER_MINUTE = 500   # dakika başına farklı sayfa sınırı; fazlası '(diğer)'
+ISTANBUL_TZ = pytz.timezone('Europe/Istanbul')
+
+
+def latency_bucket(duration_ms):
+    return int(math.log1p(max(duration_ms, 0)) / _LATENCY_LOG_BASE)
+
+
+def bucket_upper_ms(bucket):
+    return math.expm1((bucket + 1) * _LATENCY_LOG_BASE)
+
+
+def percentiles(histogram, points=(50, 95, 99)):
+    """{kova: adet} histogramından yüzdelikleri (ms, kova üst sınırı) hesaplar."""
+    total = sum(histogram.values())
+    if not total:
+        return {f'p{p}': None for p in points}
+    result = {}
+    items = sorted(histogram.items())
+    for p in points:
+        target = total * p / 100.0
+        cumulative = 0
+        for bucket, count in items:
+            cumulative += count
+            if cumulative >= target:
+                result[f'p{p}'] = round(bucket_upper_ms(bucket), 1)
+                break
+    return result
+
+
+def _new_minute():
+    return {
+        'total': 0,
+        'status': defaultdict(int),
+        'endpoint': defaultdict(int),
+        'page': defaultdict(int),
+        'latency': defaultdict(int),
+    }
+
+
+class RedisStatsStore:
+    """Saatlik hash'ler: {prefix}stats:{epoch_saati}:{tür} → {ad: adet}"""
+
+    def __init__(self, client, prefix='cv:', retention_days=8):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = retention_days * 86400
+
+    def _key(self, hour, kind):
+        return f'{self.prefix}stats:{hour}:{kind}'
+
+    def add_many(self, rows):
+        pipe = self.client.pipeline(transaction=False)
+        keys = set()
+        for hour, kind, name, count in rows:
+            key = self._key(hour, kind)
+            pipe.hincrby(key, name, count)
+            keys.add(key)
+        for key in keys:
+            pipe.expire(key, self.ttl)
+        pipe.execute()
+
+    def read(self, hours, kinds):
+        pipe = self.client.pipeline(transaction=False)
+        order = [(hour, kind) for hour in hours for kind in kinds]
+        for hour, kind in order:
+            pipe.hgetall(self._key(hour, kind))
+        data = defaultdict(dict)
+        for (hour, kind), values in zip(order, pipe.execute()):
+            data[hour][kind] = {k.decode(): int(v) for k, v in values.items()}
+        return data
+
+
+class SQLiteStatsStore:
+    """Redis yoksa: tüm worker'ların ortak yazdığı küçük bir SQLite dosyası."""
+
+    def __init__(self, path, retention_days=8):
+        self.path = path
+        self.retention_hours = retention_days * 24
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS request_stats ('
+                ' hour INTEGER NOT NULL, kind TEXT NOT NULL, name TEXT NOT NULL,'
+                ' count INTEGER NOT NULL, PRIMARY KEY (hour, kind, name))'
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5)
+
+    def add_many(self, rows):
+        with self._connect() as conn:
+            conn.executemany(
+                'INSERT INTO request_stats (hour, kind, name, count) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (hour, kind, name) DO UPDATE SET count = count + excluded.count',
+                rows
+            )
+            oldest = int(time.time() // 3600) - self.retention_hours
+            conn.execute('DELETE FROM request_stats WHERE hour < ?', (oldest,))
+
+    def read(self, hours, kinds):
+        data = defaultdict(lambda: defaultdict(dict))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT hour, kind, name, count FROM request_stats "
+                f"WHERE hour BETWEEN ? AND ? AND kind IN ({','.join('?' * len(kinds))})",
+                (min(hours), max(hours), *kinds)
+            ).fetchall()
+        for hour, kind, name, count in rows:
+            data[hour][kind][name] = count
+        return data
+
+
+class RequestStats:
+    """
+    İstek sayaçlarını süreç içinde dakikalık kovalarda toplar (toplam, durum sınıfı,
+    endpoint, sayfa ve gecikme histogramı) ve STATS_FLUSH_INTERVAL saniyede bir
+    paylaşılan depoya aktarır. Depoda saatlik toplanır; tüm worker'lar birleşir.
+    """
+    KINDS = ('total', 'status', 'endpoint', 'page', 'latency', 'minute')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._minutes = {}
+        self._store = None
+        self._flush_interval = 10
+        self._thread = None
+        self._pid = None
+
+    def init_app(self, app):
+        if not app.config.get('STATS_ENABLED', True):
+            return
+        retention = app.config.get('STATS_RETENTION_DAYS', 8)
+        self._flush_interval = app.config.get('STATS_FLUSH_INTERVAL', 10)
+        try:
+            if app.config.get('CACHE_TYPE', '').endswith('RedisCache'):
+                self._store = RedisStatsStore(
+                    redis_pool.client(), app.config.get('CACHE_KEY_PREFIX', 'cv:'), retention
+                )
+            else:
+                path = app.config.get('STATS_SQLITE_PATH') or os.path.join(app.instance_path, 'request_stats.sqlite3')
+                self._store = SQLiteStatsStore(path, retention)
+        except Exception as e:
+            app.logger.warning(f"[stats] İstatistik deposu açılamadı, toplama kapalı: {e}")
+            self._store = None
+
+    @property
+    def enabled(self):
+        return self._store is not None
+
+    def record(self, endpoint, status, duration_ms, page=None):
+        if self._store is None:
+            return
+        if self._pid != os.getpid():
+            self._start_flusher()
+        minute = int(time.time() // 60)
+        with self._lock:
+            bucket = self._minutes.get(minute)
+            if bucket is None:
+                bucket = self._minutes[minute] = _new_minute()
+            bucket['total'] += 1
+            bucket['status'][f'{status // 100}xx'] += 1
+            bucket['endpoint'][endpoint or '-'] += 1
+            if page is not None:
+                pages = bucket['page']
+                if page not in pages and len(pages) >= MAX_PAGES_PER_MINUTE:
+                    page = '(diğer)'
+                pages[page] += 1
+            bucket['latency'][latency_bucket(duration_ms)] += 1
+
+    # ─── Aktarım ───
+
+    def _start_flusher(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # Fork sonrası ebeveynin kovaları ebeveyne aittir
+            self._minutes = {}
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='request-stats', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self._flush_interval)
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            minutes, self._minutes = self._minutes, {}
+        if not minutes or self._store is None:
+            return
+        rows = []
+        for minute, bucket in minutes.items():
+            hour = minute // 60
+            rows.append((hour, 'total', '', bucket['total']))
+            rows.append((hour, 'minute', str(minute % 60), bucket['total']))
+            for kind in ('status', 'endpoint', 'page', 'latency'):
+                rows.extend((hour, kind, str(name), count) for name, count in bucket[kind].items())
+        try:
+            self._store.add_many(rows)
+        except Exception as e:
+            # Depo erişilemezse bu aralığın sayımları düşer; bellek büyümez
+            logger.warning(f"[stats] İstatistikler aktarılamadı: {e}")
+
+    # ─── Okuma ───
+
+    def summary(self, hours=24, top=10):
+        """Admin paneli için son `hours` saatin özeti."""
+        if self._store is None:
+            return {'hourly': {}, 'pages': {}}
+        self.flush()
+        now_hour = int(time.time() // 3600)
+        hour_keys = list(range(now_hour - hours + 1, now_hour + 1))
+        data = self._store.read(hour_keys, self.KINDS)
+
+        hourly = {}
+        merged = {kind: defaultdict(int) for kind in ('status', 'endpoint', 'page', 'latency')}
+        for hour in hour_keys:
+            label = datetime.fromtimestamp(hour * 3600, ISTANBUL_TZ).strftime('%d.%m %H:00')
+            hour_data = data.get(hour, {})
+            hourly[label] = hour_data.get('total', {}).get('', 0)
+            for kind, counts in merged.items():
+                for name, count in hour_data.get(kind, {}).items():
+                    counts[name] += count
+
+        # Son 60 dakika, dakika dakika
+        now_minute = int(time.time() // 60)
+        last_hour = {}
+        for minute in range(now_minute - 59, now_minute + 1):
+            label = datetime.fromtimestamp(minute * 60, ISTANBUL_TZ).strftime('%H:%M')
+            last_hour[label] = data.get(minute // 60, {}).get('minute', {}).get(str(minute % 60), 0)
+
+        def top_n(counts):
+            return dict(sorted(counts.items(), key=lambda kv: kv[1], reverse=True)[:top])
+
+        return {
+            'hourly': hourly,
+            'minutes': last_hour,
+            'pages': top_n(merged['page']),
+            'endpoints': top_n(merged['endpoint']),
+            'status': dict(merged['status']),
+            'total': sum(hourly.values()),
+            'latency': percentiles({int(b): c for b, c in merged['latency'].items()}),
+        }
+
+
+request_stats = RequestStats()
+atexit.register(request_stats.flush)
@@ -0,0 +1,192 @@
+import os
+import gzip
+import time
+import threading
+from xml.sax.saxutils import escape
+
+from flask import current_app, url_for
+from sqlalchemy import func
+
+from app.extensions import db
+from app.models import EzanVakti, Guide
+
+SITEMAP_XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+# Sabit sayfalar (endpoint, priority)
+STATIC_PAGES = [
+    ('views.index', '1.0'), ('views.sehir_secimi', '0.8'), ('views.imsakiye_secimi', '0.8'),
+    ('views.ramazan_nedir', '0.8'), ('views.orucu_bozan_durumlar', '0.8'),
+    ('views.neden_biz', '0.8'), ('views.indir', '0.8'), ('views.konum_bul', '0.8'),
+    ('views.iletisim', '0.8'), ('views.ilkelerimiz', '0.8'),
+    ('views.bilgi_kosesi_liste', '0.8'), ('views.prime_number', '0.8'),
+    ('views.under_the_red_sky', '0.8'),
+]
+
+
+class SitemapService:
+    """
+    Sitemap index'ini ve bölüm sitemap'lerini diske .xml ve .xml.gz olarak üretir.
+    Rotalar yalnızca hazır dosyayı sunar; dosya yoksa ilk istek üretir, SITEMAP_MAX_AGE'den
+    eskiyse eski dosya sunulurken arka planda yeniden üretilir.
+    """
+    SECTIONS = ('pages', 'cities', 'imsakiye', 'guides')
+    _build_lock = threading.Lock()
+
+    @staticmethod
+    def get_dir():
+        return current_app.config.get('SITEMAP_DIR') or os.path.join(current_app.instance_path, 'sitemaps')
+
+    @staticmethod
+    def file_path(name, gz=False):
+        return os.path.join(SitemapService.get_dir(), f"{name}.xml{'.gz' if gz else ''}")
+
+    # ─── Bölümler: (loc, lastmod, priority) üretir ───
+
+    @staticmethod
+    def _pages_entries():
+        # Sabit sayfalar yalnızca deploy ile değişir: en yeni şablonun tarihi
+        template_root = os.path.join(current_app.root_path, 'templates')
+        newest = max(
+            (os.path.getmtime(os.path.join(root, f))
+             for root, _, files in os.walk(template_root) for f in files),
+            default=time.time()
+        )
+        lastmod = time.strftime('%Y-%m-%d', time.gmtime(newest))
+        for endpoint, priority in STATIC_PAGES:
+            yield url_for(endpoint, _external=True), lastmod, priority
+
+    @staticmethod
+    def _vakit_lastmods():
+        """Şehir başına son vakit içe aktarma tarihi (tek sorgu)."""
+        rows = db.session.query(EzanVakti.sehir, func.max(EzanVakti.guncelleme_tarihi)) \
+            .group_by(EzanVakti.sehir).all()
+        return {sehir: son.strftime('%Y-%m-%d') for sehir, son in rows if son}
+
+    @staticmethod
+    def _cities_entries():
+        from app.services import UserService
+        lastmods = SitemapService._vakit_lastmods()
+        for sehir in UserService.get_sehirler('ALL'):
+            yield url_for('views.sehir_sayfasi', sehir=sehir, _external=True), lastmods.get(sehir), '0.9'
+
+    @staticmethod
+    def _imsakiye_entries():
+        from app.services import UserService
+        lastmods = SitemapService._vakit_lastmods()
+        for sehir in UserService.get_sehirler('TR'):
+            yield url_for('views.imsakiye_detay', sehir=sehir, _external=True), lastmods.get(sehir), '0.7'
+
+    @staticmethod
+    def _guides_entries():
+        rows = db.session.query(Guide.slug, Guide.updated_at).filter_by(is_active=True) \
+            .order_by(Guide.updated_at.desc()).all()
+        for slug, updated_at in rows:
+            lastmod = updated_at.strftime('%Y-%m-%d') if updated_at else None
+            yield url_for('views.bilgi_kosesi_detay', slug=slug, _external=True), lastmod, '0.6'
+
+    # ─── XML ───
+
+    @staticmethod
+    def _urlset(entries):
+        yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+        yield f'<urlset xmlns="{SITEMAP_XMLNS}">\n'
+        for loc, lastmod, priority in entries:
+            yield '<url>'
+            yield f'<loc>{escape(loc)}</loc>'
+            if lastmod:
+                yield f'<lastmod>{lastmod}</lastmod>'
+            yield f'<priority>{priority}</priority><changefreq>daily</changefreq></url>\n'
+        yield '</urlset>\n'
+
+    @staticmethod
+    def _sitemapindex(entries):
+        yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+        yield f'<sitemapindex xmlns="{SITEMAP_XMLNS}">\n'
+        for loc, lastmod in entries:
+            yield f'<sitemap><loc>{escape(loc)}</loc>'
+            if lastmod:
+                yield f'<lastmod>{lastmod}</lastmod>'
+            yield '</sitemap>\n'
+        yield '</sitemapindex>\n'
+
+    @staticmethod
+    def _write(name, chunks):
+        """XML'i .xml ve .xml.gz dosyalarına birlikte yazar; yarım dosya hiç sunulmaz."""
+        path = SitemapService.file_path(name)
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp, 'wb') as raw, \
+                gzip.GzipFile(tmp + '.gz', 'wb', compresslevel=9, mtime=0) as gz:
+            for chunk in chunks:
+                data = chunk.encode('utf-8')
+                raw.write(data)
+                gz.write(data)
+        os.replace(tmp + '.gz', path + '.gz')
+        os.replace(tmp, path)
+
+    # ─── Üretim ───
+
+    @staticmethod
+    def build():
+        """Tüm bölümleri ve index'i yeniden üretir; bölüm başına URL sayısını döndürür."""
+        os.makedirs(SitemapService.get_dir(), exist_ok=True)
+        base_url = current_app.config.get('SITEMAP_BASE_URL', 'https://cagrivakti.com.tr')
+        counts, index_entries = {}, []
+        with current_app.test_request_context('/', base_url=base_url):
+            for section in SitemapService.SECTIONS:
+                entries = list(getattr(SitemapService, f'_{section}_entries')())
+                SitemapService._write(f'sitemap-{section}', SitemapService._urlset(entries))
+                lastmod = max((e[1] for e in entries if e[1]), default=None)
+                index_entries.append(
+                    (url_for('views.serve_sitemap_section', section=section, _external=True), lastmod)
+                )
+                counts[section] = len(entries)
+            SitemapService._write('sitemap', SitemapService._sitemapindex(index_entries))
+        return counts
+
+    @staticmethod
+    def _rebuild_in_background(app):
+        def run():
+            try:
+                with app.app_context():
+                    SitemapService.build()
+            except Exception as e:
+                app.logger.error(f"Sitemap rebuild error: {e}")
+            finally:
+                SitemapService._build_lock.release()
+
+        # Aynı süreçte ikinci bir arka plan üretimi başlatma
+        if SitemapService._build_lock.acquire(blocking=False):
+            threading.Thread(target=run, daemon=True).start()
+
+    @staticmethod
+    def get_file(name):
+        """
+        Sunulacak sitemap dosyasının yolunu döndürür. Dosya yoksa senkron üretir,
+        eskiyse mevcut dosyayı döndürüp arka planda yeniler.
+        """
+        path = SitemapService.file_path(name)
+        max_age = current_app.config.get('SITEMAP_MAX_AGE', 21600)
+        try:
+            age = time.time() - os.path.getmtime(path)
+        except OSError:
+            with SitemapService._build_lock:
+                if not os.path.exists(path):
+                    SitemapService.build()
+            return path
+
+        if age > max_age:
+            SitemapService._rebuild_in_background(current_app._get_current_object())
+        return path
+
+    @staticmethod
+    def invalidate():
+        """Üretilmiş dosyaları siler; bir sonraki istek güncel veriyle yeniden üretir."""
+        directory = SitemapService.get_dir()
+        if not os.path.isdir(directory):
+            return
+        for name in os.listdir(directory):
+            if name.startswith('sitemap') and (name.endswith('.xml') or name.endswith('.xml.gz')):
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
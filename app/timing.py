@@ -0,0 +1,96 @@
+import time
+from contextlib import contextmanager
+
+from flask import g, has_request_context, before_render_template, template_rendered
+from flask.json.provider import DefaultJSONProvider
+
+
+def add_server_timing(response, name, duration_ms, desc=None):
+    """Yanıta bir Server-Timing girdisi ekler (mevcut girdiler korunur)."""
+    entry = f'{name};dur={duration_ms:.1f}'
+    if desc:
+        entry += f';desc="{desc}"'
+    existing = response.headers.get('Server-Timing')
+    response.headers['Server-Timing'] = f'{existing}, {entry}' if existing else entry
+
+
+def record_phase(name, duration_ms):
+    """Süreyi isteğin faz toplamına ekler; istek dışında (bot, script) yok sayılır."""
+    if not has_request_context():
+        return
+    phases = g.get('_timing_phases')
+    if phases is None:
+        phases = g._timing_phases = {}
+    entry = phases.get(name)
+    if entry is None:
+        phases[name] = [duration_ms, 1]
+    else:
+        entry[0] += duration_ms
+        entry[1] += 1
+
+
+@contextmanager
+def phase(name):
+    """
+    Bloğun süresini isteğin `name` fazına ekler. Dekoratör olarak da kullanılabilir:
+
+        with phase('vakit-db'): ...
+        @phase('og')
+        def ...
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, (time.perf_counter() - start) * 1000)
+
+
+def current_phases():
+    """{faz: ms} — JSON access log için."""
+    if not has_request_context():
+        return {}
+    return {name: round(ms, 1) for name, (ms, _) in g.get('_timing_phases', {}).items()}
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """jsonify / dönen dict'lerin serileştirme süresini 'json' fazına yazar."""
+
+    def response(self, *args, **kwargs):
+        with phase('json'):
+            return super().response(*args, **kwargs)
+
+
+def _template_start(sender, template, context, **extra):
+    if has_request_context():
+        g.setdefault('_template_starts', []).append(time.perf_counter())
+
+
+def _template_end(sender, template, context, **extra):
+    starts = g.get('_template_starts') if has_request_context() else None
+    if starts:
+        record_phase('tpl', (time.perf_counter() - starts.pop()) * 1000)
+
+
+def setup_timing(app):
+    """
+    Faz sürelerini (phase) toplar ve her yanıta Server-Timing başlığı olarak yazar:
+    vakit-cache / vakit-db / vakit-api (PrayerService.get_vakitler), tpl (şablon),
+    og (görsel render), json (serileştirme) ve toplam süre 'app'. Aynı fazlar JSON
+    access log'una 'timings' olarak eklenir. 'json' fazı için app.json'un
+    TimedJSONProvider olması gerekir (factory'de ayarlanır).
+    """
+    before_render_template.connect(_template_start, app)
+    template_rendered.connect(_template_end, app)
+
+    @app.before_request
+    def _timing_start():
+        g._timing_start = time.perf_counter()
+
+    @app.after_request
+    def _timing_end(response):
+        for name, (ms, count) in g.get('_timing_phases', {}).items():
+            add_server_timing(response, name, ms, f'{count}x' if count > 1 else None)
+        start = g.get('_timing_start')
+        if start is not None:
+            add_server_timing(response, 'app', (time.perf_counter() - start) * 1000)
+        return response
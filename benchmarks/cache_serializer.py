@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Cache Serileştirici Benchmark'ı
+Sıcak cache değerleri için pickle (cachelib RedisSerializer), compact ve orjson
+(FastRedisSerializer) biçimlerini karşılaştırır: dumps / loads süresi ve değer boyutu.
+--redis verilirse gerçek Redis'te set / get gecikmesi ve MEMORY USAGE da ölçülür.
+
+Kullanım:
+  python benchmarks/cache_serializer.py
+  python benchmarks/cache_serializer.py -n 50000
+  python benchmarks/cache_serializer.py --redis redis://localhost:6379/15
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+from datetime import date, datetime
+
+# Proje kök dizinini Python yoluna ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from cachelib.serializers import RedisSerializer
+
+from app.cache_serializer import FastRedisSerializer
+
+VALUES = {
+    'vakitler': {
+        'imsak': '05:30', 'gunes': '07:01', 'ogle': '12:40', 'ikindi': '15:50',
+        'aksam': '18:20', 'yatsi': '19:45', 'timezone': 'Europe/Istanbul',
+    },
+    'daily_content': {
+        'ayet': {'text': 'Şüphesiz güçlükle beraber bir kolaylık vardır.', 'source': 'İnşirah, 6'},
+        'hadis': {'text': 'Kolaylaştırınız, zorlaştırmayınız; müjdeleyiniz, nefret ettirmeyiniz.', 'source': 'Buhârî, İlim, 11'},
+        'dua': {'text': 'Rabbimiz! Bize dünyada da iyilik ver, ahirette de iyilik ver.', 'source': 'Bakara, 201'},
+    },
+    'ramadan_info': {
+        'is_ramadan': False, 'status': 'upcoming', 'days_to_start': 121, 'start_date': date(2027, 2, 8),
+    },
+    'dini_gunler': [
+        {'ad': ad, 'tarih': date(2027, ay, gun), 'tur': tur, 'kalan_gun': kalan}
+        for ad, ay, gun, tur, kalan in [
+            ('Üç Ayların Başlangıcı', 12, 10, 'ozel', 52), ('Regaip Kandili', 12, 11, 'kandil', 53),
+            ('Miraç Kandili', 1, 5, 'kandil', 78), ('Berat Kandili', 1, 23, 'kandil', 96),
+            ('Ramazan Başlangıcı', 2, 8, 'ozel', 112), ('Kadir Gecesi', 3, 4, 'kandil', 136),
+            ('Ramazan Bayramı', 3, 10, 'bayram', 142), ('Kurban Bayramı', 5, 16, 'bayram', 209),
+        ]
+    ],
+    'gen_sayaci': 1792435177,
+    'datetime': {'guncelleme': datetime(2026, 10, 19, 21, 41, 55)},
+}
+
+SERIALIZERS = {
+    'pickle': RedisSerializer(),
+    'compact': FastRedisSerializer(),
+    'orjson': FastRedisSerializer(json_values=True),
+}
+
+
+def _per_call_us(fn, n):
+    # 5 tur × n çağrı; tur başına ortalama, turların medyanı
+    rounds = []
+    for _ in range(5):
+        t0 = time.perf_counter()
+        for _ in range(n):
+            fn()
+        rounds.append((time.perf_counter() - t0) / n * 1e6)
+    return statistics.median(rounds)
+
+
+def bench_serializers(n):
+    rows = []
+    for name, value in VALUES.items():
+        for ser_name, ser in SERIALIZERS.items():
+            raw = ser.dumps(value)
+            assert ser.loads(raw) == value, (name, ser_name)
+            rows.append((name, ser_name, len(raw),
+                         _per_call_us(lambda: ser.dumps(value), n),
+                         _per_call_us(lambda: ser.loads(raw), n)))
+    return rows
+
+
+def bench_redis(url, n):
+    import redis
+    client = redis.from_url(url)
+    client.ping()
+    rows = []
+    for name, value in VALUES.items():
+        for ser_name, ser in SERIALIZERS.items():
+            key = f'bench:serializer:{ser_name}:{name}'
+            raw = ser.dumps(value)
+            set_us = _per_call_us(lambda: client.setex(key, 60, ser.dumps(value)), n)
+            get_us = _per_call_us(lambda: ser.loads(client.get(key)), n)
+            rows.append((name, ser_name, client.memory_usage(key), set_us, get_us))
+            client.delete(key)
+    return rows
+
+
+def _print(rows, size_label, first, second):
+    print(f"{'değer':<15} {'biçim':<8} {size_label:>10} {first:>12} {second:>12}")
+    for name, ser_name, size, a, b in rows:
+        print(f"{name:<15} {ser_name:<8} {size:>10} {a:>12.2f} {b:>12.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cache serileştirici benchmark')
+    parser.add_argument('-n', '--iterations', type=int, default=20000, help='Tur başına çağrı (serileştirme)')
+    parser.add_argument('--redis', help='Gerçek Redis ölçümü için URL (ayrı bir db önerilir)')
+    parser.add_argument('--redis-iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    _print(bench_serializers(args.iterations), 'bayt', 'dumps µs', 'loads µs')
+    if args.redis:
+        print()
+        _print(bench_redis(args.redis, args.redis_iterations), 'MEMORY B', 'set µs', 'get µs')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark Karşılaştırma
+suite.py'nin ürettiği iki JSON sonucunu senaryo senaryo karşılaştırır. Eşikten
+(--threshold, %) fazla yavaşlayan senaryo varsa 1 ile çıkar; böylece herhangi bir
+CI ya da yerel script tarafından kullanılabilir.
+
+Kullanım:
+  python benchmarks/compare.py main yeni              # benchmarks/baselines/{main,yeni}.json
+  python benchmarks/compare.py eski.json yeni.json --threshold 15 --metric min
+"""
+
+import os
+import sys
+import json
+import argparse
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+
+def load(name_or_path):
+    path = name_or_path if os.path.exists(name_or_path) else os.path.join(BASELINE_DIR, f'{name_or_path}.json')
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(base, new, metric='median_us', threshold=10.0):
+    """(senaryo, eski, yeni, değişim %, durum) satırları; durum: 'YAVAŞ', 'hızlı', '' ya da 'yeni'/'yok'."""
+    rows = []
+    base_results, new_results = base['results'], new['results']
+    for name in list(base_results) + [n for n in new_results if n not in base_results]:
+        old = base_results.get(name, {}).get(metric)
+        cur = new_results.get(name, {}).get(metric)
+        if old is None or cur is None:
+            rows.append((name, old, cur, None, 'yeni' if old is None else 'yok'))
+            continue
+        change = (cur - old) / old * 100 if old else 0.0
+        status = 'YAVAŞ' if change > threshold else ('hızlı' if change < -threshold else '')
+        rows.append((name, old, cur, change, status))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='İki benchmark sonucunu karşılaştırır')
+    parser.add_argument('base', help='Baseline adı (baselines/AD.json) ya da JSON dosyası')
+    parser.add_argument('new', help='Karşılaştırılacak sonuç adı ya da JSON dosyası')
+    parser.add_argument('--threshold', type=float, default=10.0, help='Gerileme eşiği (%%)')
+    parser.add_argument('--metric', choices=('median', 'min'), default='median')
+    args = parser.parse_args()
+
+    base, new = load(args.base), load(args.new)
+    for label, data in (('eski', base), ('yeni', new)):
+        meta = data.get('meta', {})
+        print(f"{label}: git={meta.get('git')} python={meta.get('python')} {meta.get('created')}")
+
+    rows = compare(base, new, f'{args.metric}_us', args.threshold)
+    print(f"\n{'senaryo':<26} {'eski µs':>12} {'yeni µs':>12} {'değişim':>9}")
+    for name, old, cur, change, status in rows:
+        old_s = f'{old:12.1f}' if old is not None else f"{'-':>12}"
+        cur_s = f'{cur:12.1f}' if cur is not None else f"{'-':>12}"
+        change_s = f'{change:+8.1f}%' if change is not None else f"{'':>9}"
+        print(f"{name:<26} {old_s} {cur_s} {change_s}  {status}")
+
+    regressions = [row[0] for row in rows if row[4] == 'YAVAŞ']
+    if regressions:
+        print(f"\nHATA: %{args.threshold:g} eşiğini aşan gerileme: {', '.join(regressions)}")
+        sys.exit(1)
+    print(f"\nBAŞARILI: %{args.threshold:g} eşiğini aşan gerileme yok.")
+
+
+if __name__ == '__main__':
+    main()
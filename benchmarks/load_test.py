@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Yük Testi
+Çalışan bir sunucuya (yerel gunicorn) gerçekçi bir trafik karışımı gönderir ve rota
+başına throughput ile gecikme yüzdeliklerini (p50/p90/p95/p99) raporlar. Sürüm öncesi
+kapasite planlaması içindir; istemci tarafı saf asyncio + aiohttp'dir.
+
+Sentetik karışım (--mix ile ağırlıklar değiştirilebilir):
+  sehir    — şehir sayfaları; Türkçe karakterli, küçük harfli ve yazım hatalı varyantlar
+             normalize_city_name'e ve 301 yönlendirmesine takılır
+  sonraki  — /api/sonraki_vakit yoklaması
+  embed    — /embed/<sehir> widget'ları; kullanıcı başına ETag saklanır, If-None-Match gönderilir
+  og       — tarayıcı (crawler) patlaması: aynı og:image adresine --og-burst eşzamanlı istek
+  aylik    — /api/cagri_vakitleri aylık çekim
+  yillik   — /api/cagri_vakitleri yıllık çekim
+
+--from-log ile sentetik karışım yerine all_requests.jsonl'daki GET istekleri (örnekleme
+oranı 1/sample ile ağırlıklandırılarak) yeniden oynatılır.
+
+--spawn sunucuyu da başlatır: gunicorn (gunicorn.conf.py) + REDIS_URL ile Redis cache.
+--redis fake verilirse fakeredis'in TCP sunucusu kullanılır (pip install fakeredis);
+Redis verilmezse her worker kendi SimpleCache'ini kullanır ve isabet oranı düşük çıkar.
+
+Kullanım:
+  python benchmarks/load_test.py --url http://127.0.0.1:8000 --users 50 --duration 60
+  python benchmarks/load_test.py --spawn --workers 4 --redis redis://localhost:6379/1
+  python benchmarks/load_test.py --spawn --redis fake --mix sehir=60,og=20 --json yuk.json
+  python benchmarks/load_test.py --from-log app/logs/all_requests.jsonl --users 20
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import socket
+import asyncio
+import argparse
+import platform
+import threading
+import subprocess
+from datetime import datetime
+from urllib.parse import urlsplit, quote
+
+import aiohttp
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# (canonical, Türkçe gösterim) — popülerlik sırasıyla; seçim Zipf benzeri ağırlıklıdır
+CITIES = [
+    ('Istanbul', 'İstanbul'), ('Ankara', 'Ankara'), ('Izmir', 'İzmir'), ('Bursa', 'Bursa'),
+    ('Antalya', 'Antalya'), ('Konya', 'Konya'), ('Sanliurfa', 'Şanlıurfa'), ('Diyarbakir', 'Diyarbakır'),
+    ('Kahramanmaras', 'Kahramanmaraş'), ('Eskisehir', 'Eskişehir'), ('Elazig', 'Elazığ'),
+    ('Gumushane', 'Gümüşhane'), ('Trabzon', 'Trabzon'), ('Kirsehir', 'Kırşehir'), ('Mugla', 'Muğla'),
+]
+CITY_WEIGHTS = [1 / (i + 1) for i in range(len(CITIES))]
+
+DEFAULT_MIX = {'sehir': 40, 'sonraki': 25, 'embed': 15, 'og': 5, 'aylik': 10, 'yillik': 5}
+
+BROWSER_UA = 'Mozilla/5.0 (X11; Linux x86_64) cagrivakti-load-test'
+CRAWLER_UAS = [
+    'facebookexternalhit/1.1 (+http://www.facebook.com/externalhit_uatext.php)',
+    'Twitterbot/1.0',
+    'WhatsApp/2.23.20.0',
+    'TelegramBot (like TwitterBot)',
+]
+
+OG_META = re.compile(r'<meta\s+property="og:image"\s+content="([^"]+)"')
+
+
+def pick_city():
+    return random.choices(CITIES, CITY_WEIGHTS)[0]
+
+
+def typo(name):
+    """Basit yazım hatası: bitişik iki harfi yer değiştir ya da birini düşür."""
+    name = name.lower()
+    i = random.randrange(1, len(name) - 1)
+    if random.random() < 0.5:
+        return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+    return name[:i] + name[i + 1:]
+
+
+def city_variant(canonical, display):
+    roll = random.random()
+    if roll < 0.5:
+        return canonical
+    if roll < 0.7:
+        return display
+    if roll < 0.85:
+        return canonical.lower()
+    return typo(canonical)
+
+
+# ─── Ölçüm ───
+
+class RouteStats:
+    __slots__ = ('latencies', 'statuses', 'errors', 'bytes')
+
+    def __init__(self):
+        self.latencies = []
+        self.statuses = {}
+        self.errors = 0
+        self.bytes = 0
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class LoadContext:
+    """Paylaşılan oturum, ölçümler ve şehir sayfalarından toplanan og:image adresleri."""
+
+    def __init__(self, base_url, session, api_key=None):
+        self.base_url = base_url.rstrip('/')
+        self.session = session
+        self.api_key = api_key
+        self.stats = {}
+        self.recording = False
+        self.og_paths = []
+
+    async def get(self, route, path, headers=None, ua=BROWSER_UA):
+        headers = dict(headers or {})
+        headers.setdefault('User-Agent', ua)
+        if self.api_key:
+            headers['X-API-Key'] = self.api_key
+        start = time.perf_counter()
+        status, body, response_headers = None, b'', {}
+        try:
+            async with self.session.get(self.base_url + path, headers=headers) as resp:
+                body = await resp.read()
+                status, response_headers = resp.status, resp.headers
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        if self.recording:
+            stats = self.stats.setdefault(route, RouteStats())
+            stats.latencies.append(elapsed_ms)
+            stats.bytes += len(body)
+            key = str(status) if status is not None else 'bağlantı'
+            stats.statuses[key] = stats.statuses.get(key, 0) + 1
+            if status is None or (status >= 400):
+                stats.errors += 1
+        return status, body, response_headers
+
+
+# ─── Senaryolar ───
+
+async def scenario_sehir(ctx, user):
+    canonical, display = pick_city()
+    status, body, _ = await ctx.get('sehir', f'/sehir/{quote(city_variant(canonical, display))}')
+    if status == 200 and len(ctx.og_paths) < 200:
+        match = OG_META.search(body.decode('utf-8', 'replace'))
+        if match:
+            parts = urlsplit(match.group(1).replace('&amp;', '&'))
+            path = f'{parts.path}?{parts.query}'
+            if path not in ctx.og_paths:
+                ctx.og_paths.append(path)
+
+
+async def scenario_sonraki(ctx, user):
+    canonical, _ = user.city
+    await ctx.get('sonraki_vakit', f'/api/sonraki_vakit?sehir={canonical}')
+
+
+async def scenario_embed(ctx, user):
+    canonical, _ = user.city
+    path = f'/embed/{canonical}?theme={user.theme}'
+    headers = {'If-None-Match': user.etags[path]} if path in user.etags else None
+    status, _, response_headers = await ctx.get('embed', path, headers)
+    if status == 200 and response_headers.get('ETag'):
+        user.etags[path] = response_headers['ETag']
+
+
+async def scenario_og(ctx, user, burst):
+    if ctx.og_paths:
+        path = random.choice(ctx.og_paths)
+    else:
+        _, display = pick_city()
+        path = f"/og-image?title={quote(display + ' Namaz Vakitleri')}&theme=city-page&prompt={quote(display)}"
+    ua = random.choice(CRAWLER_UAS)
+    await asyncio.gather(*(ctx.get('og-image', path, ua=ua) for _ in range(burst)))
+
+
+async def scenario_aylik(ctx, user):
+    canonical, _ = pick_city()
+    await ctx.get('api/aylik', f'/api/cagri_vakitleri?sehir={canonical}&tip=aylik&ay={random.randint(1, 12)}')
+
+
+async def scenario_yillik(ctx, user):
+    canonical, _ = pick_city()
+    await ctx.get('api/yillik', f'/api/cagri_vakitleri?sehir={canonical}&tip=yillik')
+
+
+SCENARIOS = {
+    'sehir': scenario_sehir,
+    'sonraki': scenario_sonraki,
+    'embed': scenario_embed,
+    'og': scenario_og,
+    'aylik': scenario_aylik,
+    'yillik': scenario_yillik,
+}
+
+
+# ─── Log'dan yeniden oynatma ───
+
+_ROUTE_PATTERNS = [
+    (re.compile(r'^/(sehir|embed|imsakiye|bilgi-kosesi)/[^/]+$'), r'/\1/<>'),
+    (re.compile(r'^/static/.*'), '/static/<>'),
+]
+
+
+def route_label(path):
+    for pattern, repl in _ROUTE_PATTERNS:
+        if pattern.match(path):
+            return pattern.sub(repl, path)
+    return path
+
+
+def load_replay(log_path):
+    """all_requests.jsonl'dan (yol, ağırlık) listesi; admin ve hata yanıtları atlanır."""
+    weights = {}
+    with open(log_path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            path = entry.get('path', '')
+            if entry.get('method') != 'GET' or entry.get('status', 500) >= 400 or path.startswith('/admin'):
+                continue
+            path = path[:-1] if path.endswith('?') else path
+            weights[path] = weights.get(path, 0) + 1 / (entry.get('sample') or 1)
+    return list(weights), list(weights.values())
+
+
+# ─── Sanal kullanıcılar ───
+
+class VirtualUser:
+    def __init__(self):
+        self.city = pick_city()
+        self.theme = random.choice(('dark', 'light'))
+        self.etags = {}
+
+
+async def run_user(ctx, stop_at, think, pick, og_burst):
+    user = VirtualUser()
+    while time.monotonic() < stop_at:
+        kind, value = pick()
+        if kind == 'replay':
+            await ctx.get(route_label(value.split('?', 1)[0]), value)
+        elif value == 'og':
+            await scenario_og(ctx, user, og_burst)
+        else:
+            await SCENARIOS[value](ctx, user)
+        if think:
+            await asyncio.sleep(random.expovariate(1 / think))
+
+
+async def run_load(args, pick):
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    connector = aiohttp.TCPConnector(limit=args.users * max(args.og_burst, 1))
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+        ctx = LoadContext(args.url, session, args.api_key)
+        start = time.monotonic()
+        stop_at = start + args.warmup + args.duration
+        users = [asyncio.create_task(run_user(ctx, stop_at, args.think, pick, args.og_burst))
+                 for _ in range(args.users)]
+        if args.warmup:
+            await asyncio.sleep(args.warmup)
+        ctx.recording = True
+        measured_from = time.monotonic()
+        await asyncio.gather(*users)
+        return ctx.stats, time.monotonic() - measured_from
+
+
+# ─── Sunucu (--spawn) ───
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_fake_redis():
+    try:
+        from fakeredis import TcpFakeServer
+    except ImportError:
+        sys.exit("HATA: --redis fake için fakeredis gerekli: pip install 'fakeredis>=2.23'")
+    port = _free_port()
+    server = TcpFakeServer(('127.0.0.1', port), server_type='redis')
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'redis://127.0.0.1:{port}/0'
+
+
+def spawn_server(args):
+    port = urlsplit(args.url).port or 8000
+    env = dict(os.environ)
+    if args.redis:
+        env['REDIS_URL'] = start_fake_redis() if args.redis == 'fake' else args.redis
+        env['CACHE_TYPE'] = 'RedisCache'
+    else:
+        print('UYARI: Redis verilmedi; her worker ayrı SimpleCache kullanır, isabet oranı düşük çıkar.')
+    cmd = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+           '-w', str(args.workers), '-b', f'127.0.0.1:{port}', 'wsgi:app']
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env)
+
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            sys.exit(f'HATA: gunicorn başlatılamadı (çıkış kodu {proc.returncode})')
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return proc
+        except OSError:
+            time.sleep(0.5)
+    proc.terminate()
+    sys.exit('HATA: gunicorn 60 sn içinde hazır olmadı')
+
+
+# ─── Rapor ───
+
+def build_report(stats, elapsed, args, mix):
+    routes = {}
+    total = RouteStats()
+    for route, s in sorted(stats.items(), key=lambda item: -len(item[1].latencies)):
+        routes[route] = _summary(s, elapsed)
+        total.latencies.extend(s.latencies)
+        total.errors += s.errors
+        total.bytes += s.bytes
+        for status, count in s.statuses.items():
+            total.statuses[status] = total.statuses.get(status, 0) + count
+    try:
+        git = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                             capture_output=True, text=True).stdout.strip()
+    except OSError:
+        git = None
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'git': git,
+            'python': platform.python_version(),
+            'url': args.url,
+            'users': args.users,
+            'duration_s': round(elapsed, 1),
+            'think_s': args.think,
+            'mix': mix,
+        },
+        'routes': routes,
+        'total': _summary(total, elapsed),
+    }
+
+
+def _summary(s, elapsed):
+    values = sorted(s.latencies)
+    return {
+        'requests': len(values),
+        'rps': round(len(values) / elapsed, 1) if elapsed else 0.0,
+        'errors': s.errors,
+        'statuses': dict(sorted(s.statuses.items())),
+        'kb': round(s.bytes / 1024, 1),
+        **{f'p{p}_ms': round(percentile(values, p), 1) for p in (50, 90, 95, 99)},
+        'max_ms': round(values[-1], 1) if values else 0.0,
+    }
+
+
+def print_report(report):
+    meta = report['meta']
+    print(f"\nHedef: {meta['url']}  kullanıcı={meta['users']}  süre={meta['duration_s']}sn  git={meta['git']}")
+    header = f"{'rota':<18} {'istek':>7} {'rps':>7} {'hata':>5} {'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8} {'max':>8}  durumlar"
+    print(header)
+    print('─' * len(header))
+    rows = list(report['routes'].items()) + [('TOPLAM', report['total'])]
+    for route, r in rows:
+        statuses = ' '.join(f'{k}:{v}' for k, v in r['statuses'].items())
+        print(f"{route:<18} {r['requests']:>7} {r['rps']:>7.1f} {r['errors']:>5} "
+              f"{r['p50_ms']:>8.1f} {r['p90_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['max_ms']:>8.1f}  {statuses}")
+    print('(süreler ms)')
+
+
+def parse_mix(value):
+    mix = dict(DEFAULT_MIX)
+    if value:
+        for item in value.split(','):
+            name, _, weight = item.partition('=')
+            if name.strip() not in SCENARIOS:
+                raise argparse.ArgumentTypeError(f'bilinmeyen senaryo: {name} (seçenekler: {", ".join(SCENARIOS)})')
+            mix[name.strip()] = float(weight)
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gerçekçi trafik karışımıyla yük testi')
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help='Hedef sunucu')
+    parser.add_argument('--users', type=int, default=20, help='Eşzamanlı sanal kullanıcı')
+    parser.add_argument('--duration', type=float, default=30, help='Ölçüm süresi (sn)')
+    parser.add_argument('--warmup', type=float, default=5, help='Ölçülmeyen ısınma süresi (sn)')
+    parser.add_argument('--think', type=float, default=0.2, help='İstekler arası ortalama bekleme (sn, 0 = kapalı döngü)')
+    parser.add_argument('--timeout', type=float, default=30, help='İstek zaman aşımı (sn)')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(None),
+                        help='Senaryo ağırlıkları, örn. sehir=60,og=10,yillik=0')
+    parser.add_argument('--og-burst', type=int, default=8, help='og senaryosunda eşzamanlı istek')
+    parser.add_argument('--from-log', help='all_requests.jsonl dosyasından yeniden oynat')
+    parser.add_argument('--api-key', default=os.environ.get('LOADTEST_API_KEY'),
+                        help='X-API-Key (uzak sunucuda rate limit/alan adı kısıtı için)')
+    parser.add_argument('--spawn', action='store_true', help='gunicorn sunucusunu da başlat')
+    parser.add_argument('--workers', type=int, default=4, help='--spawn: gunicorn worker sayısı')
+    parser.add_argument('--redis', help="--spawn: Redis URL'i ya da 'fake' (fakeredis)")
+    parser.add_argument('--seed', type=int, help='Tekrarlanabilir karışım için random seed')
+    parser.add_argument('--json', metavar='FILE', help='Raporu JSON olarak da yaz')
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    if args.from_log:
+        paths, weights = load_replay(args.from_log)
+        if not paths:
+            sys.exit(f'HATA: {args.from_log} içinde oynatılabilir GET isteği yok')
+        print(f'{args.from_log}: {len(paths)} farklı yol yeniden oynatılacak')
+        mix = {'replay': len(paths)}
+        pick = lambda: ('replay', random.choices(paths, weights)[0])
+    else:
+        mix = args.mix
+        names, weights = list(mix), list(mix.values())
+        pick = lambda: ('scenario', random.choices(names, weights)[0])
+
+    server = spawn_server(args) if args.spawn else None
+    try:
+        stats, elapsed = asyncio.run(run_load(args, pick))
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=30)
+
+    report = build_report(stats, elapsed, args, mix)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f'Kaydedildi: {args.json}')
+
+
+if __name__ == '__main__':
+    main()
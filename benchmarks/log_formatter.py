@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Log Formatter Benchmark'ı
+Eski formatter'lar (her kayıtta pytz.timezone + astimezone, json.dumps,
+istek thread'inde datetime.utcnow) bu dosyada birebir kopyalanır ve
+app.logging_config'deki güncel sürümlerle saniyede işlenen kayıt sayısı
+üzerinden karşılaştırılır.
+
+Kullanım:
+  python benchmarks/log_formatter.py            # varsayılan 200000 kayıt
+  python benchmarks/log_formatter.py -n 50000
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+from datetime import datetime
+
+import pytz
+
+# Proje kök dizinini Python yoluna ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import logging_config as lc
+
+DATEFMT = '%Y-%m-%d %H:%M:%S'
+TEXT_FMT = '[%(asctime)s] %(levelname)s in %(module)s: %(message)s'
+
+
+# ─── Eski sürümler (karşılaştırma için) ───
+
+class OldIstanbulFormatter(logging.Formatter):
+    def converter(self, timestamp):
+        dt = datetime.fromtimestamp(timestamp, pytz.utc)
+        return dt.astimezone(pytz.timezone('Europe/Istanbul'))
+
+    def formatTime(self, record, datefmt=None):
+        dt = self.converter(record.created)
+        if datefmt:
+            s = dt.strftime(datefmt)
+        else:
+            try:
+                s = dt.isoformat(timespec='milliseconds')
+            except TypeError:
+                s = dt.isoformat()
+        return s
+
+
+class OldJSONFormatter(OldIstanbulFormatter):
+    def format(self, record):
+        log_record = {
+            'timestamp': self.formatTime(record),
+            'level': record.levelname,
+            'module': record.module,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', '-')
+        }
+        return json.dumps(log_record, ensure_ascii=False)
+
+
+class OldAPILogFormatter(OldIstanbulFormatter):
+    def format(self, record):
+        dt = self.converter(record.created)
+        asctime = dt.strftime('%Y-%m-%d %H:%M:%S')
+        remote_addr = getattr(record, 'remote_addr', '-')
+        method = getattr(record, 'method', '-')
+        path = getattr(record, 'path', '-')
+        status = getattr(record, 'status', '-')
+        duration_ms = getattr(record, 'duration_ms', 0)
+        request_id = getattr(record, 'request_id', '-')
+        user_id = getattr(record, 'user_id', '-')
+        path_padding = 52 - len(method)
+        return (f'[{asctime}] {remote_addr:<15} - {method} {path:<{path_padding}} '
+                f'{status:3} {duration_ms:4}ms rid={request_id} uid={user_id}')
+
+
+class OldPayloadFormatter(logging.Formatter):
+    # Eskiden ts ve json.dumps after_request içinde üretiliyordu; maliyet aynı
+    def format(self, record):
+        payload = {'ts': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%S.%fZ'), **record.payload}
+        return json.dumps(payload, ensure_ascii=False)
+
+
+# ─── Kayıtlar ───
+
+PAYLOAD = {
+    'rid': '0f876380748f', 'uid': 'ac9a2ccac516498e', 'ip': '85.105.12.34',
+    'method': 'GET', 'path': '/sehir/Istanbul?', 'status': 200, 'duration_ms': 12,
+    'ua': 'Mozilla/5.0 (Linux; Android 14) AppleWebKit/537.36 Chrome/126.0 Mobile Safari/537.36',
+    'referer': 'https://www.google.com/',
+}
+
+
+def make_records(n, per_second=500):
+    """Saniyede per_second kayıt gelen bir trafiği taklit eden kayıtlar."""
+    base = time.time()
+    records = []
+    for i in range(n):
+        record = logging.makeLogRecord({
+            'name': 'all_requests_logger', 'levelno': logging.INFO, 'levelname': 'INFO',
+            'msg': 'Sayfa görüntülendi: %s', 'args': ('/sehir/Istanbul',), 'module': 'views',
+            'remote_addr': PAYLOAD['ip'], 'method': 'GET', 'path': PAYLOAD['path'],
+            'status': 200, 'duration_ms': 12, 'request_id': PAYLOAD['rid'], 'user_id': PAYLOAD['uid'],
+            'payload': PAYLOAD,
+        })
+        record.created = base + i / per_second
+        record.msecs = (record.created - int(record.created)) * 1000
+        records.append(record)
+    return records
+
+
+SCENARIOS = {
+    'metin':      (lambda: OldIstanbulFormatter(TEXT_FMT, datefmt=DATEFMT), lambda: lc.IstanbulFormatter(TEXT_FMT, datefmt=DATEFMT)),
+    'api-metin':  (lambda: OldAPILogFormatter(datefmt=DATEFMT), lambda: lc.APILogFormatter(datefmt=DATEFMT)),
+    'json':       (lambda: OldJSONFormatter(), lambda: lc.JSONFormatter()),
+    'api-json':   (lambda: OldPayloadFormatter(), lambda: lc.JSONPayloadFormatter()),
+}
+
+
+def bench(formatter, records):
+    formatter.format(records[0])
+    t0 = time.perf_counter()
+    for record in records:
+        formatter.format(record)
+    return len(records) / (time.perf_counter() - t0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Log formatter benchmark')
+    parser.add_argument('-n', '--records', type=int, default=200000)
+    parser.add_argument('scenarios', nargs='*', default=list(SCENARIOS))
+    args = parser.parse_args()
+
+    records = make_records(args.records)
+    print(f"JSON kodlayıcı: {'orjson' if lc.orjson is not None else 'json (stdlib)'}")
+    print(f"{'senaryo':<12} {'eski kayıt/sn':>15} {'yeni kayıt/sn':>15} {'hızlanma':>9}")
+    for name in args.scenarios:
+        old_factory, new_factory = SCENARIOS[name]
+        old = bench(old_factory(), records)
+        new = bench(new_factory(), records)
+        print(f"{name:<12} {old:15,.0f} {new:15,.0f} {new / old:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+OG / Story Görsel Render Benchmark'ı
+Her senaryo ayrı bir süreçte çalışır; böylece süre ve tepe bellek (RSS)
+ölçümleri birbirini etkilemez. story/eski, taban katmanı önbelleğe alınmadan
+önceki tam tuval yolunu (gradyan satır satır, kart başına tam boy katman,
+önbelleksiz font) yeniden üretir; story/soguk ve story/sicak ile karşılaştırılır.
+
+Kullanım:
+  python benchmarks/og_render.py            # varsayılan 20 tekrar
+  python benchmarks/og_render.py -n 50
+  python benchmarks/og_render.py --font-bold B.ttf --font-reg R.ttf og/soguk og/sicak
+"""
+
+import os
+import sys
+import time
+import argparse
+import resource
+import statistics
+import multiprocessing
+
+# Proje kök dizinini Python yoluna ekle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+VAKITLER = {
+    'imsak': '05:30', 'gunes': '07:01', 'ogle': '12:40',
+    'ikindi': '15:50', 'aksam': '18:20', 'yatsi': '19:45',
+}
+
+
+def _legacy_story_vakit(og, sehir, vakitler, tarih_str):
+    # Eski make_story_vakit: her istekte tüm tuval çizilir
+    from PIL import Image, ImageDraw, ImageFilter
+    W, H = og.STORY_W, og.STORY_H
+    load_font = og._load_font.__wrapped__  # font önbelleği de yoktu
+
+    img = Image.new('RGBA', (W, H), (2, 6, 23, 255))
+    d = ImageDraw.Draw(img)
+    for i in range(H):
+        r = int(15 + (10 - 15) * (i / H))
+        g = int(23 + (15 - 23) * (i / H))
+        b = int(42 + (30 - 42) * (i / H))
+        d.line([(0, i), (W, i)], fill=(r, g, b, 255))
+
+    overlay = Image.new('RGBA', (W, H), (0, 0, 0, 0))
+    od = ImageDraw.Draw(overlay)
+    od.ellipse([W - 600, -200, W + 300, 700], fill=(20, 184, 166, 60))
+    od.ellipse([-300, H // 2 - 400, 400, H // 2 + 400], fill=(245, 158, 11, 40))
+    od.ellipse([200, H - 500, W + 400, H + 300], fill=(99, 102, 241, 50))
+    img.alpha_composite(overlay.filter(ImageFilter.GaussianBlur(radius=80)))
+    d = ImageDraw.Draw(img)
+
+    f_title = load_font(og.FONT_BOLD, 65)
+    f_city = load_font(og.FONT_BOLD, 135)
+    f_date = load_font(og.FONT_REG, 45)
+    f_label = load_font(og.FONT_BOLD, 48)
+    f_time = load_font(og.FONT_BOLD, 85)
+    f_footer = load_font(og.FONT_REG, 38)
+
+    d.text((W // 2, 180), "NAMAZ VAKİTLERİ", font=f_title, fill=(255, 255, 255, 200), anchor="mm")
+    d.text((W // 2, 310), sehir.upper(), font=f_city, fill=(250, 204, 21, 255), anchor="mm")
+    if tarih_str:
+        tw = d.textbbox((0, 0), tarih_str, font=f_date)[2]
+        d.rounded_rectangle([W // 2 - tw // 2 - 40, 400, W // 2 + tw // 2 + 40, 475], radius=38,
+                            fill=(0, 0, 0, 60), outline=(255, 255, 255, 40), width=2)
+        d.text((W // 2, 438), tarih_str, font=f_date, fill=(255, 255, 255, 220), anchor="mm")
+
+    card_h, card_w, gap = 165, 900, 30
+    for i, (key, label) in enumerate(og.STORY_VAKIT_KEYS):
+        cx1, cy1 = (W - card_w) // 2, 540 + i * (card_h + gap)
+        cx2, cy2 = cx1 + card_w, cy1 + card_h
+        card_layer = Image.new('RGBA', (W, H), (0, 0, 0, 0))
+        cd = ImageDraw.Draw(card_layer)
+        cd.rounded_rectangle([cx1, cy1, cx2, cy2], radius=45, fill=(255, 255, 255, 20))
+        cd.rounded_rectangle([cx1, cy1, cx2, cy2], radius=45, outline=(255, 255, 255, 60), width=2)
+        img.alpha_composite(card_layer)
+        d.text((cx1 + 80, cy1 + card_h // 2), label, font=f_label, fill=(226, 232, 240, 255), anchor="lm")
+        d.text((cx2 - 80, cy1 + card_h // 2), vakitler.get(key, '--:--'), font=f_time,
+               fill=(255, 255, 255, 255), anchor="rm")
+
+    d.text((W // 2, H - 120), "cagrivakti.com.tr", font=f_footer, fill=(148, 163, 184, 180), anchor="mm")
+    d.rounded_rectangle([W // 2 - 180, H - 70, W // 2 + 180, H - 62], radius=4, fill=(250, 204, 21, 200))
+    return img.convert('RGB')
+
+
+def _story_old(og, i):
+    return _legacy_story_vakit(og, 'Ankara', VAKITLER, f'{i % 28 + 1} Ekim 2026')
+
+
+def _story_cold(og, i):
+    # Taban katmanı önbelleği boş: yeni yolun ilk render maliyeti
+    og._story_base.cache_clear()
+    return og.make_story_vakit('Ankara', VAKITLER, f'{i % 28 + 1} Ekim 2026')
+
+
+def _story_warm(og, i):
+    return og.make_story_vakit('Ankara', VAKITLER, f'{i % 28 + 1} Ekim 2026')
+
+
+def _clear_font_caches(og):
+    og._load_font.cache_clear()
+    og._text_bbox.cache_clear()
+
+
+def _og(og, i):
+    # Her turda farklı başlık: _cached_og seviyesinde cache miss senaryosu
+    return og.make_og(
+        f'Ankara {2026 + i} Namaz Vakitleri',
+        'İmsak 05:30 · Güneş 07:01 · Öğle 12:40|İkindi 15:50 · Akşam 18:20 · Yatsı 19:45',
+        'city-page', 'Ankara', 'cagrivakti.com.tr',
+    )
+
+
+def _og_cold(og, i):
+    # Font ve ölçüm önbellekleri her render'da boşaltılır (eski davranış)
+    _clear_font_caches(og)
+    return _og(og, i)
+
+
+SCENARIOS = {
+    'story/eski':  (_story_old, False),
+    'story/soguk': (_story_cold, False),
+    'story/sicak': (_story_warm, True),
+    'og/soguk':    (_og_cold, False),
+    'og/sicak':    (_og, True),
+}
+
+
+def _max_rss_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _worker(name, n, conn, fonts):
+    from app.routes import og
+    if fonts[0]:
+        og.FONT_BOLD = fonts[0]
+    if fonts[1]:
+        og.FONT_REG = fonts[1]
+    fn, warmup = SCENARIOS[name]
+    if warmup:
+        fn(og, 0)
+    rss_before = _max_rss_kb()
+    timings = []
+    for i in range(n):
+        t0 = time.perf_counter()
+        fn(og, i)
+        timings.append((time.perf_counter() - t0) * 1000)
+    conn.send((timings, _max_rss_kb() - rss_before, _max_rss_kb()))
+    conn.close()
+
+
+def run(names, n, fonts=(None, None)):
+    ctx = multiprocessing.get_context('spawn')
+    results = {}
+    for name in names:
+        parent, child = ctx.Pipe()
+        p = ctx.Process(target=_worker, args=(name, n, child, fonts))
+        p.start()
+        results[name] = parent.recv()
+        p.join()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='OG/Story render benchmark')
+    parser.add_argument('-n', '--iterations', type=int, default=20)
+    parser.add_argument('--font-bold', help='FONT_BOLD yerine kullanılacak .ttf')
+    parser.add_argument('--font-reg', help='FONT_REG yerine kullanılacak .ttf')
+    parser.add_argument('scenarios', nargs='*', default=list(SCENARIOS))
+    args = parser.parse_args()
+
+    results = run(args.scenarios, args.iterations, (args.font_bold, args.font_reg))
+    print(f"{'senaryo':<22} {'ort ms':>9} {'p50 ms':>9} {'min ms':>9} {'Δ tepe RSS':>12} {'tepe RSS':>10}")
+    for name, (timings, rss_delta, rss_peak) in results.items():
+        print(f"{name:<22} {statistics.mean(timings):9.1f} {statistics.median(timings):9.1f} "
+              f"{min(timings):9.1f} {rss_delta / 1024:10.1f}MB {rss_peak / 1024:8.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Servis ve Rota Benchmark Paketi
+Uygulamayı bellek içi SQLite'a karşı kurar, sentetik ezan_vakti verisiyle doldurur ve
+sıcak yolları (şehir adı normalleştirme, vakit servisi, public API, dini günler, Hicri
+dönüşüm, OG/story render, sitemap, Telegram bildirim döngüsü) ölçer.
+
+Her senaryo timeit.autorange mantığıyla kalibre edilir (tur başına ≥ --min-time sn),
+--rounds tur koşulur; sonuçlar işlem başına mikro saniye (min / medyan / stdev) olarak
+raporlanır. --save ile benchmarks/baselines/<ad>.json'a yazılır, compare.py ile
+iki sonuç karşılaştırılır.
+
+Kullanım:
+  python benchmarks/suite.py                       # tüm senaryolar
+  python benchmarks/suite.py -k vakitler -k normalize
+  python benchmarks/suite.py --save main           # baselines/main.json
+  python benchmarks/compare.py main yeni           # baselines/main.json ↔ baselines/yeni.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytz
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+WORK_DIR = tempfile.mkdtemp(prefix='cv-bench-')
+
+# Config import edilmeden önce: bellek içi DB, yerel cache, geçici log/sitemap dizinleri
+os.environ.update({
+    'DATABASE_URL': 'sqlite://',
+    'CACHE_TYPE': 'SimpleCache',
+    'STATS_ENABLED': 'false',
+    'SITEMAP_DIR': os.path.join(WORK_DIR, 'sitemaps'),
+    **{name: os.path.join(WORK_DIR, f'{name.lower()}.log') for name in (
+        'APP_LOG_FILE', 'API_LOG_FILE', 'ALL_REQUESTS_LOG_FILE', 'TELEGRAM_LOG_FILE',
+        'SECURITY_LOG_FILE', 'ERROR_LOG_FILE',
+    )},
+})
+os.environ.pop('REDIS_URL', None)
+os.environ.pop('PROMETHEUS_MULTIPROC_DIR', None)
+
+# Proje kök dizinini Python yoluna ekle
+sys.path.insert(0, ROOT)
+
+from app.factory import create_app
+from app.extensions import db, cache
+from app.models import EzanVakti
+
+VIP_HEADERS = None
+SEED_DAYS_BEFORE = 30
+SEED_DAYS_AFTER = 400
+
+
+# ─── Kurulum ───
+
+def _synthetic_times(day_index, city_index):
+    """Gün ve şehre göre kayan, gerçekçi aralıkta sabit vakitler."""
+    shift = (day_index * 7 + city_index * 3) % 90
+    base = [(5, 10), (6, 40), (12, 30), (15, 40), (18, 10), (19, 35)]
+    return [f'{(h * 60 + m + shift - 45) // 60:02d}:{(h * 60 + m + shift - 45) % 60:02d}' for h, m in base]
+
+
+def seed_vakitler(cities, start, days):
+    rows = []
+    for c, sehir in enumerate(cities):
+        for d in range(days):
+            imsak, gunes, ogle, ikindi, aksam, yatsi = _synthetic_times(d, c)
+            rows.append({
+                'sehir': sehir, 'country_code': 'TR', 'timezone': 'Europe/Istanbul',
+                'tarih': start + timedelta(days=d), 'imsak': imsak, 'gunes': gunes, 'ogle': ogle,
+                'ikindi': ikindi, 'aksam': aksam, 'yatsi': yatsi, 'kaynak': 'bench',
+            })
+    db.session.execute(EzanVakti.__table__.insert(), rows)
+    db.session.commit()
+    return len(rows)
+
+
+def setup_app(city_count):
+    global VIP_HEADERS
+    app = create_app()
+    app.config['RATELIMIT_ENABLED'] = False
+    VIP_HEADERS = {'X-API-Key': app.config['VIP_API_KEYS'][0]}
+    from app.services import UserService
+    with app.app_context():
+        db.create_all()
+        cities = UserService.get_sehirler('TR')[:city_count]
+        start = date.today() - timedelta(days=SEED_DAYS_BEFORE)
+        count = seed_vakitler(cities, start, SEED_DAYS_BEFORE + SEED_DAYS_AFTER)
+    return app, cities, count
+
+
+# ─── Ölçüm ───
+
+def measure(fn, rounds, min_time):
+    """Tur başına en az min_time sürecek tekrar sayısını bulur; işlem başına µs listesi döndürür."""
+    fn()
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - t0
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9) * 1.1))
+    timings = [elapsed / number * 1e6]
+    for _ in range(rounds - 1):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - t0) / number * 1e6)
+    return timings, number
+
+
+# ─── Senaryolar ───
+
+def build_scenarios(app, cities, users):
+    from app.services import normalize_city_name, PrayerService, DiniGunlerService, RamadanService
+    from app.services.sitemap_service import SitemapService
+    from app.routes import og
+
+    today = date.today()
+    client = app.test_client()
+    vakitler = {'imsak': '05:30', 'gunes': '07:01', 'ogle': '12:40', 'ikindi': '15:50', 'aksam': '18:20', 'yatsi': '19:45'}
+    counter = {'i': 0}
+
+    def next_city():
+        counter['i'] += 1
+        return cities[counter['i'] % len(cities)]
+
+    def vakitler_cold():
+        cache.clear()
+        PrayerService.get_vakitler(next_city(), 'TR', today.strftime('%Y-%m-%d'))
+
+    def api(params):
+        def run():
+            resp = client.get('/api/cagri_vakitleri', query_string=params, headers=VIP_HEADERS)
+            assert resp.status_code == 200, resp.status_code
+        return run
+
+    def sitemap():
+        shutil.rmtree(os.environ['SITEMAP_DIR'], ignore_errors=True)
+        SitemapService.build()
+
+    scenarios = {
+        'normalize/eslesme':      lambda: normalize_city_name('Istanbul'),
+        'normalize/takma-ad':     lambda: normalize_city_name('ŞANLIURFA'),
+        'normalize/yazim-hatasi': lambda: normalize_city_name('Eskişehr'),
+        'vakitler/soguk':         vakitler_cold,
+        'vakitler/sicak':         lambda: PrayerService.get_vakitler(cities[0], 'TR', today.strftime('%Y-%m-%d')),
+        'sonraki-vakit':          lambda: PrayerService.get_next_vakit(cities[0], 'TR'),
+        'api/gunluk':             api({'sehir': cities[0]}),
+        'api/aylik':              api({'sehir': cities[0], 'tip': 'aylik'}),
+        'api/yillik':             api({'sehir': cities[0], 'tip': 'yillik'}),
+        'api/ramazan':            api({'sehir': cities[0], 'ramazan': 'true'}),
+        'dini-gunler':            lambda: DiniGunlerService.get_dini_gunler(today),
+        'hicri/miladi->hicri':    lambda: RamadanService.gregorian_to_hijri(today),
+        'hicri/hicri->miladi':    lambda: RamadanService.hijri_to_gregorian(1448, 9, 1),
+        'og/make_og':             lambda: og.make_og(f'{next_city()} Namaz Vakitleri', 'İmsak 05:30 · Güneş 07:01|Akşam 18:20',
+                                                     'city-page', 'cagrivakti.com.tr', 'cagrivakti.com.tr'),
+        'og/make_story_vakit':    lambda: og.make_story_vakit(next_city(), vakitler, today.strftime('%d.%m.%Y')),
+        'sitemap/build':          sitemap,
+    }
+    bildirim = build_notification_loop(app, cities, users)
+    if bildirim is not None:
+        scenarios['bot/bildirim-dongusu'] = bildirim
+    return scenarios
+
+
+def build_notification_loop(app, cities, users):
+    """Telegram check_notifications'ı N sentetik kullanıcıyla, ağa çıkmadan çalıştırır."""
+    try:
+        from bots.telegram_bot import NamazBot, TelegramDB
+    except ImportError as e:
+        print(f"UYARI: Telegram botu import edilemedi, bildirim döngüsü atlanıyor ({e}).")
+        return None
+
+    class _Bot:
+        sent = 0
+
+        async def send_message(self, chat_id, text, parse_mode=None):
+            _Bot.sent += 1
+
+    bot = NamazBot.__new__(NamazBot)
+    # __init__ gerçek token ve instance/telegram_bot.db ister; yalnızca döngünün kullandığı alanlar kurulur
+    bot.app, bot.tz, bot.cities = app, pytz.timezone('Europe/Istanbul'), cities
+    bot.gonderilen_dini_gunler = set()
+    bot.db = TelegramDB(os.path.join(WORK_DIR, 'telegram_bench.db'))
+    with bot.db.get_connection() as conn:
+        conn.executemany(
+            'INSERT OR REPLACE INTO users (user_id, sehir, bildirim_aktif, bildirim_suresi, grup_id) VALUES (?, ?, 1, ?, ?)',
+            [(i, cities[i % len(cities)], 5 + i % 25, None if i % 10 else f'-100{i}') for i in range(users)]
+        )
+    context = SimpleNamespace(bot=_Bot())
+    return lambda: asyncio.run(bot.check_notifications(context))
+
+
+# ─── Çalıştırma ───
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Servis ve rota benchmark paketi')
+    parser.add_argument('-k', dest='filters', action='append', help='Yalnızca adı bu metni içeren senaryolar (tekrarlanabilir)')
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2, help='Tur başına en az süre (sn)')
+    parser.add_argument('--cities', type=int, default=81, help='Sentetik veri üretilecek şehir sayısı')
+    parser.add_argument('--users', type=int, default=1000, help='Bildirim döngüsündeki sentetik kullanıcı')
+    parser.add_argument('--save', metavar='AD', help='Sonucu benchmarks/baselines/AD.json olarak kaydet')
+    parser.add_argument('--json', metavar='DOSYA', help='Sonucu bu dosyaya yaz')
+    args = parser.parse_args()
+
+    try:
+        app, cities, row_count = setup_app(args.cities)
+        print(f"Sentetik veri: {len(cities)} şehir, {row_count} ezan_vakti satırı")
+        results = {}
+        with app.app_context():
+            scenarios = build_scenarios(app, cities, args.users)
+            names = [n for n in scenarios if not args.filters or any(f in n for f in args.filters)]
+            print(f"{'senaryo':<26} {'min µs':>12} {'medyan µs':>12} {'stdev':>8} {'tekrar':>8}")
+            for name in names:
+                timings, number = measure(scenarios[name], args.rounds, args.min_time)
+                median = statistics.median(timings)
+                results[name] = {
+                    'min_us': round(min(timings), 2),
+                    'median_us': round(median, 2),
+                    'stdev_us': round(statistics.stdev(timings), 2) if len(timings) > 1 else 0.0,
+                    'number': number,
+                    'rounds': len(timings),
+                }
+                print(f"{name:<26} {min(timings):12.1f} {median:12.1f} "
+                      f"{results[name]['stdev_us'] / median * 100 if median else 0:7.1f}% {number:8d}")
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'git': _git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cities': args.cities,
+            'users': args.users,
+        },
+        'results': results,
+    }
+    paths = []
+    if args.save:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        paths.append(os.path.join(BASELINE_DIR, f'{args.save}.json'))
+    if args.json:
+        paths.append(args.json)
+    for path in paths:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Kaydedildi: {path}")
+
+
+if __name__ == '__main__':
+    main()
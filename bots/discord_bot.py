@@ -2,6 +2,7 @@ import nextcord
 from nextcord.ext import commands, tasks
 import os
 import sys
+import time
 import sqlite3
 import logging
 from logging.handlers import RotatingFileHandler
@@ -13,6 +14,7 @@ from datetime import datetime, timedelta, timezone
 from app.services import PrayerService, UserService
 from app.config import Config
 from app.factory import create_app
+from app import metrics
 
 # Logging configuration
 log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app', 'logs')
@@ -101,6 +103,7 @@ class NamazDiscordBot(commands.Bot):
     @tasks.loop(minutes=1)
     async def bildirim_kontrol(self):
         now = datetime.now(timezone.utc) + timedelta(hours=3) # Istanbul time
+        fanout_start = time.perf_counter()
         users = self.db.get_active_users()
         
         city_times_cache = {}
@@ -132,6 +135,8 @@ class NamazDiscordBot(commands.Bot):
                 except Exception as e:
                     logger.error(f"Time parse error in Discord bot: {e}")
 
+        metrics.BOT_FANOUT_SECONDS.labels(bot='discord', kind='vakit').observe(time.perf_counter() - fanout_start)
+
     async def send_notification(self, user, v_key, v_time_str, is_reminder=False, lead_time=0):
         v_names = {'imsak':'İmsak','gunes':'Güneş','ogle':'Öğle','ikindi':'İkindi','aksam':'Akşam','yatsi':'Yatsı'}
         v_name = v_names.get(v_key, v_key)
@@ -144,7 +149,9 @@ class NamazDiscordBot(commands.Bot):
         try:
             discord_user = await self.fetch_user(int(user['user_id']))
             await discord_user.send(msg)
+            metrics.BOT_MESSAGES.labels(bot='discord', result='ok').inc()
         except Exception as e:
+            metrics.BOT_MESSAGES.labels(bot='discord', result='error').inc()
             logger.error(f"Discord notify error for {user['user_id']}: {e}")
 
 bot = NamazDiscordBot()
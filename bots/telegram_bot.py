@@ -3,6 +3,7 @@ import sys
 import logging
 from logging.handlers import RotatingFileHandler
 import sqlite3
+import time
 import asyncio
 import pytz
 
@@ -17,6 +18,7 @@ from app.services import PrayerService, UserService, get_country_for_city, get_d
 from app.services.ramadan_service import RamadanService
 from app.config import Config
 from app.factory import create_app
+from app import metrics
 
 # Türkçe ay ve gün isimleri
 TURKISH_MONTHS = [
@@ -1295,6 +1297,8 @@ class NamazBot:
 
     async def check_notifications(self, context: ContextTypes.DEFAULT_TYPE):
         now = datetime.now(self.tz)
+        # Tur süreleri PROMETHEUS_MULTIPROC_DIR üzerinden web'in /metrics çıktısına katılır
+        fanout_start = time.perf_counter()
         active_users = self.db.get_active_users()
         city_times_cache = {}
 
@@ -1373,7 +1377,10 @@ class NamazBot:
                 except Exception as e:
                     logger.error(f"Error in notification loop for user {user['user_id']}: {e}")
         
+        metrics.BOT_FANOUT_SECONDS.labels(bot='telegram', kind='vakit').observe(time.perf_counter() - fanout_start)
+
         # Dini Günler Hatırlatıcıları
+        fanout_start = time.perf_counter()
         try:
             today = now.date()
             with self.app.app_context():
@@ -1417,13 +1424,16 @@ class NamazBot:
         
         except Exception as e:
             logger.error(f"Dini günler hatırlatıcıları hatası: {e}")
+        metrics.BOT_FANOUT_SECONDS.labels(bot='telegram', kind='dini_gun').observe(time.perf_counter() - fanout_start)
 
     async def _safe_send_message(self, bot, chat_id, text):
         """Mesaj gönderir, hata durumunda kullanıcıyı pasif yapar."""
         try:
             await bot.send_message(chat_id=chat_id, text=text, parse_mode='HTML')
+            metrics.BOT_MESSAGES.labels(bot='telegram', result='ok').inc()
             return True
         except Exception as e:
+            metrics.BOT_MESSAGES.labels(bot='telegram', result='error').inc()
             err_msg = str(e).lower()
             logger.error(f"Could not send message to {chat_id}: {e}")
             if "bot was blocked" in err_msg or "chat not found" in err_msg or "user is deactivated" in err_msg:
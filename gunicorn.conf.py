@@ -0,0 +1,32 @@
+import os
+
+# Prometheus multiprocess modu: tüm worker'lar (ve botlar) ölçümlerini bu dizine yazar,
+# /metrics her scrape'te dosyaları birleştirir.
+multiproc_dir = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def on_starting(server):
+    """Ölü süreçlerden kalan ölçüm dosyalarını siler; çalışan botların dosyalarına dokunmaz."""
+    if not multiproc_dir:
+        return
+    os.makedirs(multiproc_dir, exist_ok=True)
+    for name in os.listdir(multiproc_dir):
+        # counter_1234.db, histogram_1234.db ...
+        pid = name.rsplit('_', 1)[-1].split('.', 1)[0]
+        if pid.isdigit() and not _pid_alive(int(pid)):
+            os.remove(os.path.join(multiproc_dir, name))
+
+
+def child_exit(server, worker):
+    from app.metrics import mark_process_dead
+    mark_process_dead(worker.pid)
@@ -0,0 +1,74 @@
+import os
+import sys
+import gzip
+import argparse
+
+# Proje kök dizinini Python yoluna ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.compression import STATIC_EXTENSIONS, SUFFIXES
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app', 'static')
+
+
+def build(directory, min_size, force=False):
+    """
+    Sıkıştırılabilir statik dosyaların yanına .gz (ve brotli kuruluysa .br) kardeşlerini
+    en yüksek seviyede üretir. Kaynağından yeni olan kardeşler atlanır, kaynağı silinmiş
+    kardeşler kaldırılır. (yazılan, atlanan, silinen) sayılarını döndürür.
+    """
+    written = skipped = removed = 0
+    for root, _, files in os.walk(directory):
+        names = set(files)
+        for name in files:
+            path = os.path.join(root, name)
+            for suffix in SUFFIXES.values():
+                base = name[:-len(suffix)]
+                if name.endswith(suffix) and base.endswith(STATIC_EXTENSIONS) and base not in names:
+                    os.remove(path)
+                    removed += 1
+            if not name.endswith(STATIC_EXTENSIONS) or os.path.getsize(path) < min_size:
+                continue
+
+            mtime = os.path.getmtime(path)
+            with open(path, 'rb') as f:
+                data = f.read()
+            for encoding, suffix in SUFFIXES.items():
+                if encoding == 'br' and brotli is None:
+                    continue
+                target = path + suffix
+                if not force and os.path.exists(target) and os.path.getmtime(target) >= mtime:
+                    skipped += 1
+                    continue
+                if encoding == 'br':
+                    body = brotli.compress(data, quality=11)
+                else:
+                    body = gzip.compress(data, compresslevel=9, mtime=0)
+                if len(body) >= len(data):
+                    continue  # sıkışmayan dosya (önceden sıkıştırılmış font vb.)
+                with open(target, 'wb') as f:
+                    f.write(body)
+                written += 1
+    return written, skipped, removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='app/static için önceden sıkıştırılmış .br / .gz dosyaları üretir')
+    parser.add_argument('--dir', default=STATIC_DIR, help='Statik dosya dizini')
+    parser.add_argument('--min-size', type=int, default=1024, help='Bu boyutun altındaki dosyalar atlanır (bayt)')
+    parser.add_argument('--force', action='store_true', help='Güncel kardeşleri de yeniden üret')
+    args = parser.parse_args()
+
+    if brotli is None:
+        print("UYARI: brotli kurulu değil, yalnızca .gz üretilecek (pip install Brotli).")
+    written, skipped, removed = build(args.dir, args.min_size, args.force)
+    print(f"BAŞARILI: {written} dosya yazıldı, {skipped} güncel dosya atlandı, {removed} eski dosya silindi.")
+
+
+if __name__ == "__main__":
+    main()
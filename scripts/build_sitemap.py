@@ -0,0 +1,25 @@
+import os
+import sys
+
+# Proje kök dizinini Python yoluna ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.factory import create_app
+from app.services.sitemap_service import SitemapService
+
+app = create_app()
+
+def main():
+    """
+    Sitemap index'ini ve bölüm sitemap'lerini (instance/sitemaps) önceden üretir.
+    Deploy sonrası çalıştırılırsa ilk arama motoru isteği worker'ı meşgul etmez.
+    """
+    with app.app_context():
+        counts = SitemapService.build()
+        directory = SitemapService.get_dir()
+    for section, count in counts.items():
+        print(f"{section}: {count} URL")
+    print(f"BAŞARILI: Sitemap dosyaları {directory} altına yazıldı.")
+
+if __name__ == "__main__":
+    main()
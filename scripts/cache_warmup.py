@@ -0,0 +1,50 @@
+import os
+import sys
+import time
+import argparse
+from datetime import datetime, timedelta
+
+import pytz
+
+# Proje kök dizinini Python yoluna ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.factory import create_app
+from app.services.cache_warmup import cities_by_timezone, warm_timezone
+
+app = create_app()
+
+def main():
+    """
+    Tüm şehirlerin bugün (--yarin ile yarın) ve ertesi günkü vakitlerini timezone
+    gruplarıyla toplu sorgudan cache'e yazar; İstanbul için ramazan / dini gün
+    bilgisini, --og ile şehir OG görsellerini de üretir. Deploy sonrası ya da
+    cron'dan çağrılabilir; SimpleCache ile yalnızca bu süreç ısınır.
+    """
+    parser = argparse.ArgumentParser(description='Vakit / ramazan / OG cache anahtarlarını önceden doldurur.')
+    parser.add_argument('sehirler', nargs='*', help='Sadece bu şehirleri ısıt (varsayılan: tümü)')
+    parser.add_argument('--tz', action='append', help='Sadece bu timezone (birden çok verilebilir)')
+    parser.add_argument('--yarin', action='store_true', help='Bugün yerine yarından başla (gece yarısı öncesi)')
+    parser.add_argument('--og', action='store_true', help='Şehir OG görsellerini de üret (yavaş)')
+    args = parser.parse_args()
+
+    if not app.config.get('CACHE_TYPE', '').endswith('RedisCache'):
+        print("UYARI: Paylaşılan cache (Redis) yok, ısıtılan anahtarlar bu süreçle birlikte kaybolacak.")
+
+    total = cities = 0
+    started = time.perf_counter()
+    with app.app_context():
+        for timezone_str, group in sorted(cities_by_timezone(args.sehirler or None).items()):
+            if args.tz and timezone_str not in args.tz:
+                continue
+            day = datetime.now(pytz.timezone(timezone_str)).date()
+            if args.yarin:
+                day += timedelta(days=1)
+            written = warm_timezone(timezone_str, group, day, og_images=args.og)
+            print(f"{timezone_str:<32} {day}  {len(group):>4} şehir  {written:>5} anahtar")
+            total += written
+            cities += len(group)
+    print(f"BAŞARILI: {cities} şehir için {total} vakit anahtarı yazıldı ({time.perf_counter() - started:.1f} sn).")
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.factory import create_app
 from app.extensions import db
 from app.models import DailyContent, Guide
+from app import cache_versions
 
 def bulk_add_guides(file_path):
     if not os.path.exists(file_path):
@@ -56,6 +57,7 @@ def bulk_add_guides(file_path):
                         print(f"Güncellendi: {slug}")
                 
                 db.session.commit()
+                cache_versions.bump(cache_versions.GUIDE)
                 if count > 0:
                     print(f"{count} adet yeni rehber başarıyla eklendi.")
                 else:
@@ -80,6 +82,7 @@ def add_content(category, content_type, text, source=None, day_index=None):
         )
         db.session.add(new_item)
         db.session.commit()
+        cache_versions.bump(cache_versions.CONTENT)
         print(f"Başarıyla eklendi: [{category}] {content_type}: {text[:50]}...")
 
 def list_content(category=None):
@@ -104,6 +107,7 @@ def delete_content(content_id):
         if item:
             db.session.delete(item)
             db.session.commit()
+            cache_versions.bump(cache_versions.CONTENT)
             print(f"ID {content_id} başarıyla silindi.")
         else:
             print(f"ID {content_id} bulunamadı.")
@@ -177,6 +181,7 @@ def bulk_add(file_path):
                         count += 1
                 
                 db.session.commit()
+                cache_versions.bump(cache_versions.CONTENT)
                 if count > 0:
                     print(f"{count} adet yeni içerik başarıyla eklendi.")
                 else:
@@ -0,0 +1,61 @@
+import os
+import sys
+import argparse
+import tempfile
+import subprocess
+
+# Proje kök dizinini Python yoluna ekle
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+
+def _worker(paths):
+    """Ayrı bir süreçte (gunicorn worker'ı gibi) uygulamaya istek atar."""
+    from app.factory import create_app
+    app = create_app()
+    client = app.test_client()
+    for path in paths:
+        client.get(path)
+
+
+def main():
+    """
+    /metrics çıktısını tamamen yerelde doğrular. Geçici bir PROMETHEUS_MULTIPROC_DIR
+    açar, birkaç ayrı süreçte istek attırır ve ardından /metrics'i tek bir süreçten
+    okuyarak tüm süreçlerin sayımlarının birleştiğini gösterir.
+    """
+    parser = argparse.ArgumentParser(description='Prometheus /metrics çıktısını yerelde test eder.')
+    parser.add_argument('-w', '--workers', type=int, default=2, help='İstek atan süreç sayısı')
+    parser.add_argument('paths', nargs='*', default=['/api/status', '/og-image?title=Test', '/yok-boyle-sayfa'])
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(args.paths)
+        return
+
+    with tempfile.TemporaryDirectory(prefix='cv-metrics-') as multiproc_dir:
+        env = {**os.environ, 'PROMETHEUS_MULTIPROC_DIR': multiproc_dir}
+        procs = [subprocess.Popen([sys.executable, __file__, '--worker', *args.paths], env=env)
+                 for _ in range(args.workers)]
+        if any(p.wait() for p in procs):
+            print("HATA: İstek süreçlerinden biri başarısız oldu.")
+            sys.exit(1)
+
+        # Ortam değişkeni prometheus_client import edilmeden önce ayarlanmalı
+        os.environ['PROMETHEUS_MULTIPROC_DIR'] = multiproc_dir
+        from app.factory import create_app
+        app = create_app()
+        token = app.config.get('METRICS_TOKEN') or 'metrics-check'
+        app.config['METRICS_TOKEN'] = token  # token yoksa /metrics kapalıdır
+        resp = app.test_client().get('/metrics', headers={'Authorization': f'Bearer {token}'})
+        if resp.status_code != 200:
+            print(f"HATA: /metrics {resp.status_code} döndü.")
+            sys.exit(1)
+        lines = [l for l in resp.get_data(as_text=True).splitlines() if l.startswith('cv_') and '_bucket' not in l]
+        print("\n".join(lines))
+        print(f"BAŞARILI: {args.workers} süreç x {len(args.paths)} istek /metrics'te birleşti.")
+
+
+if __name__ == "__main__":
+    main()
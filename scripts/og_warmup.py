@@ -0,0 +1,31 @@
+import os
+import sys
+import argparse
+
+# Proje kök dizinini Python yoluna ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.factory import create_app
+from app.routes.og import warm_city_og_images
+
+app = create_app()
+
+def main():
+    """
+    Şehir sayfalarının (sehir_sayfasi) og:image görsellerini önceden üretip
+    cache'e yazar. Redis cache kullanılıyorsa tüm worker'lar bu görselleri paylaşır;
+    SimpleCache ile yalnızca bu süreç ısınacağından komut etkisizdir.
+    """
+    parser = argparse.ArgumentParser(description='Şehir OG görsellerini önceden üretir.')
+    parser.add_argument('sehirler', nargs='*', help='Sadece bu şehirleri ısıt (varsayılan: tümü)')
+    args = parser.parse_args()
+
+    if not app.config.get('CACHE_TYPE', '').endswith('RedisCache'):
+        print("UYARI: Paylaşılan cache (Redis) yok, üretilen görseller bu süreçle birlikte kaybolacak.")
+
+    with app.app_context():
+        count = warm_city_og_images(args.sehirler or None)
+    print(f"BAŞARILI: {count} şehir için OG görseli üretildi.")
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.factory import create_app
 from app.extensions import db
 from app.models import EzanVakti
+from app.services.sitemap_service import SitemapService
+from app import cache_versions
 
 app = create_app()
 import re
@@ -162,5 +164,10 @@ def import_excel_files():
                 db.session.rollback()
                 print(f"HATA: {file_name} işlenirken hata oluştu: {e}")
 
+        # Sitemap lastmod'ları içe aktarma tarihinden gelir; bir sonraki istekte yeniden üretilsin
+        SitemapService.invalidate()
+        # Yalnızca vakit cache anahtarları ve /api/cagri_vakitleri ETag'leri yenilenir
+        cache_versions.bump(cache_versions.VAKIT)
+
 if __name__ == "__main__":
     import_excel_files()
@@ -0,0 +1,41 @@
+from datetime import date, datetime
+
+import pytz
+
+from app.services.cache_warmup import next_runs
+
+TZ = 'Europe/Istanbul'
+LEAD = 600
+MIDNIGHT = pytz.timezone(TZ).localize(datetime(2026, 10, 20)).timestamp()
+RUN_AT = MIDNIGHT - LEAD
+
+
+def _next(now):
+    [(run_at, timezone_str, day)] = next_runs([TZ], LEAD, now=now)
+    assert timezone_str == TZ
+    return run_at, day
+
+
+def test_next_runs_lead_oncesi():
+    run_at, day = _next(RUN_AT - 1)
+    assert run_at == RUN_AT
+    assert day == date(2026, 10, 20)
+
+
+def test_next_runs_run_at_aninda():
+    # Uyku run_at'te biter: gecikme <= 0 olmalı, ertesi güne atlamamalı
+    run_at, day = _next(RUN_AT)
+    assert run_at - RUN_AT <= 0
+    assert day == date(2026, 10, 20)
+
+
+def test_next_runs_run_at_sonrasi():
+    run_at, day = _next(RUN_AT + 1)
+    assert run_at < RUN_AT + 1
+    assert day == date(2026, 10, 20)
+
+
+def test_next_runs_gece_yarisi_sonrasi():
+    run_at, day = _next(MIDNIGHT + 1)
+    assert day == date(2026, 10, 21)
+    assert run_at == MIDNIGHT + 86400 - LEAD